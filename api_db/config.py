@@ -14,6 +14,11 @@ DB_CONFIG = {
     "charset": os.getenv("DB_CHARSET", "WIN1251")
 }
 
+# Пул подключений к БД: запросы заказов выполняются параллельно в пуле потоков FastAPI
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # ожидание свободного подключения, сек
+DB_POOL_RECYCLE = float(os.getenv("DB_POOL_RECYCLE", "3600"))  # проверка простаивавшего подключения, сек
+
 # Настройки сервера API
 SERVER_HOST = os.getenv("API_HOST", "127.0.0.1")
 SERVER_PORT = int(os.getenv("API_PORT", "8001"))
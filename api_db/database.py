@@ -1,40 +1,192 @@
 """Модуль для работы с базой данных Firebird"""
 import logging
-from typing import Optional, Dict, Any
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator
 import fdb
-from config import DB_CONFIG
+from config import DB_CONFIG, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_RECYCLE
 
 logger = logging.getLogger(__name__)
 
+# SQL запрос для получения данных заказа по Unique_code
+ORDER_BY_CODE_QUERY = """
+    SELECT
+        o.id,
+        o.orderno,
+        o.totalprice,
+        SUM(CASE WHEN uf.fieldname = 'qty_izd' THEN ouf.var_flt ELSE NULL END) as qty_izd,
+        SUM(CASE WHEN uf.fieldname = 'area_izd' THEN ouf.var_flt ELSE NULL END) as area_izd,
+        LIST(CASE WHEN uf.fieldname = 'delivery_zone' THEN ouf.var_str ELSE NULL END) as zone,
+        LIST(CASE WHEN uf.fieldname = 'measurer' THEN ouf.var_str ELSE NULL END) as measurer,
+        o.adressinstall,
+        o.agreementdate,
+        o.agreementno,
+        o.phoneinstall
+    FROM orders o
+    JOIN orders_uf_values ouf ON ouf.orderid = o.id
+    JOIN userfields uf ON uf.userfieldid = ouf.userfieldid
+    WHERE o.id = (
+        SELECT ouf2.orderid
+        FROM orders_uf_values ouf2
+        JOIN userfields uf2 ON uf2.userfieldid = ouf2.userfieldid
+        WHERE uf2.fieldname = 'Unique_code'
+            AND TRIM(ouf2.var_str) = ?
+    )
+    GROUP BY o.id, o.orderno, o.totalprice, o.adressinstall, o.agreementdate, o.agreementno, o.phoneinstall
+    """
 
-class DatabaseConnection:
-    """Класс для управления подключением к базе данных Firebird"""
 
-    def __init__(self):
-        self.connection = None
+class PooledConnection:
+    """Подключение из пула вместе с подготовленным запросом данных заказа"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.last_used = time.monotonic()
+        # Запрос готовится один раз на подключение, чтобы сервер не разбирал
+        # и не планировал его при каждом вызове
+        self._order_cursor = None
+        self._order_statement = None
+
+    def get_order_statement(self):
+        """Возвращает курсор и подготовленный запрос данных заказа (готовит при первом вызове)"""
+        if self._order_statement is None:
+            cursor = self.connection.cursor()
+            self._order_statement = cursor.prep(ORDER_BY_CODE_QUERY)
+            self._order_cursor = cursor
+        return self._order_cursor, self._order_statement
+
+    def is_alive(self) -> bool:
+        """Проверяет, что подключение открыто и сервер отвечает"""
+        if self.connection.closed:
+            return False
+        try:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute("SELECT 1 FROM RDB$DATABASE")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        """Закрывает подключение вместе с подготовленным запросом"""
+        try:
+            if self._order_cursor is not None:
+                self._order_cursor.close()
+            if not self.connection.closed:
+                self.connection.close()
+        except Exception:
+            pass
+
 
-    def connect(self):
-        """Устанавливает подключение к базе данных"""
+class DatabaseConnection:
+    """Класс для управления пулом подключений к базе данных Firebird"""
+
+    def __init__(
+        self,
+        pool_size: int = DB_POOL_SIZE,
+        pool_timeout: float = DB_POOL_TIMEOUT,
+        pool_recycle: float = DB_POOL_RECYCLE
+    ):
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        # Свободные подключения (стек: чаще используются недавно работавшие подключения)
+        # и число открытых; ожидающие потоки будятся и при возврате подключения,
+        # и при освобождении места после закрытого подключения
+        self._idle: list[PooledConnection] = []
+        self._opened = 0
+        self._available = threading.Condition()
+
+    def _open(self) -> PooledConnection:
+        """Открывает новое подключение к базе данных"""
         try:
-            if self.connection is None or self.connection.closed:
-                self.connection = fdb.connect(
-                    host=DB_CONFIG["host"],
-                    port=DB_CONFIG["port"],
-                    database=DB_CONFIG["database"],
-                    user=DB_CONFIG["user"],
-                    password=DB_CONFIG["password"],
-                    charset=DB_CONFIG["charset"]
-                )
-                logger.info("Успешное подключение к базе данных Firebird")
-            return self.connection
+            connection = fdb.connect(
+                host=DB_CONFIG["host"],
+                port=DB_CONFIG["port"],
+                database=DB_CONFIG["database"],
+                user=DB_CONFIG["user"],
+                password=DB_CONFIG["password"],
+                charset=DB_CONFIG["charset"]
+            )
+            logger.info("Успешное подключение к базе данных Firebird")
+            return PooledConnection(connection)
         except Exception as e:
             logger.error(f"Ошибка подключения к базе данных: {str(e)}")
             raise
 
+    def _take(self) -> PooledConnection | None:
+        """Берет свободное подключение или резервирует место под новое (тогда возвращает None)"""
+        deadline = time.monotonic() + self.pool_timeout
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._opened < self.pool_size:
+                    self._opened += 1
+                    return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError("Нет свободных подключений к базе данных")
+                self._available.wait(remaining)
+
+    def _release(self, pooled: PooledConnection):
+        """Возвращает подключение в пул и будит один ожидающий поток"""
+        pooled.last_used = time.monotonic()
+        with self._available:
+            self._idle.append(pooled)
+            self._available.notify()
+
+    def _discard(self, pooled: PooledConnection | None):
+        """Закрывает подключение и освобождает его место в пуле"""
+        if pooled is not None:
+            pooled.close()
+        with self._available:
+            self._opened -= 1
+            self._available.notify()
+
+    @contextmanager
+    def acquire(self) -> Iterator[PooledConnection]:
+        """Выдает подключение из пула и возвращает его обратно после использования"""
+        pooled = self._take()
+        try:
+            if pooled is None:
+                pooled = self._open()
+            elif pooled.connection.closed or (
+                time.monotonic() - pooled.last_used > self.pool_recycle and not pooled.is_alive()
+            ):
+                # Подключение закрылось или не отвечает после долгого простоя - открываем заново
+                pooled.close()
+                pooled = self._open()
+        except Exception:
+            self._discard(None)
+            raise
+
+        try:
+            yield pooled
+        except Exception:
+            # После ошибки состояние подключения неизвестно - не возвращаем его в пул
+            self._discard(pooled)
+            raise
+
+        self._release(pooled)
+
+    def connect(self):
+        """Проверяет подключение к базе данных (открывает первое подключение пула)"""
+        with self.acquire():
+            pass
+
     def disconnect(self):
-        """Закрывает подключение к базе данных"""
-        if self.connection and not self.connection.closed:
-            self.connection.close()
+        """Закрывает все свободные подключения пула"""
+        with self._available:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._discard(pooled)
+        if idle:
             logger.info("Подключение к базе данных закрыто")
 
 
@@ -53,39 +205,10 @@ def get_order_data(order_code: str) -> Optional[Dict[str, Any]]:
         Словарь с данными заказа или None если не найдено
     """
     try:
-        connection = db.connect()
-
-        # SQL запрос для получения данных заказа по Unique_code
-        query = """
-        SELECT
-            o.id,
-            o.orderno,
-            o.totalprice,
-            SUM(CASE WHEN uf.fieldname = 'qty_izd' THEN ouf.var_flt ELSE NULL END) as qty_izd,
-            SUM(CASE WHEN uf.fieldname = 'area_izd' THEN ouf.var_flt ELSE NULL END) as area_izd,
-            LIST(CASE WHEN uf.fieldname = 'delivery_zone' THEN ouf.var_str ELSE NULL END) as zone,
-            LIST(CASE WHEN uf.fieldname = 'measurer' THEN ouf.var_str ELSE NULL END) as measurer,
-            o.adressinstall,
-            o.agreementdate,
-            o.agreementno,
-            o.phoneinstall
-        FROM orders o
-        JOIN orders_uf_values ouf ON ouf.orderid = o.id
-        JOIN userfields uf ON uf.userfieldid = ouf.userfieldid
-        WHERE o.id = (
-            SELECT ouf2.orderid
-            FROM orders_uf_values ouf2
-            JOIN userfields uf2 ON uf2.userfieldid = ouf2.userfieldid
-            WHERE uf2.fieldname = 'Unique_code'
-                AND TRIM(ouf2.var_str) = ?
-        )
-        GROUP BY o.id, o.orderno, o.totalprice, o.adressinstall, o.agreementdate, o.agreementno, o.phoneinstall
-        """
-
-        cursor = connection.cursor()
-        cursor.execute(query, (order_code.strip(),))
-
-        row = cursor.fetchone()
+        with db.acquire() as pooled:
+            cursor, statement = pooled.get_order_statement()
+            cursor.execute(statement, (order_code.strip(),))
+            row = cursor.fetchone()
 
         if not row:
             logger.warning(f"Заказ с кодом {order_code} не найден")
@@ -112,6 +235,3 @@ def get_order_data(order_code: str) -> Optional[Dict[str, Any]]:
     except Exception as e:
         logger.error(f"Ошибка получения данных из БД: {str(e)}")
         raise
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
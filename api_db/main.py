@@ -65,11 +65,16 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
-    """Проверка здоровья сервиса"""
+def health_check():
+    """
+    Проверка здоровья сервиса
+
+    Обычная (не async) функция: ожидание подключения из пула и проверочный запрос
+    выполняются в пуле потоков FastAPI и не блокируют цикл событий
+    """
     try:
-        connection = db.connect()
-        is_connected = connection and not connection.closed
+        with db.acquire() as pooled:
+            is_connected = pooled.is_alive()
         return {
             "status": "healthy" if is_connected else "unhealthy",
             "database": "connected" if is_connected else "disconnected"
@@ -83,10 +88,14 @@ async def health_check():
 
 
 @app.get("/api/orders/{order_code}", response_model=OrderData)
-async def get_order(order_code: str):
+def get_order(order_code: str):
     """
     Получить данные заказа по уникальному коду
 
+    Обычная (не async) функция: FastAPI выполняет ее в пуле потоков, поэтому
+    блокирующие запросы к Firebird не останавливают цикл событий и идут параллельно
+    через пул подключений
+
     Args:
         order_code: Уникальный код заказа из Altawin
 
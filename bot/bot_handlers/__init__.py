@@ -1,7 +1,14 @@
 """Telegram бот для управления замерами"""
+import json
 from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:  # orjson не установлен - используем стандартный json
+    orjson = None
+
 # Глобальный экземпляр бота
 _bot_instance: Optional[Bot] = None
 
@@ -25,3 +32,22 @@ def get_bot() -> Optional[Bot]:
         Экземпляр бота или None
     """
     return _bot_instance
+
+
+def _orjson_dumps(obj) -> str:
+    return orjson.dumps(obj).decode()
+
+
+def create_bot_session(limit: int = 100) -> AiohttpSession:
+    """
+    Создать HTTP-сессию для Bot с быстрой JSON-сериализацией
+
+    Args:
+        limit: Максимальное количество одновременных подключений к Telegram API
+
+    Returns:
+        Сессия aiohttp для передачи в Bot(session=...)
+    """
+    if orjson is not None:
+        return AiohttpSession(limit=limit, json_loads=orjson.loads, json_dumps=_orjson_dumps)
+    return AiohttpSession(limit=limit, json_loads=json.loads, json_dumps=json.dumps)
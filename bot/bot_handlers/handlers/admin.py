@@ -7,12 +7,13 @@ from aiogram.types import Message, CallbackQuery
 from loguru import logger
 
 from database import (
-    get_db,
+    db_session,
     get_user_by_telegram_id,
     get_all_measurers,
     get_measurement_by_id,
     get_measurements_by_status,
     get_all_users,
+    count_users,
     get_user_by_id,
     update_user_role,
     toggle_user_active,
@@ -27,6 +28,7 @@ from bot_handlers.keyboards.inline import (
     get_main_menu_keyboard,
     get_measurement_actions_keyboard,
     get_users_list_keyboard,
+    USERS_PER_PAGE,
     get_user_detail_keyboard,
     get_role_selection_keyboard,
     get_amocrm_account_keyboard,
@@ -56,7 +58,7 @@ def is_admin_or_supervisor(telegram_id: int) -> bool:
     Руководитель имеет ПОЛНЫЙ функционал администратора!
     """
     # Проверяем, является ли пользователь администратором из конфига
-    if telegram_id in settings.admin_ids_list:
+    if telegram_id in settings.admin_ids_set:
         return True
 
     # Это будет проверено через middleware - если пользователь руководитель
@@ -70,7 +72,7 @@ is_admin = is_admin_or_supervisor
 @admin_router.message(Command("start"), HasAdminAccess())
 async def cmd_start(message: Message, user_role: UserRole = None):
     """Обработчик команды /start для администратора и руководителя"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
 
         if not user:
@@ -130,7 +132,7 @@ async def cmd_menu(message: Message, user_role: UserRole = None):
 @admin_router.message(Command("measurers"), HasAdminAccess())
 async def cmd_measurers(message: Message):
     """Показать список замерщиков"""
-    async for session in get_db():
+    async with db_session() as session:
         measurers = await get_all_measurers(session)
 
         if not measurers:
@@ -152,7 +154,7 @@ async def cmd_pending(message: Message):
     """Показать замеры в работе (со статусом ASSIGNED)"""
     import asyncio
 
-    async for session in get_db():
+    async with db_session() as session:
         measurements = await get_measurements_by_status(session, MeasurementStatus.ASSIGNED)
 
         if not measurements:
@@ -183,7 +185,7 @@ async def cmd_pending_confirmation(message: Message):
     """Показать замеры ожидающие подтверждения (со статусом PENDING_CONFIRMATION)"""
     import asyncio
 
-    async for session in get_db():
+    async with db_session() as session:
         measurements = await get_measurements_by_status(session, MeasurementStatus.PENDING_CONFIRMATION)
 
         if not measurements:
@@ -214,7 +216,7 @@ async def cmd_all(message: Message):
     """Показать все замеры"""
     import asyncio
 
-    async for session in get_db():
+    async with db_session() as session:
         from sqlalchemy import select
         from sqlalchemy.orm import joinedload
         from database.models import Measurement
@@ -279,7 +281,7 @@ async def cmd_measurement(message: Message):
         await message.answer("⚠️ ID замера должен быть числом")
         return
 
-    async for session in get_db():
+    async with db_session() as session:
         measurement = await get_measurement_by_id(session, measurement_id)
 
         if not measurement:
@@ -321,7 +323,7 @@ async def cmd_assign(message: Message):
         await message.answer("⚠️ ID замера должен быть числом")
         return
 
-    async for session in get_db():
+    async with db_session() as session:
         measurement = await get_measurement_by_id(session, measurement_id)
 
         if not measurement:
@@ -353,7 +355,7 @@ async def handle_assign_measurer(callback: CallbackQuery):
         measurement_id = int(parts[1])
         measurer_id = int(parts[2])
 
-        async for session in get_db():
+        async with db_session() as session:
             # Получаем замер и замерщика
             measurement = await get_measurement_by_id(session, measurement_id)
 
@@ -543,7 +545,7 @@ async def handle_confirm_assignment(callback: CallbackQuery):
         # Парсим callback data: confirm_assignment:measurement_id
         measurement_id = int(callback.data.split(":")[1])
 
-        async for session in get_db():
+        async with db_session() as session:
             from sqlalchemy import select
             from database.models import Measurement, User
 
@@ -798,7 +800,7 @@ async def handle_change_measurer(callback: CallbackQuery):
         # Парсим callback data: change_measurer:measurement_id
         measurement_id = int(callback.data.split(":")[1])
 
-        async for session in get_db():
+        async with db_session() as session:
             measurement = await get_measurement_by_id(session, measurement_id)
 
             if not measurement:
@@ -834,7 +836,7 @@ async def handle_status_change(callback: CallbackQuery):
         measurement_id = int(parts[1])
         new_status_str = parts[2]
 
-        async for session in get_db():
+        async with db_session() as session:
             # Получаем пользователя
             user = await get_user_by_telegram_id(session, callback.from_user.id)
 
@@ -952,7 +954,7 @@ async def handle_list(callback: CallbackQuery):
     try:
         list_type = callback.data.split(":")[1]
 
-        async for session in get_db():
+        async with db_session() as session:
             if list_type == "all":
                 from sqlalchemy import select
                 from sqlalchemy.orm import joinedload
@@ -1099,15 +1101,16 @@ async def cmd_hide_keyboard(message: Message):
 @admin_router.message(Command("users"), HasAdminAccess())
 async def cmd_users(message: Message):
     """Показать список всех пользователей"""
-    async for session in get_db():
-        users = await get_all_users(session)
+    async with db_session() as session:
+        total = await count_users(session)
 
-        if not users:
+        if not total:
             await message.answer("❌ Нет зарегистрированных пользователей")
             return
 
-        keyboard = get_users_list_keyboard(users, page=0)
-        text = f"👥 <b>Список пользователей ({len(users)}):</b>\n\n"
+        users = await get_all_users(session, limit=USERS_PER_PAGE)
+        keyboard = get_users_list_keyboard(users, page=0, total=total)
+        text = f"👥 <b>Список пользователей ({total}):</b>\n\n"
         text += "✅ - активен | ⛔ - неактивен\n"
         text += "👑 - админ | 👔 - руководитель | 💼 - менеджер | 👷 - замерщик | 👀 - наблюдатель"
 
@@ -1120,11 +1123,12 @@ async def handle_users_list(callback: CallbackQuery):
 
 
     try:
-        async for session in get_db():
-            users = await get_all_users(session)
+        async with db_session() as session:
+            total = await count_users(session)
+            users = await get_all_users(session, limit=USERS_PER_PAGE)
 
-            keyboard = get_users_list_keyboard(users, page=0)
-            text = f"👥 <b>Список пользователей ({len(users)}):</b>\n\n"
+            keyboard = get_users_list_keyboard(users, page=0, total=total)
+            text = f"👥 <b>Список пользователей ({total}):</b>\n\n"
             text += "✅ - активен | ⛔ - неактивен\n"
             text += "👑 - админ | 👔 - руководитель | 💼 - менеджер | 👷 - замерщик"
 
@@ -1144,11 +1148,12 @@ async def handle_users_page(callback: CallbackQuery):
     try:
         page = int(callback.data.split(":")[1])
 
-        async for session in get_db():
-            users = await get_all_users(session)
-            keyboard = get_users_list_keyboard(users, page=page)
+        async with db_session() as session:
+            total = await count_users(session)
+            users = await get_all_users(session, limit=USERS_PER_PAGE, offset=page * USERS_PER_PAGE)
+            keyboard = get_users_list_keyboard(users, page=page, total=total)
 
-            text = f"👥 <b>Список пользователей ({len(users)}):</b>\n\n"
+            text = f"👥 <b>Список пользователей ({total}):</b>\n\n"
             text += "✅ - активен | ⛔ - неактивен\n"
             text += "👑 - админ | 👔 - руководитель | 💼 - менеджер | 👷 - замерщик"
 
@@ -1168,7 +1173,7 @@ async def handle_user_detail(callback: CallbackQuery):
     try:
         user_id = int(callback.data.split(":")[1])
 
-        async for session in get_db():
+        async with db_session() as session:
             user = await get_user_by_id(session, user_id)
 
             if not user:
@@ -1230,7 +1235,7 @@ async def handle_user_change_role(callback: CallbackQuery):
     try:
         user_id = int(callback.data.split(":")[1])
 
-        async for session in get_db():
+        async with db_session() as session:
             user = await get_user_by_id(session, user_id)
 
             if not user:
@@ -1262,7 +1267,7 @@ async def handle_user_set_role(callback: CallbackQuery):
         user_id = int(parts[1])
         new_role = parts[2]
 
-        async for session in get_db():
+        async with db_session() as session:
             user_role = UserRole(new_role)
             user = await update_user_role(session, user_id, user_role)
 
@@ -1339,7 +1344,7 @@ async def handle_user_toggle(callback: CallbackQuery):
     try:
         user_id = int(callback.data.split(":")[1])
 
-        async for session in get_db():
+        async with db_session() as session:
             user = await toggle_user_active(session, user_id)
 
             if not user:
@@ -1394,7 +1399,7 @@ async def handle_measurers_list(callback: CallbackQuery):
 
 
     try:
-        async for session in get_db():
+        async with db_session() as session:
             measurers = await get_all_measurers(session)
 
             if not measurers:
@@ -1460,7 +1465,7 @@ async def handle_user_amocrm(callback: CallbackQuery):
     try:
         user_id = int(callback.data.split(":")[1])
 
-        async for session in get_db():
+        async with db_session() as session:
             user = await get_user_by_id(session, user_id)
 
             if not user:
@@ -1494,7 +1499,7 @@ async def handle_user_amocrm_select(callback: CallbackQuery):
     try:
         user_id = int(callback.data.split(":")[1])
 
-        async for session in get_db():
+        async with db_session() as session:
             user = await get_user_by_id(session, user_id)
 
             if not user:
@@ -1538,7 +1543,7 @@ async def handle_user_amocrm_page(callback: CallbackQuery):
         user_id = int(parts[1])
         page = int(parts[2])
 
-        async for session in get_db():
+        async with db_session() as session:
             user = await get_user_by_id(session, user_id)
 
             if not user:
@@ -1577,7 +1582,7 @@ async def handle_user_amocrm_link(callback: CallbackQuery):
         user_id = int(parts[1])
         amocrm_user_id = int(parts[2])
 
-        async for session in get_db():
+        async with db_session() as session:
             # Обновляем AmoCRM ID пользователя
             user = await update_user_amocrm_id(session, user_id, amocrm_user_id)
 
@@ -1626,7 +1631,7 @@ async def handle_user_amocrm_unlink(callback: CallbackQuery):
     try:
         user_id = int(callback.data.split(":")[1])
 
-        async for session in get_db():
+        async with db_session() as session:
             # Отвязываем аккаунт (устанавливаем None)
             user = await update_user_amocrm_id(session, user_id, None)
 
@@ -1662,7 +1667,7 @@ async def cmd_notifications(message: Message):
     import asyncio
     import re
 
-    async for session in get_db():
+    async with db_session() as session:
         notifications = await get_recent_notifications(session, limit=20)
 
         if not notifications:
@@ -1718,7 +1723,7 @@ async def handle_notifications_callback(callback: CallbackQuery, user_role: User
     import re
 
     try:
-        async for session in get_db():
+        async with db_session() as session:
             notifications = await get_recent_notifications(session, limit=20)
 
             # Создаем простую клавиатуру только с кнопкой "Назад"
@@ -4,10 +4,10 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 
 from database.database import (
-    get_session,
+    db_session,
     create_invite_link,
     get_all_invite_links,
-    get_invite_link_by_token,
+    get_invite_link_with_creator,
     toggle_invite_link_active,
     delete_invite_link,
     get_user_by_telegram_id
@@ -35,7 +35,7 @@ async def cmd_invite_links(message: Message, has_admin_access: bool = False):
         await message.answer("❌ У вас нет доступа к этой команде")
         return
 
-    async for session in get_session():
+    async with db_session() as session:
         links = await get_all_invite_links(session, include_inactive=True)
 
         if not links:
@@ -65,7 +65,7 @@ async def show_invite_links(callback: CallbackQuery, has_admin_access: bool = Fa
         await callback.answer("❌ Недостаточно прав", show_alert=True)
         return
 
-    async for session in get_session():
+    async with db_session() as session:
         links = await get_all_invite_links(session, include_inactive=True)
 
         if not links:
@@ -98,7 +98,7 @@ async def navigate_invite_links(callback: CallbackQuery, has_admin_access: bool
 
     page = int(callback.data.split(":")[1])
 
-    async for session in get_session():
+    async with db_session() as session:
         links = await get_all_invite_links(session, include_inactive=True)
 
         text = f"📝 <b>Пригласительные ссылки</b>\n\n"
@@ -123,17 +123,8 @@ async def show_invite_detail(callback: CallbackQuery, has_admin_access: bool = F
 
     link_id = int(callback.data.split(":")[1])
 
-    async for session in get_session():
-        # Получаем ссылку напрямую через query
-        from sqlalchemy import select
-        from sqlalchemy.orm import selectinload
-        from database.models import InviteLink
-
-        query = select(InviteLink).where(InviteLink.id == link_id).options(
-            selectinload(InviteLink.created_by)
-        )
-        result = await session.execute(query)
-        link = result.scalar_one_or_none()
+    async with db_session() as session:
+        link = await get_invite_link_with_creator(session, link_id)
 
         if not link:
             await callback.answer("❌ Ссылка не найдена", show_alert=True)
@@ -216,7 +207,7 @@ async def create_unlimited_invite(callback: CallbackQuery, has_admin_access: boo
         await callback.answer("❌ Неверная роль", show_alert=True)
         return
 
-    async for session in get_session():
+    async with db_session() as session:
         # Получаем пользователя
         user = await get_user_by_telegram_id(session, callback.from_user.id)
 
@@ -271,7 +262,7 @@ async def create_limited_invite(callback: CallbackQuery, has_admin_access: bool
         await callback.answer("❌ Неверная роль", show_alert=True)
         return
 
-    async for session in get_session():
+    async with db_session() as session:
         # Получаем пользователя
         user = await get_user_by_telegram_id(session, callback.from_user.id)
 
@@ -312,24 +303,15 @@ async def toggle_invite_active(callback: CallbackQuery, has_admin_access: bool =
 
     link_id = int(callback.data.split(":")[1])
 
-    async for session in get_session():
+    async with db_session() as session:
         link = await toggle_invite_link_active(session, link_id)
 
         if not link:
             await callback.answer("❌ Ссылка не найдена", show_alert=True)
             return
 
-        # Обновляем информацию о ссылке
-        # Формируем URL для приглашения
-        from sqlalchemy import select
-        from sqlalchemy.orm import selectinload
-        from database.models import InviteLink
-
-        query = select(InviteLink).where(InviteLink.id == link_id).options(
-            selectinload(InviteLink.created_by)
-        )
-        result = await session.execute(query)
-        link = result.scalar_one_or_none()
+        # Обновляем информацию о ссылке вместе с создателем
+        link = await get_invite_link_with_creator(session, link_id)
 
         if link:
             bot_username = (await callback.bot.get_me()).username
@@ -376,7 +358,7 @@ async def delete_invite(callback: CallbackQuery, has_admin_access: bool = False)
 
     link_id = int(callback.data.split(":")[1])
 
-    async for session in get_session():
+    async with db_session() as session:
         success = await delete_invite_link(session, link_id)
 
         if not success:
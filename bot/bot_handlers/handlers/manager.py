@@ -5,7 +5,7 @@ from aiogram.types import Message, CallbackQuery
 from loguru import logger
 
 from database import (
-    get_db,
+    db_session,
     get_user_by_telegram_id,
     get_measurement_by_id,
     get_measurements_by_manager,
@@ -26,7 +26,7 @@ manager_router = Router()
 @manager_router.message(Command("start"), IsManager())
 async def cmd_start_manager(message: Message):
     """Обработчик команды /start для менеджера"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
 
         # Если пользователь не существует, создаем его как менеджера
@@ -57,15 +57,14 @@ async def cmd_start_manager(message: Message):
 @manager_router.message(Command("menu"), IsManager())
 async def cmd_menu_manager(message: Message):
     """Обработчик команды /menu для менеджера"""
-    async for session in get_db():
-        keyboard = get_main_menu_keyboard("manager")
-        await message.answer("📋 <b>Главное меню менеджера:</b>", reply_markup=keyboard, parse_mode="HTML")
+    keyboard = get_main_menu_keyboard("manager")
+    await message.answer("📋 <b>Главное меню менеджера:</b>", reply_markup=keyboard, parse_mode="HTML")
 
 
 @manager_router.message(Command("orders"), IsManager())
 async def cmd_my_orders(message: Message):
     """Показать мои заказы"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
 
         # Получаем все заказы менеджера
@@ -91,7 +90,7 @@ async def handle_manager_measurements(callback: CallbackQuery):
     try:
         filter_type = callback.data.split(":")[1]
 
-        async for session in get_db():
+        async with db_session() as session:
             user = await get_user_by_telegram_id(session, callback.from_user.id)
 
             # Получаем заказы менеджера
@@ -144,7 +143,7 @@ async def handle_manager_measurements(callback: CallbackQuery):
 @manager_router.message(F.text == "📊 Мои заказы", IsManager())
 async def handle_all_measurements_button(message: Message):
     """Обработка нажатия кнопки Мои заказы"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
 
         # Получаем все заказы менеджера
@@ -167,7 +166,7 @@ async def handle_all_measurements_button(message: Message):
 @manager_router.message(F.text == "🔄 Заказы в работе", IsManager())
 async def handle_in_progress_measurements_button(message: Message):
     """Обработка нажатия кнопки Заказы в работе"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
 
         # Получаем замеры в работе (pending + assigned + in_progress)
@@ -193,11 +192,10 @@ async def handle_in_progress_measurements_button(message: Message):
 @manager_router.message(Command("hide"), IsManager())
 async def cmd_hide_keyboard(message: Message):
     """Скрыть клавиатуру команд"""
-    async for session in get_db():
-        from bot_handlers.keyboards.reply import remove_keyboard
+    from bot_handlers.keyboards.reply import remove_keyboard
 
-        await message.answer(
-            "✅ Клавиатура скрыта.\n\n"
-            "Чтобы снова показать клавиатуру, используйте команду /start",
-            reply_markup=remove_keyboard()
-        )
+    await message.answer(
+        "✅ Клавиатура скрыта.\n\n"
+        "Чтобы снова показать клавиатуру, используйте команду /start",
+        reply_markup=remove_keyboard()
+    )
@@ -7,7 +7,7 @@ from aiogram.types import Message, CallbackQuery
 from loguru import logger
 
 from database import (
-    get_db,
+    db_session,
     get_user_by_telegram_id,
     get_measurement_by_id,
     get_measurements_by_measurer,
@@ -34,7 +34,7 @@ measurer_router = Router()
 @measurer_router.message(Command("start"), IsMeasurer())
 async def cmd_start_measurer(message: Message):
     """Обработчик команды /start для замерщика"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
 
         # Если пользователь не существует, создаем его как замерщика
@@ -65,7 +65,7 @@ async def cmd_start_measurer(message: Message):
 @measurer_router.message(Command("menu"), IsMeasurer())
 async def cmd_menu_measurer(message: Message):
     """Обработчик команды /menu для замерщика"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
         keyboard = get_main_menu_keyboard("measurer")
         await message.answer("📋 <b>Главное меню замерщика:</b>", reply_markup=keyboard, parse_mode="HTML")
@@ -74,7 +74,7 @@ async def cmd_menu_measurer(message: Message):
 @measurer_router.message(Command("my"), IsMeasurer())
 async def cmd_my_measurements(message: Message):
     """Показать мои замеры"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
         # Получаем все активные замеры замерщика
         measurements = await get_measurements_by_measurer(session, user.id)
@@ -113,7 +113,7 @@ async def handle_status_change(callback: CallbackQuery):
         measurement_id = int(parts[1])
         new_status_str = parts[2]
 
-        async for session in get_db():
+        async with db_session() as session:
             # Получаем пользователя
             user = await get_user_by_telegram_id(session, callback.from_user.id)
 
@@ -145,8 +145,9 @@ async def handle_status_change(callback: CallbackQuery):
             if new_status == MeasurementStatus.COMPLETED:
                 measurement.completed_at = moscow_now()
 
+            # expire_on_commit=False: measurer/manager, подгруженные get_measurement_by_id,
+            # остаются загруженными после коммита
             await session.commit()
-            await session.refresh(measurement)
 
             # Отправляем уведомления
             if new_status == MeasurementStatus.CANCELLED:
@@ -216,7 +217,7 @@ async def handle_my_measurements(callback: CallbackQuery):
     try:
         status_filter = callback.data.split(":")[1]
 
-        async for session in get_db():
+        async with db_session() as session:
             user = await get_user_by_telegram_id(session, callback.from_user.id)
 
             # Получаем замеры замерщика
@@ -276,7 +277,7 @@ async def handle_my_measurements(callback: CallbackQuery):
 @measurer_router.callback_query(F.data == "menu", IsMeasurer())
 async def handle_back_to_menu(callback: CallbackQuery):
     """Возврат в главное меню"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, callback.from_user.id)
 
         if not user:
@@ -306,7 +307,7 @@ async def handle_back_to_menu(callback: CallbackQuery):
 @measurer_router.message(F.text == "📊 Мои замеры", IsMeasurer())
 async def handle_all_measurements_button(message: Message):
     """Обработка нажатия кнопки Мои замеры"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
         # Получаем все замеры замерщика
         measurements = await get_measurements_by_measurer(session, user.id)
@@ -333,7 +334,7 @@ async def handle_all_measurements_button(message: Message):
 @measurer_router.message(F.text == "🔄 Мои замеры в работе", IsMeasurer())
 async def handle_in_progress_measurements_button(message: Message):
     """Обработка нажатия кнопки Мои замеры в работе"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
         # Получаем замеры в работе (статус ASSIGNED)
         measurements = await get_measurements_by_measurer(
@@ -362,7 +363,7 @@ async def handle_in_progress_measurements_button(message: Message):
 @measurer_router.message(Command("hide"), IsMeasurer())
 async def cmd_hide_keyboard(message: Message):
     """Скрыть клавиатуру команд"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
         from bot_handlers.keyboards.reply import remove_keyboard
 
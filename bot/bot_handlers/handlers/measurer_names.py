@@ -5,7 +5,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from loguru import logger
 
-from database import get_db, get_user_by_id
+from database import db_session, get_user_by_id
 from services.measurer_name_service import MeasurerNameService
 from config import settings
 
@@ -20,7 +20,7 @@ class MeasurerNameStates(StatesGroup):
 
 def is_admin_or_supervisor(telegram_id: int) -> bool:
     """Проверка прав администратора"""
-    return telegram_id in settings.admin_ids_list
+    return telegram_id in settings.admin_ids_set
 
 
 @measurer_names_router.callback_query(F.data.startswith("user_set_measurer_name:"))
@@ -34,7 +34,7 @@ async def start_set_measurer_name(callback: CallbackQuery, state: FSMContext):
 
     user_id = int(callback.data.split(":")[1])
 
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_id(session, user_id)
 
         if not user:
@@ -77,7 +77,7 @@ async def process_measurer_name(message: Message, state: FSMContext):
     data = await state.get_data()
     user_id = data.get("user_id")
 
-    async for session in get_db():
+    async with db_session() as session:
         name_service = MeasurerNameService(session)
         user = await get_user_by_id(session, user_id)
 
@@ -5,7 +5,7 @@ from aiogram.types import Message, CallbackQuery
 from loguru import logger
 
 from database import (
-    get_db,
+    db_session,
     get_user_by_telegram_id,
     get_measurement_by_id,
     get_measurements_by_status,
@@ -22,7 +22,7 @@ observer_router = Router()
 @observer_router.message(Command("start"), IsObserver())
 async def cmd_start_observer(message: Message):
     """Обработчик команды /start для наблюдателя"""
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, message.from_user.id)
 
         text = f"👋 Добро пожаловать, <b>{user.full_name}</b>!\n\n"
@@ -46,7 +46,7 @@ async def cmd_all_measurements(message: Message):
     """Показать все замеры всех замерщиков"""
     logger.info(f"Observer cmd_all: user_id={message.from_user.id}")
 
-    async for session in get_db():
+    async with db_session() as session:
         # Получаем все замеры (последние 20)
         from sqlalchemy import select
         from sqlalchemy.orm import joinedload
@@ -84,7 +84,7 @@ async def cmd_pending_confirmation(message: Message):
     """Показать замеры ожидающие подтверждения"""
     logger.info(f"Observer cmd_pending_confirmation: user_id={message.from_user.id}")
 
-    async for session in get_db():
+    async with db_session() as session:
         # Получаем все замеры ожидающие подтверждения (статус PENDING_CONFIRMATION)
         measurements = await get_measurements_by_status(session, MeasurementStatus.PENDING_CONFIRMATION)
 
@@ -108,7 +108,7 @@ async def cmd_pending_measurements(message: Message):
     """Показать замеры в работе всех замерщиков"""
     logger.info(f"Observer cmd_pending: user_id={message.from_user.id}")
 
-    async for session in get_db():
+    async with db_session() as session:
         # Получаем все замеры в работе (статус ASSIGNED)
         measurements = await get_measurements_by_status(session, MeasurementStatus.ASSIGNED)
 
@@ -5,7 +5,7 @@ from aiogram.filters import CommandStart, CommandObject
 from loguru import logger
 
 from database.database import (
-    get_session,
+    db_session,
     get_invite_link_by_token,
     use_invite_link,
     create_user,
@@ -44,7 +44,7 @@ async def cmd_start_with_invite(message: Message, command: CommandObject):
     logger.info(f"Попытка регистрации пользователя {telegram_id} по токену {token[:10]}...")
 
     # Проверяем, не зарегистрирован ли уже пользователь
-    async for session in get_session():
+    async with db_session() as session:
         existing_user = await get_user_by_telegram_id(session, telegram_id)
 
         if existing_user:
@@ -213,7 +213,7 @@ async def cmd_start_without_invite(message: Message):
     telegram_id = message.from_user.id
 
     # Проверяем, зарегистрирован ли пользователь
-    async for session in get_session():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, telegram_id)
 
         if user:
@@ -6,7 +6,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from loguru import logger
 
-from database import get_db, get_user_by_telegram_id, get_all_measurers, UserRole
+from database import db_session, get_user_by_telegram_id, get_all_measurers, UserRole
 from services.zone_service import ZoneService
 from bot_handlers.keyboards.inline import (
     get_zones_menu_keyboard,
@@ -32,7 +32,7 @@ class ZoneStates(StatesGroup):
 def is_admin_or_supervisor(telegram_id: int) -> bool:
     """Проверка, является ли пользователь администратором или руководителем"""
     # Проверяем, является ли пользователь администратором из конфига
-    return telegram_id in settings.admin_ids_list
+    return telegram_id in settings.admin_ids_set
 
 
 @zones_router.message(Command("zones"))
@@ -93,7 +93,7 @@ async def view_all_zones(callback: CallbackQuery):
         await callback.answer("У вас нет доступа к этой функции", show_alert=True)
         return
 
-    async for session in get_db():
+    async with db_session() as session:
         zone_service = ZoneService(session)
         zones = await zone_service.get_all_zones()
 
@@ -139,7 +139,7 @@ async def process_zone_name(message: Message, state: FSMContext):
         await message.answer("❌ Название зоны не может быть пустым. Попробуйте еще раз:")
         return
 
-    async for session in get_db():
+    async with db_session() as session:
         zone_service = ZoneService(session)
         zone = await zone_service.create_zone(zone_name)
 
@@ -169,7 +169,7 @@ async def show_zone_detail(callback: CallbackQuery):
 
     zone_id = int(callback.data.split(":")[1])
 
-    async for session in get_db():
+    async with db_session() as session:
         zone_service = ZoneService(session)
         zone = await zone_service.get_zone_by_id(zone_id)
 
@@ -210,7 +210,7 @@ async def confirm_delete_zone(callback: CallbackQuery):
 
     zone_id = int(callback.data.split(":")[1])
 
-    async for session in get_db():
+    async with db_session() as session:
         zone_service = ZoneService(session)
         zone = await zone_service.get_zone_by_id(zone_id)
 
@@ -256,7 +256,7 @@ async def delete_zone(callback: CallbackQuery):
 
     zone_id = int(callback.data.split(":")[1])
 
-    async for session in get_db():
+    async with db_session() as session:
         zone_service = ZoneService(session)
         zone = await zone_service.get_zone_by_id(zone_id)
 
@@ -288,7 +288,7 @@ async def show_measurers_for_assignment(callback: CallbackQuery):
         await callback.answer("У вас нет доступа к этой функции", show_alert=True)
         return
 
-    async for session in get_db():
+    async with db_session() as session:
         measurers = await get_all_measurers(session)
 
         if not measurers:
@@ -322,7 +322,7 @@ async def show_measurer_zones(callback: CallbackQuery):
 
     measurer_id = int(callback.data.split(":")[1])
 
-    async for session in get_db():
+    async with db_session() as session:
         from database import get_user_by_id
         measurer = await get_user_by_id(session, measurer_id)
 
@@ -367,7 +367,7 @@ async def add_zone_to_measurer(callback: CallbackQuery):
     measurer_id = int(measurer_id)
     zone_id = int(zone_id)
 
-    async for session in get_db():
+    async with db_session() as session:
         zone_service = ZoneService(session)
         zone = await zone_service.get_zone_by_id(zone_id)
 
@@ -403,7 +403,7 @@ async def remove_zone_from_measurer(callback: CallbackQuery):
     measurer_id = int(measurer_id)
     zone_id = int(zone_id)
 
-    async for session in get_db():
+    async with db_session() as session:
         zone_service = ZoneService(session)
         zone = await zone_service.get_zone_by_id(zone_id)
 
@@ -437,7 +437,7 @@ async def show_available_zones(callback: CallbackQuery):
 
     measurer_id = int(callback.data.split(":")[1])
 
-    async for session in get_db():
+    async with db_session() as session:
         from database import get_user_by_id
         measurer = await get_user_by_id(session, measurer_id)
 
@@ -484,7 +484,7 @@ async def back_to_main_menu(callback: CallbackQuery, state: FSMContext):
     await state.clear()
 
     # Определяем роль пользователя
-    async for session in get_db():
+    async with db_session() as session:
         user = await get_user_by_telegram_id(session, telegram_id)
         if user:
             role = user.role.value
@@ -500,6 +500,5 @@ async def back_to_main_menu(callback: CallbackQuery, state: FSMContext):
                 text,
                 reply_markup=get_main_menu_keyboard(role)
             )
-            break
 
     await callback.answer()
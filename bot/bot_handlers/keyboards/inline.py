@@ -1,7 +1,7 @@
 """Inline клавиатуры для бота"""
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from typing import List
+from typing import List, Optional
 
 from database.models import User, Measurement, MeasurementStatus, DeliveryZone
 
@@ -196,6 +196,35 @@ def get_confirmation_keyboard(action: str, measurement_id: int) -> InlineKeyboar
     return builder.as_markup()
 
 
+def get_assignment_confirmation_keyboard(measurement_id: int, has_suggestion: bool) -> InlineKeyboardMarkup:
+    """
+    Создать клавиатуру подтверждения распределения нового замера
+
+    Клавиатура статична по структуре, поэтому собирается напрямую,
+    без InlineKeyboardBuilder
+
+    Args:
+        measurement_id: ID замера
+        has_suggestion: Предложен ли замерщик системой
+
+    Returns:
+        Inline клавиатура
+    """
+    if has_suggestion:
+        # Замерщик был предложен - даем кнопки подтверждения и изменения
+        rows = [
+            [InlineKeyboardButton(text="✅ Подтвердить предложенного", callback_data=f"confirm_assignment:{measurement_id}")],
+            [InlineKeyboardButton(text="🔄 Выбрать другого", callback_data=f"change_measurer:{measurement_id}")],
+        ]
+    else:
+        # Замерщик не был предложен - только кнопка выбора
+        rows = [
+            [InlineKeyboardButton(text="👷 Назначить замерщика", callback_data=f"change_measurer:{measurement_id}")],
+        ]
+
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
 def get_back_button(callback_data: str = "menu") -> InlineKeyboardMarkup:
     """
     Создать кнопку "Назад"
@@ -212,14 +241,24 @@ def get_back_button(callback_data: str = "menu") -> InlineKeyboardMarkup:
 
 
 # Клавиатуры для управления пользователями
-def get_users_list_keyboard(users: List[User], page: int = 0, per_page: int = 5) -> InlineKeyboardMarkup:
+# Количество пользователей на одной странице списка
+USERS_PER_PAGE = 5
+
+
+def get_users_list_keyboard(
+    users: List[User],
+    page: int = 0,
+    per_page: int = USERS_PER_PAGE,
+    total: Optional[int] = None
+) -> InlineKeyboardMarkup:
     """
     Создать клавиатуру со списком пользователей
 
     Args:
-        users: Список пользователей
+        users: Список пользователей (если передан total - только пользователи текущей страницы)
         page: Номер страницы
         per_page: Количество пользователей на странице
+        total: Общее количество пользователей (при постраничной загрузке из БД)
 
     Returns:
         Inline клавиатура
@@ -228,7 +267,11 @@ def get_users_list_keyboard(users: List[User], page: int = 0, per_page: int = 5)
 
     start_idx = page * per_page
     end_idx = start_idx + per_page
-    page_users = users[start_idx:end_idx]
+    if total is None:
+        page_users = users[start_idx:end_idx]
+        total = len(users)
+    else:
+        page_users = users
 
     role_emoji = {
         "admin": "👑",
@@ -254,7 +297,7 @@ def get_users_list_keyboard(users: List[User], page: int = 0, per_page: int = 5)
             text="◀️ Назад",
             callback_data=f"users_page:{page-1}"
         ))
-    if end_idx < len(users):
+    if end_idx < total:
         nav_buttons.append(InlineKeyboardButton(
             text="Вперед ▶️",
             callback_data=f"users_page:{page+1}"
@@ -20,6 +20,7 @@ from bot_handlers.handlers import (
     measurer_names_router
 )
 from bot_handlers.middlewares import RoleCheckMiddleware, LoggingMiddleware
+from bot_handlers import create_bot_session
 
 
 async def on_startup(bot: Bot):
@@ -35,45 +36,52 @@ async def on_startup(bot: Bot):
         sys.exit(1)
 
     # Регистрируем администраторов из конфига в БД
-    from database import get_db, get_user_by_telegram_id, create_user, UserRole
+    from database import db_session, get_users_by_telegram_ids, create_user, update_user_role, UserRole
 
-    for admin_id in settings.admin_ids_list:
-        try:
-            async for session in get_db():
-                # Проверяем, существует ли администратор
-                admin = await get_user_by_telegram_id(session, admin_id)
-
-                if not admin:
-                    # Получаем информацию о пользователе из Telegram
-                    try:
-                        chat = await bot.get_chat(admin_id)
-                        username = chat.username
-                        first_name = chat.first_name
-                        last_name = chat.last_name
-                    except Exception:
-                        username = None
-                        first_name = "Admin"
-                        last_name = None
-
-                    # Создаем администратора
-                    admin = await create_user(
-                        session,
-                        telegram_id=admin_id,
-                        username=username,
-                        first_name=first_name,
-                        last_name=last_name,
-                        role=UserRole.ADMIN
-                    )
-                    logger.info(f"Создан администратор: {admin.full_name} (ID: {admin_id})")
-                elif admin.role != UserRole.ADMIN:
-                    # Если пользователь существует, но не админ - повышаем до админа
-                    admin.role = UserRole.ADMIN
-                    await session.commit()
-                    logger.info(f"Пользователь {admin.full_name} повышен до администратора")
-
-                break  # Выходим из async for после первой итерации
-        except Exception as e:
-            logger.error(f"Ошибка при регистрации администратора {admin_id}: {e}", exc_info=True)
+    # Существующие записи администраторов читаем одним запросом, а не по одному на каждого
+    try:
+        async with db_session() as session:
+            existing_admins = {
+                user.telegram_id: user
+                for user in await get_users_by_telegram_ids(session, settings.admin_ids_list)
+            }
+    except Exception as e:
+        logger.error(f"Ошибка при чтении администраторов из БД: {e}", exc_info=True)
+    else:
+        for admin_id in settings.admin_ids_list:
+            try:
+                async with db_session() as session:
+                    # Проверяем, существует ли администратор
+                    admin = existing_admins.get(admin_id)
+
+                    if not admin:
+                        # Получаем информацию о пользователе из Telegram
+                        try:
+                            chat = await bot.get_chat(admin_id)
+                            username = chat.username
+                            first_name = chat.first_name
+                            last_name = chat.last_name
+                        except Exception:
+                            username = None
+                            first_name = "Admin"
+                            last_name = None
+
+                        # Создаем администратора
+                        admin = await create_user(
+                            session,
+                            telegram_id=admin_id,
+                            username=username,
+                            first_name=first_name,
+                            last_name=last_name,
+                            role=UserRole.ADMIN
+                        )
+                        logger.info(f"Создан администратор: {admin.full_name} (ID: {admin_id})")
+                    elif admin.role != UserRole.ADMIN:
+                        # Если пользователь существует, но не админ - повышаем до админа
+                        await update_user_role(session, admin.id, UserRole.ADMIN)
+                        logger.info(f"Пользователь {admin.full_name} повышен до администратора")
+            except Exception as e:
+                logger.error(f"Ошибка при регистрации администратора {admin_id}: {e}", exc_info=True)
 
     # Отправляем уведомление администраторам о запуске
     for admin_id in settings.admin_ids_list:
@@ -127,6 +135,7 @@ async def main():
     # Создаем бота
     bot = Bot(
         token=settings.bot_token,
+        session=create_bot_session(),
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
 
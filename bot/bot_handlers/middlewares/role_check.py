@@ -4,9 +4,10 @@ from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
 from loguru import logger
 
-from database.database import get_session, get_user_by_telegram_id
+from database.database import db_read_session, get_user_by_telegram_id
 from database.models import UserRole
 from config import settings
+from utils.user_role_cache import lookup_user_role, remember_user_role
 
 
 async def get_user_role(telegram_id: int) -> UserRole | None:
@@ -20,16 +21,21 @@ async def get_user_role(telegram_id: int) -> UserRole | None:
         Роль пользователя или None
     """
     # Проверяем, является ли пользователь администратором из конфига
-    if telegram_id in settings.admin_ids_list:
+    if telegram_id in settings.admin_ids_set:
         return UserRole.ADMIN
 
-    # Получаем роль из БД
-    async for session in get_session():
+    # Роль запрашивается middleware и каждым фильтром роли - сначала смотрим в кэш
+    found, role = lookup_user_role(telegram_id)
+    if found:
+        return role
+
+    # Получаем роль из БД (проверка выполняется на каждое обновление - через пул чтения)
+    async with db_read_session() as session:
         user = await get_user_by_telegram_id(session, telegram_id)
-        if user:
-            return user.role
+        role = user.role if user else None
 
-    return None
+    remember_user_role(telegram_id, role)
+    return role
 
 
 def has_access(required_roles: list[UserRole], user_role: UserRole | None) -> bool:
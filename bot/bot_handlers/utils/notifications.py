@@ -1,12 +1,181 @@
 ﻿"""Система уведомлений для пользователей"""
+import asyncio
+from contextlib import asynccontextmanager
+from string import Template
+
 from aiogram import Bot
-from aiogram.exceptions import TelegramAPIError
+from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError, TelegramNetworkError, TelegramRetryAfter
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, Dict, Any
 
+from database import db_session, create_notification
 from database.models import Measurement, User
-from bot_handlers.keyboards.inline import get_measurers_keyboard, get_measurement_actions_keyboard
+from bot_handlers.keyboards.inline import (
+    get_measurers_keyboard,
+    get_measurement_actions_keyboard,
+    get_assignment_confirmation_keyboard,
+)
 from bot_handlers.utils.notification_logging import log_notification
+from utils.phone_formatter import format_phone_for_telegram
+from utils.timezone_utils import format_moscow_time, timestamp_to_moscow_time
+from utils.recipient_cache import Recipient, cached_measurers, cached_admins_and_supervisors
+
+
+# Ограничение одновременных отправок (глобальный лимит Telegram ~30 сообщений/с)
+_SEND_SEMAPHORE = asyncio.Semaphore(25)
+
+# Коды кастомных полей сделки AmoCRM, в которых может храниться адрес
+_ADDRESS_CODES = frozenset({"ADDRESS", "ADRES", "address"})
+
+# ID кастомных полей сделки AmoCRM, выводимых в уведомлении о новой заявке
+_LEAD_FIELD_IDS = {
+    667253: "order_number",
+    676403: "windows_count",
+    808751: "windows_area",
+}
+
+# Форматтеры кастомных полей контакта AmoCRM по коду поля
+_CONTACT_FIELDS = {
+    "PHONE": lambda value: f"📞 <b>Телефон:</b> {format_phone_for_telegram(value)}\n",
+}
+
+
+# Шаблон уведомления о завершении замера (условные блоки подставляются готовыми строками)
+_COMPLETION_TMPL = Template(
+    "✅ <b>Замер выполнен!</b>\n\n"
+    "📋 <b>Замер #${id}</b>\n\n"
+    # === БЛОК 1: Основная информация о заказе ===
+    "📄 <b>Сделка:</b> ${lead_name}\n"
+    "🔢 <b>Номер заказа:</b> ${order_number}\n"
+    "📍 <b>Адрес:</b> ${address}\n"
+    "🚚 <b>Зона доставки:</b> ${zone}\n"
+    "\n"
+    # === БЛОК 2: Контактные данные ===
+    "👤 <b>Контакт:</b> ${contact_name}\n"
+    "📞 <b>Телефон:</b> ${phone}\n"
+    "👨‍💼 <b>Ответственный в AmoCRM:</b> ${responsible_user_name}\n"
+    "\n"
+    # === БЛОК 3: Параметры окон ===
+    "🪟 <b>Количество окон:</b> ${qty_izd}\n"
+    "📐 <b>Площадь окон:</b> ${area_izd}\n\n"
+    # === БЛОК 4: Результат выполнения ===
+    "${measurer_block}"
+    "📊 <b>Статус:</b> ${status_text}\n"
+    # === БЛОК 5: Временные метки ===
+    "\n🆔 <b>ID сделки в AmoCRM:</b> ${amocrm_lead_id}\n"
+    "${created_block}"
+    "${assigned_block}"
+    "${completed_block}"
+)
+
+# Шаблон уведомления менеджеру о назначении замерщика
+_ASSIGNMENT_MANAGER_TMPL = Template(
+    "✅ <b>Замерщик назначен на ваш заказ</b>\n\n"
+    "📋 <b>Замер #${id}</b>\n\n"
+    # === БЛОК 1: Основная информация о заказе ===
+    "📄 <b>Сделка:</b> ${lead_name}\n"
+    "🔢 <b>Номер заказа:</b> ${order_number}\n"
+    "📍 <b>Адрес:</b> ${address}\n"
+    "🚚 <b>Зона доставки:</b> ${zone}\n"
+    "\n"
+    # === БЛОК 2: Контактные данные ===
+    "👤 <b>Контакт:</b> ${contact_name}\n"
+    "📞 <b>Телефон:</b> ${phone}\n"
+    "\n"
+    # === БЛОК 3: Параметры окон ===
+    "🪟 <b>Количество окон:</b> ${qty_izd}\n"
+    "📐 <b>Площадь окон:</b> ${area_izd}\n\n"
+    # === БЛОК 4: Назначение и статус ===
+    "👷 <b>Замерщик:</b> ${measurer_name}\n"
+    "📊 <b>Статус:</b> ${status_text}\n"
+    # === БЛОК 5: Временные метки ===
+    "\n🆔 <b>ID сделки в AmoCRM:</b> ${amocrm_lead_id}\n"
+    "${created_block}"
+    "${assigned_block}"
+)
+
+# Шаблон уведомления менеджеру об изменении замерщика
+_MEASURER_CHANGE_MANAGER_TMPL = Template(
+    "🔄 <b>Изменен замерщик на вашем заказе</b>\n\n"
+    "📋 <b>Замер #${id}</b>\n\n"
+    # === БЛОК 1: Основная информация о заказе ===
+    "📄 <b>Сделка:</b> ${lead_name}\n"
+    "🔢 <b>Номер заказа:</b> ${order_number}\n"
+    "📍 <b>Адрес:</b> ${address}\n"
+    "🚚 <b>Зона доставки:</b> ${zone}\n"
+    "\n"
+    # === БЛОК 2: Контактные данные ===
+    "👤 <b>Контакт:</b> ${contact_name}\n"
+    "📞 <b>Телефон:</b> ${phone}\n"
+    "\n"
+    # === БЛОК 3: Параметры окон ===
+    "🪟 <b>Количество окон:</b> ${qty_izd}\n"
+    "📐 <b>Площадь окон:</b> ${area_izd}\n\n"
+    # === БЛОК 4: Изменение замерщика ===
+    "⚠️ <b>ИЗМЕНЕНИЕ ЗАМЕРЩИКА:</b>\n"
+    "${old_measurer_block}"
+    "   ✅ Новый: ${new_measurer_name}\n"
+    "\n📊 <b>Статус:</b> ${status_text}\n"
+    # === БЛОК 5: Дополнительная информация ===
+    "\n🆔 <b>ID сделки в AmoCRM:</b> ${amocrm_lead_id}\n"
+    "${created_block}"
+)
+
+
+async def safe_send(bot: Bot, chat_id: int, text: str, *, max_retries: int = 3, **kwargs):
+    """
+    Отправить сообщение с учетом flood control Telegram и сетевых сбоев
+
+    При TelegramRetryAfter ждет указанное Telegram время, при TelegramNetworkError -
+    экспоненциальную паузу (0.5, 1, 2 ... с), после чего повторяет отправку.
+    TelegramForbiddenError (бот заблокирован пользователем) и прочие ошибки API -
+    постоянные, пробрасываются сразу, чтобы уведомление не было записано как отправленное.
+
+    Args:
+        bot: Экземпляр бота
+        chat_id: ID чата получателя
+        text: Текст сообщения
+        max_retries: Максимальное количество повторов после первой попытки
+        **kwargs: Дополнительные параметры bot.send_message
+
+    Returns:
+        Отправленное сообщение
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+        except TelegramRetryAfter as e:
+            if attempt == max_retries:
+                raise
+            logger.warning(f"Flood control для чата {chat_id}, повтор через {e.retry_after} с")
+            await asyncio.sleep(e.retry_after)
+        except TelegramNetworkError as e:
+            if attempt == max_retries:
+                raise
+            delay = 0.5 * 2 ** attempt
+            logger.warning(f"Сетевая ошибка при отправке в чат {chat_id}: {e}, повтор через {delay} с")
+            await asyncio.sleep(delay)
+        except TelegramForbiddenError:
+            logger.warning(f"Бот заблокирован пользователем {chat_id}, сообщение не доставлено")
+            raise
+
+
+@asynccontextmanager
+async def _notification_session(session: AsyncSession | None = None):
+    """Сессия БД для записи уведомлений: переданная вызывающим кодом или новая"""
+    if session is not None:
+        yield session
+        return
+
+    async with db_session() as new_session:
+        yield new_session
+
+
+async def _limited_send(bot: Bot, chat_id: int, text: str, **kwargs):
+    """Отправить сообщение через safe_send с ограничением параллельных отправок"""
+    async with _SEND_SEMAPHORE:
+        return await safe_send(bot, chat_id=chat_id, text=text, **kwargs)
 
 
 def get_altawin_display_values(altawin_data, contact_phone: Optional[str] = None) -> Dict[str, str]:
@@ -40,7 +209,6 @@ def get_altawin_display_values(altawin_data, contact_phone: Optional[str] = None
         phone_source = altawin_data.phone
 
     if phone_source:
-        from utils.phone_formatter import format_phone_for_telegram
         phone = format_phone_for_telegram(phone_source)
     else:
         phone = amo_missing_text
@@ -55,6 +223,34 @@ def get_altawin_display_values(altawin_data, contact_phone: Optional[str] = None
     }
 
 
+def _extract_lead_fields(custom_fields: Optional[list]) -> Dict[str, Any]:
+    """
+    Извлечь нужные поля сделки AmoCRM за один проход по кастомным полям
+
+    Returns:
+        Словарь с найденными полями: ключи из _LEAD_FIELD_IDS и "address"
+    """
+    found: Dict[str, Any] = {}
+    wanted = len(_LEAD_FIELD_IDS) + 1
+
+    for field in custom_fields or []:
+        values = field.get("values")
+        if not values:
+            continue
+
+        key = _LEAD_FIELD_IDS.get(field.get("field_id"))
+        if key and key not in found:
+            found[key] = str(values[0].get("value", ""))
+
+        if "address" not in found and field.get("field_code") in _ADDRESS_CODES:
+            found["address"] = values[0].get("value")
+
+        if len(found) == wanted:
+            break
+
+    return found
+
+
 def format_lead_info_for_notification(full_info: Dict[str, Any]) -> str:
     """
     Унифицированное форматирование информации о сделке из AmoCRM для уведомлений
@@ -72,102 +268,86 @@ def format_lead_info_for_notification(full_info: Dict[str, Any]) -> str:
     Returns:
         Отформатированный текст уведомления
     """
-    from services.amocrm import amocrm_client
-
     lead = full_info.get("lead", {})
     contacts = full_info.get("contacts", [])
     responsible_user = full_info.get("responsible_user")
 
     # === ЗАГОЛОВОК ===
-    text = "🆕 <b>Новая заявка из AmoCRM!</b>\n\n"
+    parts = ["🆕 <b>Новая заявка из AmoCRM!</b>\n\n"]
 
     # === БЛОК 1: Основная информация о заказе ===
     lead_name = lead.get("name", "Без названия")
     lead_id = lead.get("id")
-    text += f"📄 <b>Сделка:</b> {lead_name}\n"
+    parts.append(f"📄 <b>Сделка:</b> {lead_name}\n")
 
-    # Получаем кастомные поля сделки
-    lead_custom_fields = lead.get("custom_fields_values", [])
+    # Получаем нужные кастомные поля сделки за один проход
+    lead_fields = _extract_lead_fields(lead.get("custom_fields_values"))
 
     # Номер заказа (ID: 667253)
-    order_number = amocrm_client.extract_custom_field_value(lead_custom_fields, 667253)
+    order_number = lead_fields.get("order_number")
     if order_number:
-        text += f"🔢 <b>Номер заказа:</b> {order_number}\n"
+        parts.append(f"🔢 <b>Номер заказа:</b> {order_number}\n")
 
     # Адрес из кастомных полей сделки
-    address_found = False
-    for field in lead_custom_fields:
-        field_code = field.get("field_code")
-        values = field.get("values", [])
-
-        if field_code in ["ADDRESS", "ADRES", "address"] and values:
-            address = values[0].get("value")
-            text += f"📍 <b>Адрес:</b> {address}\n"
-            address_found = True
-            break
-
-    if not address_found:
-        text += f"📍 <b>Адрес:</b> Данные не найдены в AmoCRM\n"
+    if "address" in lead_fields:
+        parts.append(f"📍 <b>Адрес:</b> {lead_fields['address']}\n")
+    else:
+        parts.append(f"📍 <b>Адрес:</b> Данные не найдены в AmoCRM\n")
 
-    text += "\n"
+    parts.append("\n")
 
     # === БЛОК 2: Контактные данные ===
     if contacts:
         contact = contacts[0]  # Берем первый контакт
         contact_name = contact.get("name", "Данные не найдены в AmoCRM")
-        text += f"👤 <b>Контакт:</b> {contact_name}\n"
+        parts.append(f"👤 <b>Контакт:</b> {contact_name}\n")
 
         # Ищем телефон в кастомных полях контакта
-        custom_fields = contact.get("custom_fields_values", [])
-        for field in custom_fields:
+        for field in contact.get("custom_fields_values") or []:
             field_code = field.get("field_code")
             values = field.get("values", [])
 
-            if values and field_code == "PHONE":
-                from utils.phone_formatter import format_phone_for_telegram
-                value = values[0].get("value")
-                text += f"📞 <b>Телефон:</b> {format_phone_for_telegram(value)}\n"
+            formatter = _CONTACT_FIELDS.get(field_code)
+            if values and formatter:
+                parts.append(formatter(values[0].get("value")))
                 break
     else:
-        text += "👤 <b>Контакт:</b> Данные не найдены в AmoCRM\n"
+        parts.append("👤 <b>Контакт:</b> Данные не найдены в AmoCRM\n")
 
     # Ответственный менеджер
     if responsible_user:
         manager_name = responsible_user.get("name", "Данные не найдены в AmoCRM")
-        text += f"👨‍💼 <b>Ответственный в AmoCRM:</b> {manager_name}\n"
+        parts.append(f"👨‍💼 <b>Ответственный в AmoCRM:</b> {manager_name}\n")
 
-    text += "\n"
+    parts.append("\n")
 
     # === БЛОК 3: Параметры окон из AmoCRM ===
     has_window_info = False
 
     # Количество окон (ID: 676403)
-    windows_count = amocrm_client.extract_custom_field_value(lead_custom_fields, 676403)
+    windows_count = lead_fields.get("windows_count")
     if windows_count:
-        text += f"🪟 <b>Количество окон:</b> {windows_count}\n"
+        parts.append(f"🪟 <b>Количество окон:</b> {windows_count}\n")
         has_window_info = True
 
     # Площадь окон (ID: 808751)
-    windows_area = amocrm_client.extract_custom_field_value(lead_custom_fields, 808751)
+    windows_area = lead_fields.get("windows_area")
     if windows_area:
-        text += f"📐 <b>Площадь окон:</b> {windows_area} м²\n"
+        parts.append(f"📐 <b>Площадь окон:</b> {windows_area} м²\n")
         has_window_info = True
 
     if has_window_info:
-        text += "\n"
+        parts.append("\n")
 
     # === БЛОК 4: Дополнительная информация ===
-    text += f"🆔 <b>ID сделки в AmoCRM:</b> {lead_id}\n"
+    parts.append(f"🆔 <b>ID сделки в AmoCRM:</b> {lead_id}\n")
 
     # Дата создания (конвертируем в московское время)
     created_at = lead.get("created_at")
     if created_at:
-        from utils.timezone_utils import timestamp_to_moscow_time
-        created_date = timestamp_to_moscow_time(created_at)
-        if created_date:
-            text += f"📅 <b>Создано:</b> {created_date.strftime('%d.%m.%Y %H:%M')}\n"
+        parts.append(f"📅 <b>Создано:</b> {format_moscow_time(timestamp_to_moscow_time(created_at))}\n")
 
-    return text
+    return "".join(parts)
 
 
 async def notify_measurers_about_new_lead(full_info: Dict[str, Any]) -> None:
@@ -177,58 +357,69 @@ async def notify_measurers_about_new_lead(full_info: Dict[str, Any]) -> None:
     Args:
         full_info: Полная информация о сделке из AmoCRM API
     """
-    from database import get_db, get_all_measurers
     from config import settings
 
     try:
-        # Форматируем красивое уведомление
-        notification_text = format_lead_info_for_notification(full_info)
-        notification_text += "\n\n⏳ <i>Ожидаем назначения замерщика...</i>"
-
-        # Получаем список замерщиков
-        async for session in get_db():
-            measurers = await get_all_measurers(session)
-
-            if not measurers:
-                logger.warning("Нет доступных замерщиков для уведомления")
-                return
+        # Сначала проверяем получателей и бота, чтобы не форматировать сообщение впустую
+        # Получаем список замерщиков (из кэша, без запроса к БД на каждую сделку)
+        measurers = await cached_measurers()
 
-            # Получаем экземпляр бота
-            from bot_handlers import get_bot
-            bot = get_bot()
+        if not measurers:
+            logger.warning("Нет доступных замерщиков для уведомления")
+            return
 
-            if not bot:
-                logger.error("Не удалось получить экземпляр бота")
-                return
+        # Получаем экземпляр бота
+        from bot_handlers import get_bot
+        bot = get_bot()
 
-            # Отправляем уведомления всем замерщикам
-            for measurer in measurers:
-                try:
-                    await bot.send_message(
-                        chat_id=measurer.telegram_id,
-                        text=notification_text,
-                        parse_mode="HTML"
-                    )
-                    logger.info(f"Отправлено уведомление замерщику {measurer.full_name} ({measurer.telegram_id})")
-                except Exception as e:
-                    logger.error(f"Ошибка отправки уведомления замерщику {measurer.telegram_id}: {e}")
-
-            # Также уведомляем администраторов
-            for admin_id in settings.admin_ids_list:
-                try:
-                    admin_text = notification_text.replace(
-                        "⏳ <i>Ожидаем назначения замерщика...</i>",
-                        "👇 <b>Назначьте замерщика через команду или интерфейс бота</b>"
-                    )
+        if not bot:
+            logger.error("Не удалось получить экземпляр бота")
+            return
 
-                    await bot.send_message(
-                        chat_id=admin_id,
-                        text=admin_text,
-                        parse_mode="HTML"
-                    )
-                    logger.info(f"Отправлено уведомление администратору {admin_id}")
-                except Exception as e:
-                    logger.error(f"Ошибка отправки уведомления администратору {admin_id}: {e}")
+        # Форматируем красивое уведомление один раз и добавляем призыв к действию для каждой роли
+        lead_info_text = format_lead_info_for_notification(full_info)
+        notification_text = lead_info_text + "\n\n⏳ <i>Ожидаем назначения замерщика...</i>"
+        admin_text = lead_info_text + "\n\n👇 <b>Назначьте замерщика через команду или интерфейс бота</b>"
+
+        # Общие параметры сообщений для всех получателей
+        measurer_payload = {"text": notification_text, "parse_mode": "HTML"}
+        admin_payload = {"text": admin_text, "parse_mode": "HTML"}
+
+        # Отправляем уведомления всем замерщикам параллельно
+        results = await asyncio.gather(
+            *(
+                _limited_send(bot, measurer.telegram_id, **measurer_payload)
+                for measurer in measurers
+            ),
+            return_exceptions=True
+        )
+        measurers_delivered = sum(not isinstance(result, Exception) for result in results)
+        for measurer, result in zip(measurers, results):
+            if isinstance(result, Exception):
+                logger.error(f"Ошибка отправки уведомления замерщику {measurer.telegram_id}: {result}")
+            else:
+                logger.debug("Отправлено уведомление замерщику {} ({})", measurer.full_name, measurer.telegram_id)
+
+        # Также уведомляем администраторов
+        admin_ids = settings.admin_ids_list
+        results = await asyncio.gather(
+            *(
+                _limited_send(bot, admin_id, **admin_payload)
+                for admin_id in admin_ids
+            ),
+            return_exceptions=True
+        )
+        for admin_id, result in zip(admin_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Ошибка отправки уведомления администратору {admin_id}: {result}")
+            else:
+                logger.debug("Отправлено уведомление администратору {}", admin_id)
+        admins_delivered = sum(not isinstance(result, Exception) for result in results)
+
+        logger.info(
+            f"Уведомления о новой сделке доставлены: замерщикам {measurers_delivered}/{len(measurers)}, "
+            f"администраторам {admins_delivered}/{len(admin_ids)}"
+        )
 
     except Exception as e:
         logger.error(f"Ошибка при отправке уведомлений о новой сделке: {e}", exc_info=True)
@@ -238,7 +429,9 @@ async def notify_measurers_about_new_lead(full_info: Dict[str, Any]) -> None:
 async def send_new_measurement_to_admin(
     bot: Bot,
     admin_telegram_id: int,
-    measurement: Measurement
+    measurement: Measurement,
+    info_text: str | None = None,
+    session: AsyncSession | None = None
 ):
     """
     Отправить уведомление администратору/руководителю о новом замере с запросом подтверждения
@@ -247,14 +440,17 @@ async def send_new_measurement_to_admin(
         bot: Экземпляр бота
         admin_telegram_id: Telegram ID администратора/руководителя
         measurement: Объект замера
+        info_text: Готовый текст measurement.get_info_text(detailed=True, show_admin_info=True).
+            При рассылке нескольким получателям вызывающий код формирует его один раз,
+            чтобы не запрашивать данные Altawin для каждого получателя
+        session: Сессия БД (если не передана, открывается новая)
     """
     try:
-        from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-        from aiogram.utils.keyboard import InlineKeyboardBuilder
-
         # Формируем текст уведомления с информацией о распределении
         text = "🆕 <b>Новый замер - требуется подтверждение!</b>\n\n"
-        text += measurement.get_info_text(detailed=True, show_admin_info=True)
+        if info_text is None:
+            info_text = measurement.get_info_text(detailed=True, show_admin_info=True)
+        text += info_text
 
         # Проверяем auto_assigned_measurer (предложенный системой)
         if measurement.auto_assigned_measurer:
@@ -265,29 +461,13 @@ async def send_new_measurement_to_admin(
             text += "\n❓ <b>Выберите замерщика для этого замера:</b>"
 
         # Создаем клавиатуру с кнопками подтверждения и изменения
-        builder = InlineKeyboardBuilder()
-
-        if measurement.auto_assigned_measurer:
-            # Замерщик был предложен - даем кнопки подтверждения и изменения
-            builder.button(
-                text="✅ Подтвердить предложенного",
-                callback_data=f"confirm_assignment:{measurement.id}"
-            )
-            builder.button(
-                text="🔄 Выбрать другого",
-                callback_data=f"change_measurer:{measurement.id}"
-            )
-        else:
-            # Замерщик не был предложен - только кнопка выбора
-            builder.button(
-                text="👷 Назначить замерщика",
-                callback_data=f"change_measurer:{measurement.id}"
-            )
-
-        builder.adjust(1)
-        keyboard = builder.as_markup()
+        keyboard = get_assignment_confirmation_keyboard(
+            measurement.id,
+            has_suggestion=measurement.auto_assigned_measurer is not None
+        )
 
-        sent_message = await bot.send_message(
+        sent_message = await safe_send(
+            bot,
             chat_id=admin_telegram_id,
             text=text,
             reply_markup=keyboard,
@@ -295,10 +475,9 @@ async def send_new_measurement_to_admin(
         )
 
         # Сохраняем message_id в БД для возможности удаления/редактирования
-        from database import get_db, create_notification
-        async for session in get_db():
+        async with _notification_session(session) as notif_session:
             await create_notification(
-                session=session,
+                session=notif_session,
                 recipient_telegram_id=admin_telegram_id,
                 message_text=text,
                 notification_type="new_measurement_confirmation",
@@ -321,7 +500,8 @@ async def send_assignment_notification_to_measurer(
     bot: Bot,
     measurer: User,
     measurement: Measurement,
-    measurer_name: str = None
+    measurer_name: str = None,
+    session: AsyncSession | None = None
 ):
     """
     Отправить уведомление замерщику о назначении замера
@@ -331,8 +511,10 @@ async def send_assignment_notification_to_measurer(
         measurer: Объект замерщика
         measurement: Объект замера
         measurer_name: Имя замерщика (опционально, для корректного отображения)
+        session: Сессия БД (если не передана, открывается новая)
     """
-    from database import get_db, create_notification
+    # Текст для записи неудачной попытки, если ошибка произойдет до формирования сообщения
+    text = "Ошибка формирования текста"
 
     try:
         # Получаем актуальные данные из Altawin
@@ -371,7 +553,6 @@ async def send_assignment_notification_to_measurer(
             text += f"👷 <b>Замерщик:</b> {measurer_name}\n"
 
         # Дополнительная информация
-        from utils.timezone_utils import format_moscow_time
         text += f"\n🆔 <b>ID сделки в AmoCRM:</b> {measurement.amocrm_lead_id}\n"
 
         if measurement.created_at:
@@ -381,16 +562,17 @@ async def send_assignment_notification_to_measurer(
             text += f"📅 <b>Назначено:</b> {format_moscow_time(measurement.assigned_at)}\n"
 
         # Уведомление БЕЗ кнопок
-        await bot.send_message(
+        await safe_send(
+            bot,
             chat_id=measurer.telegram_id,
             text=text,
             parse_mode="HTML"
         )
 
         # Сохраняем уведомление в БД
-        async for session in get_db():
+        async with _notification_session(session) as notif_session:
             await create_notification(
-                session=session,
+                session=notif_session,
                 recipient_id=measurer.id,
                 message_text=text,
                 notification_type="assignment",
@@ -404,11 +586,11 @@ async def send_assignment_notification_to_measurer(
         logger.error(f"Ошибка отправки уведомления замерщику {measurer.telegram_id}: {e}")
         # Сохраняем неудачную попытку в БД
         try:
-            async for session in get_db():
+            async with _notification_session(session) as notif_session:
                 await create_notification(
-                    session=session,
+                    session=notif_session,
                     recipient_id=measurer.id,
-                    message_text=text if 'text' in locals() else "Ошибка формирования текста",
+                    message_text=text,
                     notification_type="assignment",
                     measurement_id=measurement.id,
                     is_sent=False
@@ -424,7 +606,8 @@ async def send_assignment_notification_to_manager(
     bot: Bot,
     manager: User,
     measurement: Measurement,
-    measurer: User | None
+    measurer: User | None,
+    session: AsyncSession | None = None
 ):
     """
     Отправить уведомление менеджеру о назначении замерщика
@@ -434,9 +617,10 @@ async def send_assignment_notification_to_manager(
         manager: Объект менеджера
         measurement: Объект замера
         measurer: Объект назначенного замерщика (может быть None)
+        session: Сессия БД (если не передана, открывается новая)
     """
-    from database import get_db, create_notification
-    from utils.timezone_utils import format_moscow_time
+    # Текст для записи неудачной попытки, если ошибка произойдет до формирования сообщения
+    text = "Ошибка формирования текста"
 
     try:
         # Проверяем, что замерщик назначен
@@ -448,50 +632,35 @@ async def send_assignment_notification_to_manager(
         altawin_data = measurement.get_altawin_data()
         altawin_values = get_altawin_display_values(altawin_data, measurement.contact_phone)
 
-        text = "✅ <b>Замерщик назначен на ваш заказ</b>\n\n"
-        text += f"📋 <b>Замер #{measurement.id}</b>\n\n"
-
-        # === БЛОК 1: Основная информация о заказе ===
-        text += f"📄 <b>Сделка:</b> {measurement.lead_name}\n"
-        text += f"🔢 <b>Номер заказа:</b> {altawin_values['order_number']}\n"
-        text += f"📍 <b>Адрес:</b> {altawin_values['address']}\n"
-        text += f"🚚 <b>Зона доставки:</b> {altawin_values['zone']}\n"
-
-        text += "\n"
-
-        # === БЛОК 2: Контактные данные ===
-        text += f"👤 <b>Контакт:</b> {measurement.contact_name or 'Данные не найдены в AmoCRM'}\n"
-        text += f"📞 <b>Телефон:</b> {altawin_values['phone']}\n"
-
-        text += "\n"
-
-        # === БЛОК 3: Параметры окон (если есть) ===
-        text += f"🪟 <b>Количество окон:</b> {altawin_values['qty_izd']}\n"
-        text += f"📐 <b>Площадь окон:</b> {altawin_values['area_izd']}\n\n"
-
-        # === БЛОК 4: Назначение и статус ===
-        text += f"👷 <b>Замерщик:</b> {measurer.full_name}\n"
-        text += f"📊 <b>Статус:</b> {measurement.status_text}\n"
-
-        # === БЛОК 5: Временные метки ===
-        text += f"\n🆔 <b>ID сделки в AmoCRM:</b> {measurement.amocrm_lead_id}\n"
-
-        if measurement.created_at:
-            text += f"📅 <b>Создано:</b> {format_moscow_time(measurement.created_at)}\n"
-
-        if measurement.assigned_at:
-            text += f"📅 <b>Назначено:</b> {format_moscow_time(measurement.assigned_at)}\n"
+        text = _ASSIGNMENT_MANAGER_TMPL.safe_substitute(
+            id=measurement.id,
+            lead_name=measurement.lead_name,
+            contact_name=measurement.contact_name or 'Данные не найдены в AmoCRM',
+            measurer_name=measurer.full_name,
+            status_text=measurement.status_text,
+            amocrm_lead_id=measurement.amocrm_lead_id,
+            created_block=(
+                f"📅 <b>Создано:</b> {format_moscow_time(measurement.created_at)}\n"
+                if measurement.created_at else ""
+            ),
+            assigned_block=(
+                f"📅 <b>Назначено:</b> {format_moscow_time(measurement.assigned_at)}\n"
+                if measurement.assigned_at else ""
+            ),
+            **altawin_values
+        )
 
-        await bot.send_message(
+        await safe_send(
+            bot,
             chat_id=manager.telegram_id,
             text=text,
             parse_mode="HTML"
         )
 
         # Сохраняем уведомление в БД
-        async for session in get_db():
+        async with _notification_session(session) as notif_session:
             await create_notification(
-                session=session,
+                session=notif_session,
                 recipient_id=manager.id,
                 message_text=text,
                 notification_type="manager_notification",
@@ -505,11 +674,11 @@ async def send_assignment_notification_to_manager(
         logger.error(f"Ошибка отправки уведомления менеджеру {manager.telegram_id}: {e}")
         # Сохраняем неудачную попытку в БД
         try:
-            async for session in get_db():
+            async with _notification_session(session) as notif_session:
                 await create_notification(
-                    session=session,
+                    session=notif_session,
                     recipient_id=manager.id,
-                    message_text=text if 'text' in locals() else "Ошибка формирования текста",
+                    message_text=text,
                     notification_type="manager_notification",
                     measurement_id=measurement.id,
                     is_sent=False
@@ -523,7 +692,8 @@ async def send_assignment_notification_to_manager(
 @log_notification("NEW_MEASUREMENT_TO_OBSERVERS")
 async def send_new_measurement_notification_to_observers(
     bot: Bot,
-    measurement: Measurement
+    measurement: Measurement,
+    session: AsyncSession | None = None
 ):
     """
     Отправить уведомление наблюдателям о НОВОМ замере (без информации об автоназначении)
@@ -531,9 +701,9 @@ async def send_new_measurement_notification_to_observers(
     Args:
         bot: Экземпляр бота
         measurement: Объект замера
+        session: Сессия БД (если не передана, открывается новая)
     """
-    from database import get_db, create_notification, get_all_observers
-    from utils.timezone_utils import format_moscow_time
+    from database import get_all_observers, create_notification_bulk
 
     try:
         # Получаем актуальные данные из Altawin
@@ -541,8 +711,8 @@ async def send_new_measurement_notification_to_observers(
         altawin_values = get_altawin_display_values(altawin_data, measurement.contact_phone)
 
         # Получаем всех активных наблюдателей
-        async for session in get_db():
-            observers = await get_all_observers(session)
+        async with _notification_session(session) as notif_session:
+            observers = await get_all_observers(notif_session)
 
             if not observers:
                 logger.info("Нет активных наблюдателей для уведомления")
@@ -587,48 +757,44 @@ async def send_new_measurement_notification_to_observers(
             text += "\n⏳ <i>Ожидает подтверждения распределения...</i>"
 
             # Отправляем уведомление каждому наблюдателю
+            rows = []
             for observer in observers:
                 try:
-                    await bot.send_message(
+                    await safe_send(
+                        bot,
                         chat_id=observer.telegram_id,
                         text=text,
                         parse_mode="HTML"
                     )
 
-                    # Сохраняем уведомление в БД
-                    async for session in get_db():
-                        await create_notification(
-                            session=session,
-                            recipient_id=observer.id,
-                            message_text=text,
-                            notification_type="observer_new_measurement",
-                            measurement_id=measurement.id,
-                            is_sent=True
-                        )
-                        break
+                    # Запись в БД добавляется одним INSERT после рассылки
+                    rows.append({
+                        "recipient_id": observer.id,
+                        "message_text": text,
+                        "notification_type": "observer_new_measurement",
+                        "measurement_id": measurement.id,
+                        "is_sent": True,
+                    })
 
                     logger.info(f"Отправлено уведомление о новом замере наблюдателю {observer.telegram_id} ({observer.full_name})")
 
                 except TelegramAPIError as e:
                     logger.error(f"Ошибка отправки уведомления наблюдателю {observer.telegram_id}: {e}")
                     # Сохраняем неудачную попытку в БД
-                    try:
-                        async for session in get_db():
-                            await create_notification(
-                                session=session,
-                                recipient_id=observer.id,
-                                message_text=text,
-                                notification_type="observer_new_measurement",
-                                measurement_id=measurement.id,
-                                is_sent=False
-                            )
-                            break
-                    except Exception:
-                        pass
+                    rows.append({
+                        "recipient_id": observer.id,
+                        "message_text": text,
+                        "notification_type": "observer_new_measurement",
+                        "measurement_id": measurement.id,
+                        "is_sent": False,
+                    })
                 except Exception as e:
                     logger.error(f"Неожиданная ошибка при отправке уведомления наблюдателю {observer.telegram_id}: {e}", exc_info=True)
 
-            break  # Выходим из цикла get_db()
+            try:
+                await create_notification_bulk(notif_session, rows)
+            except Exception as e:
+                logger.error(f"Ошибка сохранения уведомлений наблюдателям о замере #{measurement.id}: {e}", exc_info=True)
 
     except Exception as e:
         logger.error(f"Ошибка при отправке уведомлений наблюдателям: {e}", exc_info=True)
@@ -638,7 +804,8 @@ async def send_new_measurement_notification_to_observers(
 async def send_assignment_notification_to_observers(
     bot: Bot,
     measurement: Measurement,
-    measurer: User | None
+    measurer: User | None,
+    session: AsyncSession | None = None
 ):
     """
     Отправить уведомление наблюдателям о назначении замерщика
@@ -647,9 +814,9 @@ async def send_assignment_notification_to_observers(
         bot: Экземпляр бота
         measurement: Объект замера
         measurer: Объект назначенного замерщика (может быть None)
+        session: Сессия БД (если не передана, открывается новая)
     """
-    from database import get_db, create_notification, get_all_observers
-    from utils.timezone_utils import format_moscow_time
+    from database import get_all_observers, create_notification_bulk
 
     try:
         # Получаем актуальные данные из Altawin
@@ -657,8 +824,8 @@ async def send_assignment_notification_to_observers(
         altawin_values = get_altawin_display_values(altawin_data, measurement.contact_phone)
 
         # Получаем всех активных наблюдателей
-        async for session in get_db():
-            observers = await get_all_observers(session)
+        async with _notification_session(session) as notif_session:
+            observers = await get_all_observers(notif_session)
 
             if not observers:
                 logger.info("Нет активных наблюдателей для уведомления")
@@ -710,48 +877,44 @@ async def send_assignment_notification_to_observers(
                 text += f"📅 <b>Назначено:</b> {format_moscow_time(measurement.assigned_at)}\n"
 
             # Отправляем уведомление каждому наблюдателю
+            rows = []
             for observer in observers:
                 try:
-                    await bot.send_message(
+                    await safe_send(
+                        bot,
                         chat_id=observer.telegram_id,
                         text=text,
                         parse_mode="HTML"
                     )
 
-                    # Сохраняем уведомление в БД
-                    async for session in get_db():
-                        await create_notification(
-                            session=session,
-                            recipient_id=observer.id,
-                            message_text=text,
-                            notification_type="observer_notification",
-                            measurement_id=measurement.id,
-                            is_sent=True
-                        )
-                        break
+                    # Запись в БД добавляется одним INSERT после рассылки
+                    rows.append({
+                        "recipient_id": observer.id,
+                        "message_text": text,
+                        "notification_type": "observer_notification",
+                        "measurement_id": measurement.id,
+                        "is_sent": True,
+                    })
 
                     logger.info(f"Отправлено уведомление о назначении наблюдателю {observer.telegram_id} ({observer.full_name})")
 
                 except TelegramAPIError as e:
                     logger.error(f"Ошибка отправки уведомления наблюдателю {observer.telegram_id}: {e}")
                     # Сохраняем неудачную попытку в БД
-                    try:
-                        async for session in get_db():
-                            await create_notification(
-                                session=session,
-                                recipient_id=observer.id,
-                                message_text=text,
-                                notification_type="observer_notification",
-                                measurement_id=measurement.id,
-                                is_sent=False
-                            )
-                            break
-                    except Exception:
-                        pass
+                    rows.append({
+                        "recipient_id": observer.id,
+                        "message_text": text,
+                        "notification_type": "observer_notification",
+                        "measurement_id": measurement.id,
+                        "is_sent": False,
+                    })
                 except Exception as e:
                     logger.error(f"Неожиданная ошибка при отправке уведомления наблюдателю {observer.telegram_id}: {e}", exc_info=True)
 
-            break  # Выходим из цикла get_db()
+            try:
+                await create_notification_bulk(notif_session, rows)
+            except Exception as e:
+                logger.error(f"Ошибка сохранения уведомлений наблюдателям о назначении замера #{measurement.id}: {e}", exc_info=True)
 
     except Exception as e:
         logger.error(f"Ошибка при отправке уведомлений наблюдателям: {e}", exc_info=True)
@@ -787,7 +950,8 @@ async def send_status_change_notification(
         text += f"<b>Старый статус:</b> {old_status}\n"
         text += f"<b>Новый статус:</b> {new_status}\n"
 
-        await bot.send_message(
+        await safe_send(
+            bot,
             chat_id=user.telegram_id,
             text=text,
             parse_mode="HTML"
@@ -807,7 +971,8 @@ async def send_measurer_change_notification(
     old_measurer: Optional[User],
     new_measurer: User,
     measurement: Measurement,
-    manager: Optional[User] = None
+    manager: Optional[User] = None,
+    session: AsyncSession | None = None
 ):
     """
     Отправить уведомления при изменении замерщика
@@ -818,258 +983,193 @@ async def send_measurer_change_notification(
         new_measurer: Новый замерщик
         measurement: Объект замера
         manager: Менеджер (если есть)
+        session: Сессия БД (если не передана, открывается новая)
     """
-    from database import get_db, create_notification
-
     # Получаем актуальные данные из Altawin
     altawin_data = measurement.get_altawin_data()
     altawin_values = get_altawin_display_values(altawin_data, measurement.contact_phone)
 
-    # Уведомление старому замерщику
-    if old_measurer:
-        try:
-            text = "⚠️ <b>Вы сняты с замера</b>\n\n"
-            text += f"📋 <b>Замер #{measurement.id}</b>\n"
-            text += f"👤 <b>Клиент:</b> {measurement.contact_name or 'Данные не найдены в AmoCRM'}\n"
-            text += f"📍 <b>Адрес:</b> {altawin_values['address']}\n\n"
-            text += f"Замер переназначен на: {new_measurer.full_name}"
-
-            await bot.send_message(
-                chat_id=old_measurer.telegram_id,
-                text=text,
-                parse_mode="HTML"
-            )
+    # Одна сессия БД на все уведомления об изменении замерщика
+    async with _notification_session(session) as notif_session:
+        # Уведомление старому замерщику
+        if old_measurer:
+            try:
+                text = (
+                    "⚠️ <b>Вы сняты с замера</b>\n\n"
+                    f"📋 <b>Замер #{measurement.id}</b>\n"
+                    f"👤 <b>Клиент:</b> {measurement.contact_name or 'Данные не найдены в AmoCRM'}\n"
+                    f"📍 <b>Адрес:</b> {altawin_values['address']}\n\n"
+                    f"Замер переназначен на: {new_measurer.full_name}"
+                )
 
-            # Сохраняем уведомление в БД
-            async for session in get_db():
+                await safe_send(
+                    bot,
+                    chat_id=old_measurer.telegram_id,
+                    text=text,
+                    parse_mode="HTML"
+                )
+
+                # Сохраняем уведомление в БД
                 await create_notification(
-                    session=session,
+                    session=notif_session,
                     recipient_id=old_measurer.id,
                     message_text=text,
                     notification_type="change",
                     measurement_id=measurement.id,
                     is_sent=True
                 )
-        except Exception as e:
-            logger.error(f"Ошибка отправки уведомления старому замерщику: {e}")
-
-    # Уведомление новому замерщику
-    await send_assignment_notification_to_measurer(bot, new_measurer, measurement, new_measurer.full_name)
-
-    # Уведомление менеджеру
-    if manager:
-        try:
-            from utils.timezone_utils import format_moscow_time
-
-            text = "🔄 <b>Изменен замерщик на вашем заказе</b>\n\n"
-            text += f"📋 <b>Замер #{measurement.id}</b>\n\n"
-
-            # === БЛОК 1: Основная информация о заказе ===
-            text += f"📄 <b>Сделка:</b> {measurement.lead_name}\n"
-            text += f"🔢 <b>Номер заказа:</b> {altawin_values['order_number']}\n"
-            text += f"📍 <b>Адрес:</b> {altawin_values['address']}\n"
-            text += f"🚚 <b>Зона доставки:</b> {altawin_values['zone']}\n"
-
-            text += "\n"
-
-            # === БЛОК 2: Контактные данные ===
-            text += f"👤 <b>Контакт:</b> {measurement.contact_name or 'Данные не найдены в AmoCRM'}\n"
-            text += f"📞 <b>Телефон:</b> {altawin_values['phone']}\n"
-
-            text += "\n"
+            except Exception as e:
+                logger.error(f"Ошибка отправки уведомления старому замерщику: {e}")
 
-            # === БЛОК 3: Параметры окон (если есть) ===
-            text += f"🪟 <b>Количество окон:</b> {altawin_values['qty_izd']}\n"
-            text += f"📐 <b>Площадь окон:</b> {altawin_values['area_izd']}\n\n"
-
-            # === БЛОК 4: Изменение замерщика ===
-            text += "⚠️ <b>ИЗМЕНЕНИЕ ЗАМЕРЩИКА:</b>\n"
-            if old_measurer:
-                text += f"   ❌ Старый: {old_measurer.full_name}\n"
-
-            text += f"   ✅ Новый: {new_measurer.full_name}\n"
-            text += f"\n📊 <b>Статус:</b> {measurement.status_text}\n"
-
-            # === БЛОК 5: Дополнительная информация ===
-            text += f"\n🆔 <b>ID сделки в AmoCRM:</b> {measurement.amocrm_lead_id}\n"
+        # Уведомление новому замерщику
+        await send_assignment_notification_to_measurer(
+            bot, new_measurer, measurement, new_measurer.full_name, session=notif_session
+        )
 
-            if measurement.created_at:
-                text += f"📅 <b>Создано:</b> {format_moscow_time(measurement.created_at)}\n"
+        # Уведомление менеджеру
+        if manager:
+            try:
+                text = _MEASURER_CHANGE_MANAGER_TMPL.safe_substitute(
+                    id=measurement.id,
+                    lead_name=measurement.lead_name,
+                    contact_name=measurement.contact_name or 'Данные не найдены в AmoCRM',
+                    old_measurer_block=(
+                        f"   ❌ Старый: {old_measurer.full_name}\n" if old_measurer else ""
+                    ),
+                    new_measurer_name=new_measurer.full_name,
+                    status_text=measurement.status_text,
+                    amocrm_lead_id=measurement.amocrm_lead_id,
+                    created_block=(
+                        f"📅 <b>Создано:</b> {format_moscow_time(measurement.created_at)}\n"
+                        if measurement.created_at else ""
+                    ),
+                    **altawin_values
+                )
 
-            await bot.send_message(
-                chat_id=manager.telegram_id,
-                text=text,
-                parse_mode="HTML"
-            )
+                await safe_send(
+                    bot,
+                    chat_id=manager.telegram_id,
+                    text=text,
+                    parse_mode="HTML"
+                )
 
-            # Сохраняем уведомление в БД
-            async for session in get_db():
+                # Сохраняем уведомление в БД
                 await create_notification(
-                    session=session,
+                    session=notif_session,
                     recipient_id=manager.id,
                     message_text=text,
                     notification_type="change",
                     measurement_id=measurement.id,
                     is_sent=True
                 )
-        except Exception as e:
-            logger.error(f"Ошибка отправки уведомления менеджеру: {e}")
+            except Exception as e:
+                logger.error(f"Ошибка отправки уведомления менеджеру: {e}")
 
 
 @log_notification("COMPLETION")
 async def send_completion_notification(
     bot: Bot,
     measurement: Measurement,
-    manager: Optional[User] = None
+    manager: Optional[User] = None,
+    session: AsyncSession | None = None
 ):
     """
     Отправить уведомление о завершении замера менеджеру, администраторам и руководителям
 
+    Связь measurement.measurer должна быть загружена заранее
+    (например, get_measurement_by_id загружает ее через joinedload), иначе в async-сессии
+    обращение к ней приведет к дополнительному запросу или MissingGreenlet.
+
     Args:
         bot: Экземпляр бота
         measurement: Объект замера
         manager: Менеджер (если есть)
+        session: Сессия БД (если не передана, открывается новая)
     """
-    from database import get_db, create_notification, get_all_admins, get_all_supervisors
-    from utils.timezone_utils import format_moscow_time
+    from database import create_notification_bulk
 
     # Получаем актуальные данные из Altawin
     altawin_data = measurement.get_altawin_data()
     altawin_values = get_altawin_display_values(altawin_data, measurement.contact_phone)
 
-    # Формируем развернутое текст уведомления
-    text = "✅ <b>Замер выполнен!</b>\n\n"
-    text += f"📋 <b>Замер #{measurement.id}</b>\n\n"
-
-    # === БЛОК 1: Основная информация о заказе ===
-    text += f"📄 <b>Сделка:</b> {measurement.lead_name}\n"
-    text += f"🔢 <b>Номер заказа:</b> {altawin_values['order_number']}\n"
-    text += f"📍 <b>Адрес:</b> {altawin_values['address']}\n"
-    text += f"🚚 <b>Зона доставки:</b> {altawin_values['zone']}\n"
-
-    text += "\n"
-
-    # === БЛОК 2: Контактные данные ===
-    text += f"👤 <b>Контакт:</b> {measurement.contact_name or 'Данные не найдены в AmoCRM'}\n"
-    text += f"📞 <b>Телефон:</b> {altawin_values['phone']}\n"
-    text += f"👨‍💼 <b>Ответственный в AmoCRM:</b> {measurement.responsible_user_name or 'Данные не найдены в AmoCRM'}\n"
-
-    text += "\n"
-
-    # === БЛОК 3: Параметры окон (если есть) ===
-    text += f"🪟 <b>Количество окон:</b> {altawin_values['qty_izd']}\n"
-    text += f"📐 <b>Площадь окон:</b> {altawin_values['area_izd']}\n\n"
-
-    # === БЛОК 4: Результат выполнения ===
-    if measurement.measurer:
-        text += f"👷 <b>Замерщик:</b> {measurement.measurer.full_name}\n"
-
-    text += f"📊 <b>Статус:</b> {measurement.status_text}\n"
-
-    # === БЛОК 5: Временные метки ===
-    text += f"\n🆔 <b>ID сделки в AmoCRM:</b> {measurement.amocrm_lead_id}\n"
-
-    if measurement.created_at:
-        text += f"📅 <b>Создано:</b> {format_moscow_time(measurement.created_at)}\n"
-
-    if measurement.assigned_at:
-        text += f"📅 <b>Назначено:</b> {format_moscow_time(measurement.assigned_at)}\n"
-
-    if measurement.completed_at:
-        text += f"✅ <b>Завершено:</b> {format_moscow_time(measurement.completed_at)}\n"
+    # Формируем развернутый текст уведомления по шаблону
+    text = _COMPLETION_TMPL.safe_substitute(
+        id=measurement.id,
+        lead_name=measurement.lead_name,
+        contact_name=measurement.contact_name or 'Данные не найдены в AmoCRM',
+        responsible_user_name=measurement.responsible_user_name or 'Данные не найдены в AmoCRM',
+        status_text=measurement.status_text,
+        amocrm_lead_id=measurement.amocrm_lead_id,
+        measurer_block=(
+            f"👷 <b>Замерщик:</b> {measurement.measurer.full_name}\n"
+            if measurement.measurer else ""
+        ),
+        created_block=(
+            f"📅 <b>Создано:</b> {format_moscow_time(measurement.created_at)}\n"
+            if measurement.created_at else ""
+        ),
+        assigned_block=(
+            f"📅 <b>Назначено:</b> {format_moscow_time(measurement.assigned_at)}\n"
+            if measurement.assigned_at else ""
+        ),
+        completed_block=(
+            f"✅ <b>Завершено:</b> {format_moscow_time(measurement.completed_at)}\n"
+            if measurement.completed_at else ""
+        ),
+        **altawin_values
+    )
 
     logger.info(f"Начало отправки уведомлений о завершении замера #{measurement.id}")
 
-    # Получаем список администраторов и руководителей
-    admins = []
-    supervisors = []
-
-    try:
-        async for session in get_db():
-            admins = await get_all_admins(session)
-            supervisors = await get_all_supervisors(session)
-            logger.info(f"Найдено администраторов: {len(admins)}, руководителей: {len(supervisors)}")
-            break
-    except Exception as e:
-        logger.error(f"Ошибка получения списка администраторов и руководителей: {e}", exc_info=True)
+    # Общие параметры сообщения для всех получателей
+    payload = {"text": text, "parse_mode": "HTML"}
 
-    # Отправляем уведомление менеджеру
-    if manager:
+    async def notify(recipient: User | Recipient, recipient_label: str) -> bool:
+        """Отправить уведомление одному получателю"""
         try:
-            await bot.send_message(
-                chat_id=manager.telegram_id,
-                text=text,
-                parse_mode="HTML"
-            )
-
-            # Сохраняем уведомление в БД
-            async for session in get_db():
-                await create_notification(
-                    session=session,
-                    recipient_id=manager.id,
-                    message_text=text,
-                    notification_type="completion",
-                    measurement_id=measurement.id,
-                    is_sent=True
-                )
-                break
-
-            logger.info(f"Отправлено уведомление о завершении менеджеру {manager.telegram_id}")
-
+            await _limited_send(bot, recipient.telegram_id, **payload)
+            logger.debug("Отправлено уведомление о завершении {} {} ({})", recipient_label, recipient.telegram_id, recipient.full_name)
+            return True
         except Exception as e:
-            logger.error(f"Ошибка отправки уведомления о завершении менеджеру: {e}", exc_info=True)
+            logger.error(f"Ошибка отправки уведомления о завершении {recipient_label} {recipient.telegram_id}: {e}", exc_info=True)
+            return False
 
-    # Отправляем уведомления администраторам
-    for admin in admins:
-        try:
-            await bot.send_message(
-                chat_id=admin.telegram_id,
-                text=text,
-                parse_mode="HTML"
-            )
-
-            # Сохраняем уведомление в БД
-            async for session in get_db():
-                await create_notification(
-                    session=session,
-                    recipient_id=admin.id,
-                    message_text=text,
-                    notification_type="completion",
-                    measurement_id=measurement.id,
-                    is_sent=True
-                )
-                break
-
-            logger.info(f"Отправлено уведомление о завершении администратору {admin.telegram_id} ({admin.full_name})")
+    # Одна сессия БД на получение списков и запись всех уведомлений
+    async with _notification_session(session) as notif_session:
+        # Получаем список администраторов и руководителей
+        admins = []
+        supervisors = []
 
+        try:
+            admins, supervisors = await cached_admins_and_supervisors(notif_session)
+            logger.info(f"Найдено администраторов: {len(admins)}, руководителей: {len(supervisors)}")
         except Exception as e:
-            logger.error(f"Ошибка отправки уведомления администратору {admin.telegram_id}: {e}", exc_info=True)
-
-    # Отправляем уведомления руководителям
-    for supervisor in supervisors:
+            logger.error(f"Ошибка получения списка администраторов и руководителей: {e}", exc_info=True)
+
+        # Отправляем уведомления менеджеру, администраторам и руководителям параллельно
+        recipients = [(manager, "менеджеру")] if manager else []
+        recipients += [(admin, "администратору") for admin in admins]
+        recipients += [(supervisor, "руководителю") for supervisor in supervisors]
+
+        results = await asyncio.gather(*(notify(recipient, label) for recipient, label in recipients))
+        logger.info(f"Уведомления о завершении замера #{measurement.id} доставлены: {sum(results)}/{len(recipients)}")
+
+        # Сохраняем уведомления в БД одним INSERT (сессия не используется параллельно, поэтому после рассылки)
+        rows = [
+            {
+                "recipient_id": recipient.id,
+                "message_text": text,
+                "notification_type": "completion",
+                "measurement_id": measurement.id,
+                "is_sent": True,
+            }
+            for (recipient, _), is_delivered in zip(recipients, results)
+            if is_delivered
+        ]
         try:
-            await bot.send_message(
-                chat_id=supervisor.telegram_id,
-                text=text,
-                parse_mode="HTML"
-            )
-
-            # Сохраняем уведомление в БД
-            async for session in get_db():
-                await create_notification(
-                    session=session,
-                    recipient_id=supervisor.id,
-                    message_text=text,
-                    notification_type="completion",
-                    measurement_id=measurement.id,
-                    is_sent=True
-                )
-                break
-
-            logger.info(f"Отправлено уведомление о завершении руководителю {supervisor.telegram_id} ({supervisor.full_name})")
-
+            await create_notification_bulk(notif_session, rows)
         except Exception as e:
-            logger.error(f"Ошибка отправки уведомления руководителю {supervisor.telegram_id}: {e}", exc_info=True)
+            logger.error(f"Ошибка сохранения уведомлений о завершении замера #{measurement.id}: {e}", exc_info=True)
 
     logger.info(f"Завершена отправка уведомлений о завершении замера #{measurement.id}")
 
@@ -1078,7 +1178,8 @@ async def send_cancellation_notification(
     bot: Bot,
     measurement: Measurement,
     cancelled_by: User,
-    manager: Optional[User] = None
+    manager: Optional[User] = None,
+    session: AsyncSession | None = None
 ):
     """
     Отправить уведомление об отмене замера всем участникам
@@ -1088,9 +1189,9 @@ async def send_cancellation_notification(
         measurement: Объект замера
         cancelled_by: Пользователь, который отменил замер
         manager: Менеджер (если есть)
+        session: Сессия БД (если не передана, открывается новая)
     """
-    from database import get_db, create_notification, get_all_admins, get_all_supervisors, get_all_observers
-    from utils.timezone_utils import format_moscow_time
+    from database import get_all_observers, create_notification_bulk
 
     # Получаем актуальные данные из Altawin
     altawin_data = measurement.get_altawin_data()
@@ -1136,164 +1237,162 @@ async def send_cancellation_notification(
 
     logger.info(f"Начало отправки уведомлений об отмене замера #{measurement.id}")
 
-    # Получаем список администраторов, руководителей и наблюдателей
-    admins = []
-    supervisors = []
-    observers = []
-
-    try:
-        async for session in get_db():
-            admins = await get_all_admins(session)
-            supervisors = await get_all_supervisors(session)
-            observers = await get_all_observers(session)
-            logger.info(f"Найдено администраторов: {len(admins)}, руководителей: {len(supervisors)}, наблюдателей: {len(observers)}")
-            break
-    except Exception as e:
-        logger.error(f"Ошибка получения списков пользователей: {e}", exc_info=True)
+    # Одна сессия БД на получение списков и запись всех уведомлений
+    async with _notification_session(session) as notif_session:
+        # Получаем список администраторов, руководителей и наблюдателей
+        admins = []
+        supervisors = []
+        observers = []
 
-    # Отправляем уведомление менеджеру
-    if manager:
         try:
-            await bot.send_message(
-                chat_id=manager.telegram_id,
-                text=text,
-                parse_mode="HTML"
-            )
-
-            # Сохраняем уведомление в БД
-            async for session in get_db():
-                await create_notification(
-                    session=session,
-                    recipient_id=manager.id,
-                    message_text=text,
-                    notification_type="cancellation",
-                    measurement_id=measurement.id,
-                    is_sent=True
-                )
-                break
-
-            logger.info(f"Отправлено уведомление об отмене менеджеру {manager.telegram_id}")
-
+            admins, supervisors = await cached_admins_and_supervisors(notif_session)
         except Exception as e:
-            logger.error(f"Ошибка отправки уведомления об отмене менеджеру: {e}", exc_info=True)
+            logger.error(f"Ошибка получения списка администраторов и руководителей: {e}", exc_info=True)
 
-    # Отправляем уведомление замерщику (если он не тот, кто отменил)
-    if measurement.measurer and measurement.measurer.id != cancelled_by.id:
         try:
-            await bot.send_message(
-                chat_id=measurement.measurer.telegram_id,
-                text=text,
-                parse_mode="HTML"
-            )
-
-            # Сохраняем уведомление в БД
-            async for session in get_db():
-                await create_notification(
-                    session=session,
-                    recipient_id=measurement.measurer.id,
-                    message_text=text,
-                    notification_type="cancellation",
-                    measurement_id=measurement.id,
-                    is_sent=True
-                )
-                break
-
-            logger.info(f"Отправлено уведомление об отмене замерщику {measurement.measurer.telegram_id} ({measurement.measurer.full_name})")
-
+            observers = await get_all_observers(notif_session)
         except Exception as e:
-            logger.error(f"Ошибка отправки уведомления замерщику {measurement.measurer.telegram_id}: {e}", exc_info=True)
+            logger.error(f"Ошибка получения списка наблюдателей: {e}", exc_info=True)
 
-    # Отправляем уведомления администраторам
-    for admin in admins:
-        # Не отправляем тому, кто отменил
-        if admin.id == cancelled_by.id:
-            continue
+        logger.info(f"Найдено администраторов: {len(admins)}, руководителей: {len(supervisors)}, наблюдателей: {len(observers)}")
 
-        try:
-            await bot.send_message(
-                chat_id=admin.telegram_id,
-                text=text,
-                parse_mode="HTML"
-            )
+        rows = []
 
-            # Сохраняем уведомление в БД
-            async for session in get_db():
-                await create_notification(
-                    session=session,
-                    recipient_id=admin.id,
-                    message_text=text,
-                    notification_type="cancellation",
-                    measurement_id=measurement.id,
-                    is_sent=True
+        # Отправляем уведомление менеджеру
+        if manager:
+            try:
+                await safe_send(
+                    bot,
+                    chat_id=manager.telegram_id,
+                    text=text,
+                    parse_mode="HTML"
                 )
-                break
-
-            logger.info(f"Отправлено уведомление об отмене администратору {admin.telegram_id} ({admin.full_name})")
 
-        except Exception as e:
-            logger.error(f"Ошибка отправки уведомления администратору {admin.telegram_id}: {e}", exc_info=True)
+                # Запись в БД добавляется одним INSERT после рассылки
+                rows.append({
+                    "recipient_id": manager.id,
+                    "message_text": text,
+                    "notification_type": "cancellation",
+                    "measurement_id": measurement.id,
+                    "is_sent": True,
+                })
+
+                logger.info(f"Отправлено уведомление об отмене менеджеру {manager.telegram_id}")
+
+            except Exception as e:
+                logger.error(f"Ошибка отправки уведомления об отмене менеджеру: {e}", exc_info=True)
+
+        # Отправляем уведомление замерщику (если он не тот, кто отменил)
+        if measurement.measurer and measurement.measurer.id != cancelled_by.id:
+            try:
+                await safe_send(
+                    bot,
+                    chat_id=measurement.measurer.telegram_id,
+                    text=text,
+                    parse_mode="HTML"
+                )
 
-    # Отправляем уведомления руководителям
-    for supervisor in supervisors:
-        # Не отправляем тому, кто отменил
-        if supervisor.id == cancelled_by.id:
-            continue
+                # Запись в БД добавляется одним INSERT после рассылки
+                rows.append({
+                    "recipient_id": measurement.measurer.id,
+                    "message_text": text,
+                    "notification_type": "cancellation",
+                    "measurement_id": measurement.id,
+                    "is_sent": True,
+                })
+
+                logger.info(f"Отправлено уведомление об отмене замерщику {measurement.measurer.telegram_id} ({measurement.measurer.full_name})")
+
+            except Exception as e:
+                logger.error(f"Ошибка отправки уведомления замерщику {measurement.measurer.telegram_id}: {e}", exc_info=True)
+
+        # Отправляем уведомления администраторам
+        for admin in admins:
+            # Не отправляем тому, кто отменил
+            if admin.id == cancelled_by.id:
+                continue
+
+            try:
+                await safe_send(
+                    bot,
+                    chat_id=admin.telegram_id,
+                    text=text,
+                    parse_mode="HTML"
+                )
 
-        try:
-            await bot.send_message(
-                chat_id=supervisor.telegram_id,
-                text=text,
-                parse_mode="HTML"
-            )
+                # Запись в БД добавляется одним INSERT после рассылки
+                rows.append({
+                    "recipient_id": admin.id,
+                    "message_text": text,
+                    "notification_type": "cancellation",
+                    "measurement_id": measurement.id,
+                    "is_sent": True,
+                })
+
+                logger.info(f"Отправлено уведомление об отмене администратору {admin.telegram_id} ({admin.full_name})")
+
+            except Exception as e:
+                logger.error(f"Ошибка отправки уведомления администратору {admin.telegram_id}: {e}", exc_info=True)
+
+        # Отправляем уведомления руководителям
+        for supervisor in supervisors:
+            # Не отправляем тому, кто отменил
+            if supervisor.id == cancelled_by.id:
+                continue
+
+            try:
+                await safe_send(
+                    bot,
+                    chat_id=supervisor.telegram_id,
+                    text=text,
+                    parse_mode="HTML"
+                )
 
-            # Сохраняем уведомление в БД
-            async for session in get_db():
-                await create_notification(
-                    session=session,
-                    recipient_id=supervisor.id,
-                    message_text=text,
-                    notification_type="cancellation",
-                    measurement_id=measurement.id,
-                    is_sent=True
+                # Запись в БД добавляется одним INSERT после рассылки
+                rows.append({
+                    "recipient_id": supervisor.id,
+                    "message_text": text,
+                    "notification_type": "cancellation",
+                    "measurement_id": measurement.id,
+                    "is_sent": True,
+                })
+
+                logger.info(f"Отправлено уведомление об отмене руководителю {supervisor.telegram_id} ({supervisor.full_name})")
+
+            except Exception as e:
+                logger.error(f"Ошибка отправки уведомления руководителю {supervisor.telegram_id}: {e}", exc_info=True)
+
+        # Отправляем уведомления наблюдателям
+        for observer in observers:
+            # Не отправляем тому, кто отменил
+            if observer.id == cancelled_by.id:
+                continue
+
+            try:
+                await safe_send(
+                    bot,
+                    chat_id=observer.telegram_id,
+                    text=text,
+                    parse_mode="HTML"
                 )
-                break
 
-            logger.info(f"Отправлено уведомление об отмене руководителю {supervisor.telegram_id} ({supervisor.full_name})")
+                # Запись в БД добавляется одним INSERT после рассылки
+                rows.append({
+                    "recipient_id": observer.id,
+                    "message_text": text,
+                    "notification_type": "cancellation",
+                    "measurement_id": measurement.id,
+                    "is_sent": True,
+                })
 
-        except Exception as e:
-            logger.error(f"Ошибка отправки уведомления руководителю {supervisor.telegram_id}: {e}", exc_info=True)
+                logger.info(f"Отправлено уведомление об отмене наблюдателю {observer.telegram_id} ({observer.full_name})")
 
-    # Отправляем уведомления наблюдателям
-    for observer in observers:
-        # Не отправляем тому, кто отменил
-        if observer.id == cancelled_by.id:
-            continue
+            except Exception as e:
+                logger.error(f"Ошибка отправки уведомления наблюдателю {observer.telegram_id}: {e}", exc_info=True)
 
         try:
-            await bot.send_message(
-                chat_id=observer.telegram_id,
-                text=text,
-                parse_mode="HTML"
-            )
-
-            # Сохраняем уведомление в БД
-            async for session in get_db():
-                await create_notification(
-                    session=session,
-                    recipient_id=observer.id,
-                    message_text=text,
-                    notification_type="cancellation",
-                    measurement_id=measurement.id,
-                    is_sent=True
-                )
-                break
-
-            logger.info(f"Отправлено уведомление об отмене наблюдателю {observer.telegram_id} ({observer.full_name})")
-
+            await create_notification_bulk(notif_session, rows)
         except Exception as e:
-            logger.error(f"Ошибка отправки уведомления наблюдателю {observer.telegram_id}: {e}", exc_info=True)
-
-    logger.info(f"Завершена отправка уведомлений об отмене замера #{measurement.id}")
-
-
+            logger.error(f"Ошибка сохранения уведомлений об отмене замера #{measurement.id}: {e}", exc_info=True)
 
+        logger.info(f"Завершена отправка уведомлений об отмене замера #{measurement.id}")
@@ -1,7 +1,8 @@
 """Конфигурация приложения"""
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
-from typing import List
+from pydantic import Field, field_validator
+from functools import cached_property
+from typing import FrozenSet, Tuple
 import os
 import sys
 
@@ -16,6 +17,12 @@ else:
 
 ENV_FILE_PATH = os.path.join(application_path, '.env')
 
+# Абсолютный путь к БД рядом с исполняемым файлом (вычисляется один раз при импорте)
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///" + os.path.join(application_path, "measurerers_bot.db").replace("\\", "/")
+
+# Значения database_url, которые заменяются на абсолютный путь по умолчанию
+_RELATIVE_DATABASE_URLS = ("", "sqlite+aiosqlite:///./measurerers_bot.db")
+
 
 class Settings(BaseSettings):
     """Настройки приложения из переменных окружения"""
@@ -23,7 +30,9 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=ENV_FILE_PATH,
         env_file_encoding="utf-8",
-        case_sensitive=False
+        case_sensitive=False,
+        # Настройки читаются один раз при старте и дальше не меняются
+        frozen=True
     )
 
     # Telegram Bot (опциональные для sheets_exporter)
@@ -49,9 +58,13 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = Field(
-        default="",
+        default=DEFAULT_DATABASE_URL,
         description="URL базы данных"
     )
+    db_pool_size: int = Field(default=20, description="Размер пула подключений к БД")
+    db_max_overflow: int = Field(default=30, description="Дополнительные подключения сверх пула")
+    db_pool_recycle: int = Field(default=1800, description="Время жизни подключения в пуле (секунды)")
+    db_read_pool_size: int = Field(default=8, description="Размер пула подключений только для чтения (SQLite)")
 
     # Altawin API (вместо прямого подключения к БД)
     altawin_api_url: str = Field(default="http://127.0.0.1:8001", description="URL API для работы с БД Altawin")
@@ -80,23 +93,30 @@ class Settings(BaseSettings):
         description="Интервал экспорта в секундах (по умолчанию 300 = 5 минут)"
     )
 
-    @property
-    def admin_ids_list(self) -> List[int]:
-        """Возвращает список ID администраторов"""
-        return [int(id_.strip()) for id_ in self.admin_ids.split(",") if id_.strip()]
+    # Значения вычисляются один раз: настройки не меняются во время работы процесса
+
+    @cached_property
+    def admin_ids_list(self) -> Tuple[int, ...]:
+        """Возвращает ID администраторов"""
+        return tuple(int(id_.strip()) for id_ in self.admin_ids.split(",") if id_.strip())
+
+    @cached_property
+    def admin_ids_set(self) -> FrozenSet[int]:
+        """Множество ID администраторов для проверки принадлежности"""
+        return frozenset(self.admin_ids_list)
 
-    @property
+    @cached_property
     def webhook_url(self) -> str:
         """Полный URL webhook"""
         return f"{self.webhook_host}{self.webhook_path}"
 
-    def model_post_init(self, __context) -> None:
-        """Вызывается после инициализации модели"""
-        # Если database_url пустой или относительный, заменяем на абсолютный путь
-        if not self.database_url or self.database_url == "sqlite+aiosqlite:///./measurerers_bot.db":
-            db_path = os.path.join(application_path, "measurerers_bot.db")
-            db_path = db_path.replace("\\", "/")
-            object.__setattr__(self, 'database_url', f"sqlite+aiosqlite:///{db_path}")
+    @field_validator("database_url")
+    @classmethod
+    def _resolve_database_url(cls, value: str) -> str:
+        """Если database_url пустой или относительный, заменяем на абсолютный путь"""
+        if value in _RELATIVE_DATABASE_URLS:
+            return DEFAULT_DATABASE_URL
+        return value
 
 
 # Создаем глобальный экземпляр настроек
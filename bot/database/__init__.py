@@ -12,14 +12,19 @@ from database.database import (
     db,
     get_db,
     get_session,
+    db_session,
+    db_read_session,
     get_user_by_telegram_id,
     get_or_create_user,
     create_user,
     get_all_measurers,
     get_all_supervisors,
     get_all_admins,
+    get_active_recipient_rows,
     get_all_observers,
     get_all_users,
+    count_users,
+    get_users_by_telegram_ids,
     get_user_by_id,
     update_user_role,
     toggle_user_active,
@@ -34,11 +39,13 @@ from database.database import (
     create_measurement,
     create_invite_link,
     get_invite_link_by_token,
+    get_invite_link_with_creator,
     get_all_invite_links,
     use_invite_link,
     toggle_invite_link_active,
     delete_invite_link,
     create_notification,
+    create_notification_bulk,
     get_recent_notifications,
     get_notifications_by_user,
     get_pending_notifications_for_measurement
@@ -57,6 +64,8 @@ __all__ = [
     "db",
     "get_db",
     "get_session",
+    "db_session",
+    "db_read_session",
     # User functions
     "get_user_by_telegram_id",
     "get_or_create_user",
@@ -64,8 +73,11 @@ __all__ = [
     "get_all_measurers",
     "get_all_supervisors",
     "get_all_admins",
+    "get_active_recipient_rows",
     "get_all_observers",
     "get_all_users",
+    "count_users",
+    "get_users_by_telegram_ids",
     "get_user_by_id",
     "update_user_role",
     "toggle_user_active",
@@ -82,12 +94,14 @@ __all__ = [
     # Invite link functions
     "create_invite_link",
     "get_invite_link_by_token",
+    "get_invite_link_with_creator",
     "get_all_invite_links",
     "use_invite_link",
     "toggle_invite_link_active",
     "delete_invite_link",
     # Notification functions
     "create_notification",
+    "create_notification_bulk",
     "get_recent_notifications",
     "get_notifications_by_user",
     "get_pending_notifications_for_measurement",
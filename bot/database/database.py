@@ -1,4 +1,7 @@
 """Управление базой данных"""
+import secrets
+import time
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -6,25 +9,166 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
 )
-from sqlalchemy import select
+from sqlalchemy import and_, bindparam, case, delete, event, func, inspect, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from loguru import logger
 
 from database.models import Base, User, Measurement, InviteLink, UserRole, MeasurementStatus, Notification
 from database.logging_decorator import log_db_operation
 from config import settings
+from utils.recipient_cache import invalidate_recipient_cache
+from utils.timezone_utils import moscow_now
+from utils.user_role_cache import invalidate_user_role
+
+
+# Часто выполняемые запросы строятся один раз при импорте модуля,
+# значения передаются через bindparam при выполнении
+_STMT_USER_BY_TG = select(User).where(User.telegram_id == bindparam("telegram_id"))
+_STMT_USER_ID_BY_TG = select(User.id).where(User.telegram_id == bindparam("telegram_id"))
+_STMT_USERS_BY_TG_IDS = select(User).where(
+    User.telegram_id.in_(bindparam("telegram_ids", expanding=True))
+)
+_STMT_USER_BY_AMOCRM_ID = select(User).where(User.amocrm_user_id == bindparam("amocrm_user_id"))
+_STMT_ACTIVE_USERS_BY_ROLE = select(User).where(
+    User.role == bindparam("role"),
+    User.is_active == True
+)
+# Для списков замерщиков (клавиатуры выбора, перечни) нужны только имя и идентификаторы
+_STMT_ACTIVE_MEASURERS = select(User).options(
+    load_only(User.telegram_id, User.username, User.first_name, User.last_name)
+).where(
+    User.role == UserRole.MEASURER,
+    User.is_active == True
+)
+
+# Только колонки, нужные для рассылки уведомлений, без построения ORM-объектов
+_STMT_RECIPIENT_ROWS = select(
+    User.id,
+    User.telegram_id,
+    User.role,
+    User.username,
+    User.first_name,
+    User.last_name,
+).where(
+    User.role.in_((UserRole.MEASURER, UserRole.ADMIN, UserRole.SUPERVISOR)),
+    User.is_active == True
+)
+
+
+# PRAGMA, применяемые к каждому новому подключению SQLite:
+# WAL - читатели не блокируют запись, synchronous=NORMAL - без fsync на каждый коммит
+# (в режиме WAL это безопасно), остальное - кэш страниц и временные таблицы в памяти
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Применить PRAGMA к новому подключению SQLite"""
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _set_sqlite_read_only_pragmas(dbapi_connection, connection_record):
+    """Применить PRAGMA к подключению SQLite только для чтения"""
+    _set_sqlite_pragmas(dbapi_connection, connection_record)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
 
 
 class Database:
     """Класс для управления подключением к базе данных"""
 
-    def __init__(self, url: str, echo: bool = False):
-        self.engine: AsyncEngine = create_async_engine(url, echo=echo)
+    def __init__(
+        self,
+        url: str,
+        echo: bool = False,
+        pool_size: int = 20,
+        max_overflow: int = 30,
+        pool_recycle: int = 1800,
+        read_pool_size: int = 8,
+        query_cache_size: int = 1200,
+        poolclass=None
+    ):
+        is_sqlite = url.startswith("sqlite")
+        pool_kwargs = {}
+        if poolclass is not None:
+            # Явно заданный класс пула (например, NullPool для тестов) - без настроек размера
+            pool_kwargs = dict(poolclass=poolclass)
+        elif ":memory:" not in url:
+            # Пул рассчитан на массовые рассылки уведомлений, когда несколько
+            # обработчиков одновременно берут подключения из пула.
+            # Размер подбирается так, чтобы (процессы × одновременные обработчики)
+            # <= pool_size + max_overflow <= 0.8 × лимит подключений сервера БД.
+            # aiosqlite по умолчанию использует NullPool, поэтому класс пула задаем явно.
+            # Локальные подключения SQLite не обрываются сервером, поэтому для них
+            # pre-ping (лишний SELECT при каждой выдаче подключения) и recycle отключены
+            # LIFO: в работе остаются несколько "горячих" подключений (у SQLite у каждого
+            # свой кэш страниц), а лишние простаивают и не расходуют память на прогрев
+            pool_kwargs = dict(
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_pre_ping=not is_sqlite,
+                pool_recycle=-1 if is_sqlite else pool_recycle,
+                pool_use_lifo=True,
+            )
+            if is_sqlite:
+                pool_kwargs["connect_args"] = {"timeout": 5}
+            elif url.startswith("postgresql+asyncpg"):
+                # Кэш подготовленных выражений asyncpg на каждое подключение
+                pool_kwargs["connect_args"] = {"prepared_statement_cache_size": 512}
+        # Кэш скомпилированных запросов: по умолчанию 500 записей, а вариантов запросов
+        # (с разными options/фильтрами) у бота больше - увеличиваем, чтобы не компилировать повторно
+        self.engine: AsyncEngine = create_async_engine(
+            url, echo=echo, query_cache_size=query_cache_size, **pool_kwargs
+        )
+        if is_sqlite:
+            event.listen(self.engine.sync_engine, "connect", _set_sqlite_pragmas)
         self.session_factory = async_sessionmaker(
             self.engine,
             class_=AsyncSession,
             expire_on_commit=False,
         )
 
+        # Отдельный пул только для чтения: в режиме WAL читатели работают параллельно
+        # с записью и не ждут подключения из общего пула, занятого рассылками.
+        # Для in-memory БД второй движок увидел бы другую базу, поэтому там (и при явно
+        # заданном классе пула) используется основной
+        if is_sqlite and ":memory:" not in url and poolclass is None:
+            self.read_engine: AsyncEngine = create_async_engine(
+                url,
+                echo=echo,
+                query_cache_size=query_cache_size,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=read_pool_size,
+                max_overflow=read_pool_size,
+                pool_pre_ping=False,
+                pool_recycle=-1,
+                pool_use_lifo=True,
+                connect_args={"timeout": 5},
+            )
+            event.listen(self.read_engine.sync_engine, "connect", _set_sqlite_read_only_pragmas)
+        else:
+            self.read_engine = self.engine
+        self.read_session_factory = async_sessionmaker(
+            self.read_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+
     async def create_tables(self):
         """Создание всех таблиц"""
         async with self.engine.begin() as conn:
@@ -37,25 +181,47 @@ class Database:
             await conn.run_sync(Base.metadata.drop_all)
         logger.warning("Таблицы базы данных удалены")
 
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """Получение сессии для работы с БД"""
+    @asynccontextmanager
+    async def session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Получение сессии для работы с БД (`async with db.session() as session:`)"""
         async with self.session_factory() as session:
             yield session
 
+    @asynccontextmanager
+    async def read_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Получение сессии только для чтения (запись в ней запрещена PRAGMA query_only)"""
+        async with self.read_session_factory() as session:
+            yield session
+
+    def pool_status(self) -> str:
+        """Состояние пула подключений (для мониторинга исчерпания пула)"""
+        if self.read_engine is self.engine:
+            return self.engine.pool.status()
+        return f"{self.engine.pool.status()}; read: {self.read_engine.pool.status()}"
+
     async def close(self):
         """Закрытие подключения к БД"""
         await self.engine.dispose()
+        if self.read_engine is not self.engine:
+            await self.read_engine.dispose()
         logger.info("Подключение к базе данных закрыто")
 
 
 # Глобальный экземпляр базы данных
-db = Database(settings.database_url, echo=settings.log_level == "DEBUG")
+db = Database(
+    settings.database_url,
+    echo=settings.log_level == "DEBUG",
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    read_pool_size=settings.db_read_pool_size
+)
 
 
 # Вспомогательные функции для работы с БД
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency для получения сессии БД"""
-    async for session in db.get_session():
+    """Dependency для получения сессии БД (для FastAPI; в коде бота используйте db_session)"""
+    async with db.session() as session:
         yield session
 
 
@@ -63,13 +229,56 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 get_session = get_db
 
 
+@asynccontextmanager
+async def db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Контекстный менеджер сессии БД
+
+    Замена конструкции `async for session in get_db(): ... break`
+    для кода вне зависимостей FastAPI/aiogram:
+
+        async with db_session() as session:
+            ...
+    """
+    async with db.session() as session:
+        yield session
+
+
+@asynccontextmanager
+async def db_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Контекстный менеджер сессии БД только для чтения
+
+    Для обработчиков, которые только читают данные (get_* функции):
+    не занимает подключения основного пула и не ждет завершения записи
+
+        async with db_read_session() as session:
+            user = await get_user_by_telegram_id(session, telegram_id)
+    """
+    async with db.read_session() as session:
+        yield session
+
+
+# Ключ в session.info: telegram_id -> ID пользователя, уже найденного в этой сессии.
+# Сессия открывается на один обработчик обновления, поэтому это кэш на время запроса
+_SESSION_USER_IDS_KEY = "user_ids_by_telegram_id"
+
+
 @log_db_operation("GET USER BY TELEGRAM ID")
 async def get_user_by_telegram_id(session: AsyncSession, telegram_id: int) -> User | None:
-    """Получить пользователя по Telegram ID"""
-    result = await session.execute(
-        select(User).where(User.telegram_id == telegram_id)
-    )
-    return result.scalar_one_or_none()
+    """Получить пользователя по Telegram ID (повторный вызов в той же сессии - без запроса)"""
+    user_ids = session.info.setdefault(_SESSION_USER_IDS_KEY, {})
+    user_id = user_ids.get(telegram_id)
+    if user_id is not None:
+        user = await session.get(User, user_id)
+        if user is not None:
+            return user
+
+    result = await session.execute(_STMT_USER_BY_TG, {"telegram_id": telegram_id})
+    user = result.scalar_one_or_none()
+    if user is not None:
+        user_ids[telegram_id] = user.id
+    return user
 
 
 @log_db_operation("CREATE USER")
@@ -82,20 +291,33 @@ async def create_user(
     role: UserRole = UserRole.MEASURER
 ) -> User:
     """Создать нового пользователя (без проверки на существование)"""
+    # Временные метки задаются в том виде, в каком их вернет БД (московское время без tzinfo)
+    now = moscow_now().replace(tzinfo=None)
     user = User(
         telegram_id=telegram_id,
         username=username,
         first_name=first_name,
         last_name=last_name,
-        role=role
+        role=role,
+        created_at=now,
+        updated_at=now
     )
     session.add(user)
+    # expire_on_commit=False: после коммита объект уже содержит все поля, refresh не нужен
     await session.commit()
-    await session.refresh(user)
-    logger.info(f"Создан новый пользователь: {user}")
+    invalidate_recipient_cache()
+    invalidate_user_role(telegram_id)
+    logger.info("Создан новый пользователь: {}", user)
     return user
 
 
+# INSERT ... ON CONFLICT строится конструкцией диалекта (для SQLite и PostgreSQL API одинаковый)
+_UPSERT_INSERT = {
+    "sqlite": sqlite_insert,
+    "postgresql": postgresql_insert,
+}
+
+
 async def get_or_create_user(
     session: AsyncSession,
     telegram_id: int,
@@ -104,106 +326,127 @@ async def get_or_create_user(
     last_name: str | None = None,
     role: UserRole = UserRole.MEASURER
 ) -> User:
-    """Получить или создать пользователя"""
-    user = await get_user_by_telegram_id(session, telegram_id)
+    """
+    Получить или создать пользователя
 
-    if not user:
-        user = await create_user(session, telegram_id, username, first_name, last_name, role)
-    else:
-        # Обновляем информацию о пользователе
-        updated = False
-        if username and user.username != username:
-            user.username = username
-            updated = True
-        if first_name and user.first_name != first_name:
-            user.first_name = first_name
-            updated = True
-        if last_name and user.last_name != last_name:
-            user.last_name = last_name
-            updated = True
-
-        if updated:
-            await session.commit()
-            await session.refresh(user)
+    Выполняется одним запросом INSERT ... ON CONFLICT DO UPDATE ... RETURNING:
+    новый пользователь создается с указанной ролью, у существующего обновляются
+    только переданные (непустые) поля профиля, роль не меняется.
+    Если профиль не изменился, строка не перезаписывается и пользователь читается SELECT
+    """
+    insert = _UPSERT_INSERT[session.get_bind().dialect.name]
+    stmt = insert(User).values(
+        telegram_id=telegram_id,
+        username=username or None,
+        first_name=first_name or None,
+        last_name=last_name or None,
+        role=role
+    )
+    new_values = {
+        "username": func.coalesce(stmt.excluded.username, User.username),
+        "first_name": func.coalesce(stmt.excluded.first_name, User.first_name),
+        "last_name": func.coalesce(stmt.excluded.last_name, User.last_name),
+    }
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.telegram_id],
+        set_=new_values,
+        # UPDATE только при реальном изменении: без лишней записи в БД на каждый /start
+        where=or_(*(
+            getattr(User, column).is_distinct_from(value)
+            for column, value in new_values.items()
+        ))
+    ).returning(User)
+
+    result = await session.execute(stmt, execution_options={"populate_existing": True})
+    user = result.scalar_one_or_none()
+    await session.commit()
+
+    if user is None:
+        # Профиль не изменился - кэши сбрасывать не нужно
+        result = await session.execute(_STMT_USER_BY_TG, {"telegram_id": telegram_id})
+        return result.scalar_one()
 
+    # Пользователь мог быть создан - сбрасываем кэш получателей уведомлений и роли
+    invalidate_recipient_cache()
+    invalidate_user_role(telegram_id)
     return user
 
 
 async def get_all_measurers(session: AsyncSession) -> list[User]:
-    """Получить всех активных замерщиков"""
-    result = await session.execute(
-        select(User).where(
-            User.role == UserRole.MEASURER,
-            User.is_active == True
-        )
-    )
-    return list(result.scalars().all())
+    """Получить всех активных замерщиков (загружаются только ID, Telegram ID и имя)"""
+    result = await session.execute(_STMT_ACTIVE_MEASURERS)
+    return result.scalars().all()
 
 
 async def get_all_supervisors(session: AsyncSession) -> list[User]:
     """Получить всех активных руководителей"""
-    result = await session.execute(
-        select(User).where(
-            User.role == UserRole.SUPERVISOR,
-            User.is_active == True
-        )
-    )
-    return list(result.scalars().all())
+    result = await session.execute(_STMT_ACTIVE_USERS_BY_ROLE, {"role": UserRole.SUPERVISOR})
+    return result.scalars().all()
 
 
 async def get_all_admins(session: AsyncSession) -> list[User]:
     """Получить всех активных администраторов"""
-    result = await session.execute(
-        select(User).where(
-            User.role == UserRole.ADMIN,
-            User.is_active == True
-        )
-    )
-    return list(result.scalars().all())
+    result = await session.execute(_STMT_ACTIVE_USERS_BY_ROLE, {"role": UserRole.ADMIN})
+    return result.scalars().all()
+
+
+async def get_active_recipient_rows(session: AsyncSession) -> list:
+    """
+    Получить активных замерщиков, администраторов и руководителей одним запросом
+
+    Возвращает легковесные строки (id, telegram_id, role, username, first_name, last_name)
+    вместо ORM-объектов User - строки не попадают в identity map
+
+    Returns:
+        Список строк Row
+    """
+    return (await session.execute(_STMT_RECIPIENT_ROWS)).all()
 
 
 async def get_all_observers(session: AsyncSession) -> list[User]:
     """Получить всех активных наблюдателей"""
-    result = await session.execute(
-        select(User).where(
-            User.role == UserRole.OBSERVER,
-            User.is_active == True
-        )
-    )
-    return list(result.scalars().all())
+    result = await session.execute(_STMT_ACTIVE_USERS_BY_ROLE, {"role": UserRole.OBSERVER})
+    return result.scalars().all()
 
 
-async def get_measurement_by_id(session: AsyncSession, measurement_id: int) -> Measurement | None:
-    """Получить замер по ID"""
-    from sqlalchemy.orm import joinedload
+# Связи замера, которые нужны карточке замера и уведомлениям
+_MEASUREMENT_RELATIONS = frozenset(("measurer", "manager", "confirmed_by", "auto_assigned_measurer"))
 
-    result = await session.execute(
-        select(Measurement)
-        .options(
+
+async def get_measurement_by_id(session: AsyncSession, measurement_id: int) -> Measurement | None:
+    """Получить замер по ID (без запроса, если замер со связями уже загружен в сессию)"""
+    measurement = await session.get(
+        Measurement,
+        measurement_id,
+        options=[
             joinedload(Measurement.measurer),
             joinedload(Measurement.manager),
             joinedload(Measurement.confirmed_by),
             joinedload(Measurement.auto_assigned_measurer)
-        )
-        .where(Measurement.id == measurement_id)
+        ]
     )
-    return result.scalar_one_or_none()
+    if measurement is None:
+        return None
+
+    # Замер мог попасть в сессию раньше без связей - тогда опции не применяются,
+    # а ленивая загрузка в асинхронной сессии недоступна, поэтому догружаем их явно
+    unloaded = _MEASUREMENT_RELATIONS & inspect(measurement).unloaded
+    if unloaded:
+        await session.refresh(measurement, attribute_names=list(unloaded))
+    return measurement
+
+
+_STMT_MEASUREMENT_BY_AMOCRM_ID = select(Measurement).options(
+    joinedload(Measurement.measurer),
+    joinedload(Measurement.manager),
+    joinedload(Measurement.confirmed_by),
+    joinedload(Measurement.auto_assigned_measurer)
+).where(Measurement.amocrm_lead_id == bindparam("amocrm_lead_id"))
 
 
 async def get_measurement_by_amocrm_id(session: AsyncSession, amocrm_lead_id: int) -> Measurement | None:
     """Получить замер по ID сделки в AmoCRM"""
-    from sqlalchemy.orm import joinedload
-
-    result = await session.execute(
-        select(Measurement)
-        .options(
-            joinedload(Measurement.measurer),
-            joinedload(Measurement.manager),
-            joinedload(Measurement.confirmed_by),
-            joinedload(Measurement.auto_assigned_measurer)
-        )
-        .where(Measurement.amocrm_lead_id == amocrm_lead_id)
-    )
+    result = await session.execute(_STMT_MEASUREMENT_BY_AMOCRM_ID, {"amocrm_lead_id": amocrm_lead_id})
     return result.scalar_one_or_none()
 
 
@@ -213,15 +456,13 @@ async def get_measurements_by_status(
     limit: int | None = None
 ) -> list[Measurement]:
     """Получить замеры по статусу"""
-    from sqlalchemy.orm import joinedload
-
     query = (
         select(Measurement)
         .options(
-            joinedload(Measurement.measurer),
-            joinedload(Measurement.manager),
-            joinedload(Measurement.confirmed_by),
-            joinedload(Measurement.auto_assigned_measurer)
+            selectinload(Measurement.measurer),
+            selectinload(Measurement.manager),
+            selectinload(Measurement.confirmed_by),
+            selectinload(Measurement.auto_assigned_measurer)
         )
         .where(Measurement.status == status)
         .order_by(Measurement.created_at.asc())
@@ -231,7 +472,7 @@ async def get_measurements_by_status(
         query = query.limit(limit)
 
     result = await session.execute(query)
-    return list(result.scalars().unique().all())
+    return result.scalars().all()
 
 
 async def get_measurements_by_measurer(
@@ -240,15 +481,13 @@ async def get_measurements_by_measurer(
     status: MeasurementStatus | None = None
 ) -> list[Measurement]:
     """Получить замеры по замерщику"""
-    from sqlalchemy.orm import joinedload
-
     query = (
         select(Measurement)
         .options(
-            joinedload(Measurement.measurer),
-            joinedload(Measurement.manager),
-            joinedload(Measurement.confirmed_by),
-            joinedload(Measurement.auto_assigned_measurer)
+            selectinload(Measurement.measurer),
+            selectinload(Measurement.manager),
+            selectinload(Measurement.confirmed_by),
+            selectinload(Measurement.auto_assigned_measurer)
         )
         .where(Measurement.measurer_id == measurer_id)
     )
@@ -259,7 +498,7 @@ async def get_measurements_by_measurer(
     query = query.order_by(Measurement.created_at.asc())
 
     result = await session.execute(query)
-    return list(result.scalars().unique().all())
+    return result.scalars().all()
 
 
 async def get_measurements_by_manager(
@@ -268,15 +507,13 @@ async def get_measurements_by_manager(
     status: MeasurementStatus | None = None
 ) -> list[Measurement]:
     """Получить замеры по менеджеру"""
-    from sqlalchemy.orm import joinedload
-
     query = (
         select(Measurement)
         .options(
-            joinedload(Measurement.measurer),
-            joinedload(Measurement.manager),
-            joinedload(Measurement.confirmed_by),
-            joinedload(Measurement.auto_assigned_measurer)
+            selectinload(Measurement.measurer),
+            selectinload(Measurement.manager),
+            selectinload(Measurement.confirmed_by),
+            selectinload(Measurement.auto_assigned_measurer)
         )
         .where(Measurement.manager_id == manager_id)
     )
@@ -287,7 +524,7 @@ async def get_measurements_by_manager(
     query = query.order_by(Measurement.created_at.asc())
 
     result = await session.execute(query)
-    return list(result.scalars().unique().all())
+    return result.scalars().all()
 
 
 async def create_measurement(
@@ -318,8 +555,9 @@ async def create_measurement(
     ВАЖНО: Теперь из AmoCRM сохраняем только altawin_order_code.
     Все остальные данные (адрес, телефон, зона и т.д.) получаются динамически из Altawin.
     """
+    # Локальный импорт: services.zone_service импортирует database.models,
+    # импорт на уровне модуля дал бы циклическую зависимость
     from services.zone_service import ZoneService
-    from datetime import datetime
 
     # Используем новую 3-уровневую систему приоритетов
     zone_service = ZoneService(session)
@@ -329,6 +567,13 @@ async def create_measurement(
         company_name=dealer_company_name
     )
 
+    # Менеджер обычно уже загружен вызывающим кодом в эту же сессию - берем из identity map
+    manager = await session.get(User, manager_id) if manager_id else None
+
+    # Временные метки задаются сразу в том виде, в каком их вернет БД (московское время без tzinfo),
+    # поэтому после коммита их не нужно перечитывать
+    now = moscow_now().replace(tzinfo=None)
+
     measurement = Measurement(
         amocrm_lead_id=amocrm_lead_id,
         lead_name=lead_name,
@@ -338,34 +583,25 @@ async def create_measurement(
         altawin_order_code=altawin_order_code,  # НОВОЕ ПОЛЕ - код заказа из Altawin
         # ПРИМЕЧАНИЕ: Старые поля (address, delivery_zone, order_number, windows_count, windows_area)
         # больше не заполняются - данные получаются из Altawin динамически
-        manager_id=manager_id,
+        manager=manager,
         # Предложенный замерщик (до подтверждения админом)
-        measurer_id=None,  # Будет установлен после подтверждения
+        measurer=None,  # Будет установлен после подтверждения
+        confirmed_by=None,
         assigned_at=None,  # Дата назначения будет установлена после подтверждения
         # История автораспределения
-        auto_assigned_measurer_id=assigned_measurer.id if assigned_measurer else None,
+        auto_assigned_measurer=assigned_measurer,
         assignment_reason=assignment_reason,
         dealer_company_name=dealer_company_name,
         dealer_field_value=dealer_field_value,
-        status=MeasurementStatus.PENDING_CONFIRMATION  # Ожидает подтверждения руководителем
+        status=MeasurementStatus.PENDING_CONFIRMATION,  # Ожидает подтверждения руководителем
+        created_at=now,
+        updated_at=now
     )
     session.add(measurement)
+    # id приходит из INSERT при коммите; все связи (measurer, manager, confirmed_by,
+    # auto_assigned_measurer) заданы объектами, а expire_on_commit=False сохраняет их после коммита
     await session.commit()
 
-    # Загружаем объект заново со всеми связями (measurer, manager, confirmed_by, auto_assigned_measurer)
-    from sqlalchemy.orm import joinedload
-    result = await session.execute(
-        select(Measurement)
-        .options(
-            joinedload(Measurement.measurer),
-            joinedload(Measurement.manager),
-            joinedload(Measurement.confirmed_by),
-            joinedload(Measurement.auto_assigned_measurer)
-        )
-        .where(Measurement.id == measurement.id)
-    )
-    measurement = result.scalar_one()
-
     # Логируем результат распределения
     if assigned_measurer:
         reason_text = {
@@ -390,25 +626,58 @@ async def create_measurement(
 
 
 # Функции для управления пользователями
-async def get_all_users(session: AsyncSession, role: UserRole | None = None) -> list[User]:
-    """Получить всех пользователей, опционально с фильтром по роли"""
+async def get_all_users(
+    session: AsyncSession,
+    role: UserRole | None = None,
+    limit: int | None = None,
+    offset: int = 0
+) -> list[User]:
+    """
+    Получить пользователей (новые первыми), опционально с фильтром по роли и постранично
+
+    Сортировка по id: автоинкрементный первичный ключ совпадает с порядком создания
+    и уже проиндексирован, поэтому LIMIT/OFFSET не требуют сортировки всей таблицы
+    """
     query = select(User)
 
     if role:
         query = query.where(User.role == role)
 
-    query = query.order_by(User.created_at.desc())
+    query = query.order_by(User.id.desc())
+
+    if limit is not None:
+        query = query.limit(limit).offset(offset)
 
     result = await session.execute(query)
-    return list(result.scalars().all())
+    return result.scalars().all()
+
+
+async def count_users(session: AsyncSession, role: UserRole | None = None) -> int:
+    """Количество пользователей, опционально с фильтром по роли"""
+    query = select(func.count(User.id))
+
+    if role:
+        query = query.where(User.role == role)
+
+    return await session.scalar(query)
+
+
+async def get_users_by_telegram_ids(session: AsyncSession, telegram_ids: list[int]) -> list[User]:
+    """
+    Получить пользователей по списку Telegram ID одним запросом
+
+    Для обработки группы пользователей сначала собираются их ID, затем выполняется
+    одна выборка вместо отдельного запроса на каждого пользователя
+    """
+    if not telegram_ids:
+        return []
+    result = await session.execute(_STMT_USERS_BY_TG_IDS, {"telegram_ids": list(telegram_ids)})
+    return result.scalars().all()
 
 
 async def get_user_by_id(session: AsyncSession, user_id: int) -> User | None:
-    """Получить пользователя по ID"""
-    result = await session.execute(
-        select(User).where(User.id == user_id)
-    )
-    return result.scalar_one_or_none()
+    """Получить пользователя по ID (без запроса, если пользователь уже загружен в сессию)"""
+    return await session.get(User, user_id)
 
 
 async def update_user_role(
@@ -416,18 +685,23 @@ async def update_user_role(
     user_id: int,
     new_role: UserRole
 ) -> User | None:
-    """Изменить роль пользователя"""
-    user = await get_user_by_id(session, user_id)
+    """Изменить роль пользователя (один запрос UPDATE ... RETURNING)"""
+    result = await session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(role=new_role)
+        .returning(User)
+    )
+    user = result.scalar_one_or_none()
 
     if not user:
         return None
 
-    old_role = user.role
-    user.role = new_role
     await session.commit()
-    await session.refresh(user)
+    invalidate_recipient_cache()
+    invalidate_user_role(user.telegram_id)
 
-    logger.info(f"Роль пользователя {user.telegram_id} изменена: {old_role.value} -> {new_role.value}")
+    logger.info("Роль пользователя {} изменена на {}", user.telegram_id, new_role.value)
     return user
 
 
@@ -435,18 +709,23 @@ async def toggle_user_active(
     session: AsyncSession,
     user_id: int
 ) -> User | None:
-    """Переключить статус активности пользователя"""
-    user = await get_user_by_id(session, user_id)
+    """Переключить статус активности пользователя (один запрос UPDATE ... RETURNING)"""
+    result = await session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(is_active=~User.is_active)
+        .returning(User)
+    )
+    user = result.scalar_one_or_none()
 
     if not user:
         return None
 
-    user.is_active = not user.is_active
     await session.commit()
-    await session.refresh(user)
+    invalidate_recipient_cache()
+    invalidate_user_role(user.telegram_id)
 
-    status = "активирован" if user.is_active else "деактивирован"
-    logger.info(f"Пользователь {user.telegram_id} {status}")
+    logger.info("Пользователь {} {}", user.telegram_id, "активирован" if user.is_active else "деактивирован")
     return user
 
 
@@ -456,23 +735,27 @@ async def create_user_by_telegram_id(
     role: UserRole = UserRole.MEASURER
 ) -> User:
     """Создать пользователя по Telegram ID с указанной ролью"""
-    # Проверяем, не существует ли уже такой пользователь
-    existing_user = await get_user_by_telegram_id(session, telegram_id)
+    # Проверяем, не существует ли уже такой пользователь (нужен только ID, объект не строим)
+    existing_id = await session.scalar(_STMT_USER_ID_BY_TG, {"telegram_id": telegram_id})
 
-    if existing_user:
+    if existing_id is not None:
         # Если пользователь существует, обновляем его роль
-        return await update_user_role(session, existing_user.id, role)
+        return await update_user_role(session, existing_id, role)
 
-    # Создаем нового пользователя
+    # Создаем нового пользователя (временные метки - московское время без tzinfo, как в БД)
+    now = moscow_now().replace(tzinfo=None)
     user = User(
         telegram_id=telegram_id,
         role=role,
-        is_active=True
+        is_active=True,
+        created_at=now,
+        updated_at=now
     )
     session.add(user)
     await session.commit()
-    await session.refresh(user)
-    logger.info(f"Создан новый пользователь с ID {telegram_id} и ролью {role.value}")
+    invalidate_recipient_cache()
+    invalidate_user_role(telegram_id)
+    logger.info("Создан новый пользователь с ID {} и ролью {}", telegram_id, role.value)
     return user
 
 
@@ -480,12 +763,33 @@ async def create_user_by_telegram_id(
 # Функции для работы с пригласительными ссылками
 # ============================================================================
 
+_STMT_INVITE_LINK_BY_TOKEN = select(InviteLink).where(InviteLink.token == bindparam("token"))
+_STMT_INVITE_LINK_WITH_CREATOR = select(InviteLink).options(
+    selectinload(InviteLink.created_by)
+).where(InviteLink.id == bindparam("link_id"))
+
+# Кэш "токен -> ID ссылки" для /start <token>: повторные переходы по одной ссылке
+# не ищут токен заново, а несуществующие токены (None) не доходят до БД.
+# Сама ссылка всегда читается из БД по первичному ключу, поэтому счетчики и статус актуальны
+_INVITE_TOKEN_CACHE_TTL = 60.0
+_INVITE_TOKEN_CACHE_MAX = 1024
+_invite_token_cache: dict[str, tuple[float, int | None]] = {}
+
+
+def _remember_invite_token(token: str, link_id: int | None) -> None:
+    """Сохранить ID ссылки по токену в кэш (при переполнении вытесняется самая старая запись)"""
+    if len(_invite_token_cache) >= _INVITE_TOKEN_CACHE_MAX:
+        _invite_token_cache.pop(next(iter(_invite_token_cache)))
+    _invite_token_cache[token] = (time.monotonic(), link_id)
+
+
 async def create_invite_link(
     session: AsyncSession,
     created_by_id: int,
     role: UserRole,
     max_uses: int | None = None,
-    expires_at = None
+    expires_at = None,
+    autocommit: bool = True
 ) -> InviteLink:
     """
     Создать новую пригласительную ссылку
@@ -496,14 +800,16 @@ async def create_invite_link(
         role: Роль для новых пользователей
         max_uses: Максимальное количество использований (None = неограниченно)
         expires_at: Дата истечения срока действия (None = бессрочная)
+        autocommit: Зафиксировать транзакцию сразу. False - только flush (ID будет заполнен),
+            коммит выполняет вызывающий код, например после создания нескольких ссылок
 
     Returns:
         Созданная пригласительная ссылка
     """
-    import secrets
-
     # Генерируем уникальный токен
     token = secrets.token_urlsafe(32)
+    # Временные метки задаются в том виде, в каком их вернет БД (московское время без tzinfo)
+    now = moscow_now().replace(tzinfo=None)
 
     invite_link = InviteLink(
         token=token,
@@ -512,14 +818,20 @@ async def create_invite_link(
         max_uses=max_uses,
         current_uses=0,
         expires_at=expires_at,
-        is_active=True
+        is_active=True,
+        created_at=now,
+        updated_at=now
     )
 
     session.add(invite_link)
-    await session.commit()
-    await session.refresh(invite_link)
+    if autocommit:
+        await session.commit()
+        _remember_invite_token(token, invite_link.id)
+    else:
+        # До коммита ссылку не кэшируем: при откате ее ID может достаться другой записи
+        await session.flush()
 
-    logger.info(f"Создана пригласительная ссылка с токеном {token[:10]}... для роли {role.value}")
+    logger.opt(lazy=True).info("Создана пригласительная ссылка с токеном {}... для роли {}", lambda: token[:10], lambda: role.value)
     return invite_link
 
 
@@ -537,43 +849,72 @@ async def get_invite_link_by_token(
     Returns:
         Пригласительная ссылка или None
     """
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
+    cached = _invite_token_cache.get(token)
+    if cached and time.monotonic() - cached[0] < _INVITE_TOKEN_CACHE_TTL:
+        link_id = cached[1]
+        if link_id is None:
+            return None
+        invite_link = await session.get(InviteLink, link_id)
+        if invite_link is not None:
+            return invite_link
+
+    # Создатель ссылки при регистрации не нужен - связь не загружаем
+    result = await session.execute(_STMT_INVITE_LINK_BY_TOKEN, {"token": token})
+    invite_link = result.scalar_one_or_none()
+    _remember_invite_token(token, invite_link.id if invite_link else None)
+    return invite_link
 
-    query = select(InviteLink).where(InviteLink.token == token).options(
-        selectinload(InviteLink.created_by)
-    )
-    result = await session.execute(query)
+
+async def get_invite_link_with_creator(
+    session: AsyncSession,
+    link_id: int
+) -> InviteLink | None:
+    """
+    Получить пригласительную ссылку по ID вместе с создателем (для админ-панели)
+
+    Args:
+        session: Сессия БД
+        link_id: ID ссылки
+
+    Returns:
+        Пригласительная ссылка или None
+    """
+    result = await session.execute(_STMT_INVITE_LINK_WITH_CREATOR, {"link_id": link_id})
     return result.scalar_one_or_none()
 
 
 async def get_all_invite_links(
     session: AsyncSession,
-    include_inactive: bool = False
+    include_inactive: bool = False,
+    limit: int | None = None,
+    offset: int = 0
 ) -> list[InviteLink]:
     """
-    Получить все пригласительные ссылки
+    Получить все пригласительные ссылки (новые первыми)
+
+    Создатель ссылки не загружается: в списке он не показывается,
+    для карточки ссылки используется get_invite_link_with_creator
 
     Args:
         session: Сессия БД
         include_inactive: Включить неактивные ссылки
+        limit: Максимальное количество ссылок (None = все)
+        offset: Смещение для постраничного вывода
 
     Returns:
         Список пригласительных ссылок
     """
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-
-    query = select(InviteLink).options(
-        selectinload(InviteLink.created_by)
-    )
+    query = select(InviteLink)
 
     if not include_inactive:
         query = query.where(InviteLink.is_active == True)
 
-    query = query.order_by(InviteLink.created_at.desc())
+    # Порядок по первичному ключу совпадает с порядком создания и не требует сортировки
+    query = query.order_by(InviteLink.id.desc())
+    if limit is not None:
+        query = query.limit(limit).offset(offset)
     result = await session.execute(query)
-    return list(result.scalars().all())
+    return result.scalars().all()
 
 
 async def use_invite_link(
@@ -583,6 +924,10 @@ async def use_invite_link(
     """
     Использовать пригласительную ссылку (увеличить счетчик использований)
 
+    Проверка действительности и увеличение счетчика выполняются одним атомарным
+    UPDATE ... WHERE ... RETURNING, поэтому одновременные переходы по одной ссылке
+    не превышают лимит использований
+
     Args:
         session: Сессия БД
         invite_link: Пригласительная ссылка
@@ -590,21 +935,47 @@ async def use_invite_link(
     Returns:
         True если ссылка была успешно использована
     """
-    if not invite_link.is_valid:
-        logger.warning(f"Попытка использовать недействительную ссылку {invite_link.token}")
-        return False
+    # В БД время хранится без часового пояса (московское)
+    now = moscow_now().replace(tzinfo=None)
+    new_uses = InviteLink.current_uses + 1
 
-    invite_link.current_uses += 1
+    result = await session.execute(
+        update(InviteLink)
+        .where(
+            InviteLink.id == invite_link.id,
+            InviteLink.is_active == True,
+            or_(InviteLink.expires_at.is_(None), InviteLink.expires_at > now),
+            or_(InviteLink.max_uses.is_(None), InviteLink.current_uses < InviteLink.max_uses)
+        )
+        .values(
+            current_uses=new_uses,
+            # Если достигнут лимит использований, деактивируем ссылку
+            is_active=case(
+                (and_(InviteLink.max_uses.is_not(None), new_uses >= InviteLink.max_uses), False),
+                else_=InviteLink.is_active
+            )
+        )
+        .returning(InviteLink.current_uses, InviteLink.is_active)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.first()
 
-    # Если достигнут лимит использований, деактивируем ссылку
-    if invite_link.max_uses and invite_link.current_uses >= invite_link.max_uses:
-        invite_link.is_active = False
-        logger.info(f"Ссылка {invite_link.token[:10]}... деактивирована (достигнут лимит)")
+    if row is None:
+        logger.warning(f"Попытка использовать недействительную ссылку {invite_link.token}")
+        return False
 
     await session.commit()
-    await session.refresh(invite_link)
 
-    logger.info(f"Ссылка {invite_link.token[:10]}... использована ({invite_link.current_uses}/{invite_link.max_uses or '∞'})")
+    # Переносим новые значения в переданный объект без повторного SELECT
+    current_uses, is_active = row
+    set_committed_value(invite_link, "current_uses", current_uses)
+    set_committed_value(invite_link, "is_active", is_active)
+    if not is_active:
+        logger.opt(lazy=True).info("Ссылка {}... деактивирована (достигнут лимит)", lambda: invite_link.token[:10])
+    logger.opt(lazy=True).info(
+        "Ссылка {}... использована ({}/{})",
+        lambda: invite_link.token[:10], lambda: current_uses, lambda: invite_link.max_uses or "∞"
+    )
     return True
 
 
@@ -622,22 +993,25 @@ async def toggle_invite_link_active(
     Returns:
         Обновленная ссылка или None
     """
-    from sqlalchemy import select
-
-    query = select(InviteLink).where(InviteLink.id == link_id)
-    result = await session.execute(query)
+    # Один запрос UPDATE ... RETURNING вместо SELECT + UPDATE
+    result = await session.execute(
+        update(InviteLink)
+        .where(InviteLink.id == link_id)
+        .values(is_active=~InviteLink.is_active)
+        .returning(InviteLink)
+    )
     invite_link = result.scalar_one_or_none()
 
     if not invite_link:
         logger.warning(f"Пригласительная ссылка с ID {link_id} не найдена")
         return None
 
-    invite_link.is_active = not invite_link.is_active
     await session.commit()
-    await session.refresh(invite_link)
 
-    status = "активирована" if invite_link.is_active else "деактивирована"
-    logger.info(f"Ссылка {invite_link.token[:10]}... {status}")
+    logger.opt(lazy=True).info(
+        "Ссылка {}... {}",
+        lambda: invite_link.token[:10], lambda: "активирована" if invite_link.is_active else "деактивирована"
+    )
     return invite_link
 
 
@@ -655,21 +1029,19 @@ async def delete_invite_link(
     Returns:
         True если ссылка была удалена
     """
-    from sqlalchemy import select, delete
-
-    query = select(InviteLink).where(InviteLink.id == link_id)
-    result = await session.execute(query)
-    invite_link = result.scalar_one_or_none()
+    # Один запрос DELETE ... RETURNING вместо SELECT + DELETE
+    token = await session.scalar(
+        delete(InviteLink).where(InviteLink.id == link_id).returning(InviteLink.token)
+    )
 
-    if not invite_link:
+    if token is None:
         logger.warning(f"Пригласительная ссылка с ID {link_id} не найдена")
         return False
 
-    token_preview = invite_link.token[:10]
-    await session.delete(invite_link)
     await session.commit()
+    _invite_token_cache.pop(token, None)
 
-    logger.info(f"Удалена пригласительная ссылка {token_preview}...")
+    logger.opt(lazy=True).info("Удалена пригласительная ссылка {}...", lambda: token[:10])
     return True
 
 
@@ -699,18 +1071,27 @@ async def update_user_amocrm_id(
         logger.warning(f"Пользователь с ID {user_id} не найден")
         return None
 
+    old_amocrm_user_id = user.amocrm_user_id
     user.amocrm_user_id = amocrm_user_id
     await session.commit()
-    await session.refresh(user)
+    _amocrm_user_cache.pop(old_amocrm_user_id, None)
+    _amocrm_user_cache.pop(amocrm_user_id, None)
 
     if amocrm_user_id:
-        logger.info(f"Пользователь {user.telegram_id} привязан к AmoCRM аккаунту {amocrm_user_id}")
+        logger.info("Пользователь {} привязан к AmoCRM аккаунту {}", user.telegram_id, amocrm_user_id)
     else:
-        logger.info(f"Пользователь {user.telegram_id} отвязан от AmoCRM аккаунта")
+        logger.info("Пользователь {} отвязан от AmoCRM аккаунта", user.telegram_id)
 
     return user
 
 
+# Кэш "AmoCRM ID -> ID пользователя" для вебхуков: ответственных в AmoCRM немного,
+# а сделки по одному менеджеру приходят пачками. Пользователь читается по первичному ключу
+_AMOCRM_USER_CACHE_TTL = 60.0
+_AMOCRM_USER_CACHE_MAX = 1024
+_amocrm_user_cache: dict[int, tuple[float, int | None]] = {}
+
+
 async def get_user_by_amocrm_id(
     session: AsyncSession,
     amocrm_user_id: int
@@ -725,16 +1106,46 @@ async def get_user_by_amocrm_id(
     Returns:
         Пользователь или None
     """
-    result = await session.execute(
-        select(User).where(User.amocrm_user_id == amocrm_user_id)
-    )
-    return result.scalar_one_or_none()
+    cached = _amocrm_user_cache.get(amocrm_user_id)
+    if cached and time.monotonic() - cached[0] < _AMOCRM_USER_CACHE_TTL:
+        if cached[1] is None:
+            return None
+        user = await session.get(User, cached[1])
+        if user is not None and user.amocrm_user_id == amocrm_user_id:
+            return user
+
+    result = await session.execute(_STMT_USER_BY_AMOCRM_ID, {"amocrm_user_id": amocrm_user_id})
+    user = result.scalar_one_or_none()
+
+    if len(_amocrm_user_cache) >= _AMOCRM_USER_CACHE_MAX:
+        _amocrm_user_cache.pop(next(iter(_amocrm_user_cache)))
+    _amocrm_user_cache[amocrm_user_id] = (time.monotonic(), user.id if user else None)
+    return user
 
 
 # ============================================================================
 # Функции для работы с уведомлениями
 # ============================================================================
 
+# Для списка последних уведомлений нужны только имя и username получателя
+_STMT_RECENT_NOTIFICATIONS = select(Notification).options(
+    selectinload(Notification.recipient).load_only(
+        User.telegram_id, User.username, User.first_name, User.last_name
+    )
+).order_by(Notification.sent_at.desc()).limit(bindparam("limit"))
+_STMT_NOTIFICATIONS_BY_USER = (
+    select(Notification)
+    .where(Notification.recipient_id == bindparam("recipient_id"))
+    .order_by(Notification.sent_at.desc())
+    .limit(bindparam("limit"))
+)
+_STMT_SENT_NOTIFICATIONS_FOR_MEASUREMENT = select(Notification).where(
+    Notification.measurement_id == bindparam("measurement_id"),
+    Notification.notification_type == bindparam("notification_type"),
+    Notification.telegram_message_id.isnot(None)  # Только уведомления с message_id
+)
+
+
 async def create_notification(
     session: AsyncSession,
     recipient_id: int = None,
@@ -779,16 +1190,46 @@ async def create_notification(
         measurement_id=measurement_id,
         is_sent=is_sent,
         telegram_message_id=telegram_message_id,
-        telegram_chat_id=telegram_chat_id
+        telegram_chat_id=telegram_chat_id,
+        # Московское время без tzinfo - в том виде, в каком его вернет БД
+        sent_at=moscow_now().replace(tzinfo=None)
     )
     session.add(notification)
+    # ID заполняется при INSERT, остальные поля заданы в объекте: повторный SELECT не нужен
     await session.commit()
-    await session.refresh(notification)
 
-    logger.debug(f"Создано уведомление #{notification.id} для пользователя {recipient_id}")
+    logger.debug("Создано уведомление #{} для пользователя {}", notification.id, recipient_id)
     return notification
 
 
+async def create_notification_bulk(
+    session: AsyncSession,
+    rows: list[dict]
+) -> list[Notification]:
+    """
+    Создать несколько записей об уведомлениях одним коммитом
+
+    Args:
+        session: Сессия БД
+        rows: Список словарей с полями Notification
+            (recipient_id, message_text, notification_type, measurement_id, ...)
+
+    Returns:
+        Список созданных уведомлений
+    """
+    if not rows:
+        return []
+
+    # Московское время без tzinfo - в том виде, в каком его вернет БД
+    now = moscow_now().replace(tzinfo=None)
+    notifications = [Notification(**{"sent_at": now, **row}) for row in rows]
+    session.add_all(notifications)
+    await session.commit()
+
+    logger.debug("Создано уведомлений: {}", len(notifications))
+    return notifications
+
+
 async def get_recent_notifications(
     session: AsyncSession,
     limit: int = 20
@@ -803,17 +1244,10 @@ async def get_recent_notifications(
     Returns:
         Список уведомлений
     """
-    from sqlalchemy.orm import joinedload
-
     # Сначала получаем последние N уведомлений (сортировка по убыванию)
     # Затем переворачиваем результат, чтобы показать от старого к новому
-    result = await session.execute(
-        select(Notification)
-        .options(joinedload(Notification.recipient))
-        .order_by(Notification.sent_at.desc())
-        .limit(limit)
-    )
-    notifications = list(result.scalars().unique().all())
+    result = await session.execute(_STMT_RECENT_NOTIFICATIONS, {"limit": limit})
+    notifications = result.scalars().all()
 
     # Переворачиваем список, чтобы показать от старого к новому
     return list(reversed(notifications))
@@ -836,12 +1270,9 @@ async def get_notifications_by_user(
         Список уведомлений
     """
     result = await session.execute(
-        select(Notification)
-        .where(Notification.recipient_id == user_id)
-        .order_by(Notification.sent_at.desc())
-        .limit(limit)
+        _STMT_NOTIFICATIONS_BY_USER, {"recipient_id": user_id, "limit": limit}
     )
-    return list(result.scalars().all())
+    return result.scalars().all()
 
 
 async def get_pending_notifications_for_measurement(
@@ -861,11 +1292,7 @@ async def get_pending_notifications_for_measurement(
         Список уведомлений
     """
     result = await session.execute(
-        select(Notification)
-        .where(
-            Notification.measurement_id == measurement_id,
-            Notification.notification_type == notification_type,
-            Notification.telegram_message_id.isnot(None)  # Только уведомления с message_id
-        )
+        _STMT_SENT_NOTIFICATIONS_FOR_MEASUREMENT,
+        {"measurement_id": measurement_id, "notification_type": notification_type}
     )
-    return list(result.scalars().all())
+    return result.scalars().all()
@@ -19,83 +19,79 @@ def log_db_operation(operation_name: str = None):
     - Ошибки при выполнении
     """
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs) -> Any:
-            op_name = operation_name or func.__name__.upper().replace('_', ' ')
+        # Набор логируемых параметров определяется один раз по сигнатуре функции
+        extract_params = _build_params_extractor(func)
 
-            # Создаем логгер с контекстом БД
-            db_logger = logger.bind(operation=op_name)
+        # Название операции и логгер с контекстом БД не меняются между вызовами;
+        # сообщения об успехе формируются лениво - параметры и результат разбираются,
+        # только если уровень лога включен
+        op_name = operation_name or func.__name__.upper().replace('_', ' ')
+        db_logger = logger.bind(operation=op_name)
+        lazy_logger = db_logger.opt(lazy=True)
 
-            # Извлекаем ключевые параметры для логирования
-            params_info = _extract_params_info(func.__name__, args, kwargs)
-
-            start_time = time.time()
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs) -> Any:
+            start_ns = time.perf_counter_ns()
 
-            db_logger.debug(
-                f"🔵 БД операция начата: {op_name} | {params_info}"
+            lazy_logger.debug(
+                "🔵 БД операция начата: {} | {}",
+                lambda: op_name, lambda: extract_params(args, kwargs)
             )
 
             try:
                 result = await func(*args, **kwargs)
 
-                elapsed_time = (time.time() - start_time) * 1000  # в миллисекундах
-
-                # Информация о результате
-                result_info = _extract_result_info(func.__name__, result)
+                elapsed_time = (time.perf_counter_ns() - start_ns) / 1_000_000  # в миллисекундах
 
-                db_logger.info(
-                    f"✅ БД операция успешна: {op_name} | "
-                    f"{params_info} | "
-                    f"{result_info} | "
-                    f"Время: {elapsed_time:.2f}ms"
+                lazy_logger.info(
+                    "✅ БД операция успешна: {} | {} | {} | Время: {:.2f}ms",
+                    lambda: op_name,
+                    lambda: extract_params(args, kwargs),
+                    lambda: _extract_result_info(func.__name__, result),
+                    lambda: elapsed_time,
                 )
 
                 return result
 
             except Exception as e:
-                elapsed_time = (time.time() - start_time) * 1000
+                elapsed_time = (time.perf_counter_ns() - start_ns) / 1_000_000
 
                 db_logger.error(
-                    f"❌ БД операция провалилась: {op_name} | "
-                    f"{params_info} | "
-                    f"Время: {elapsed_time:.2f}ms | "
-                    f"Ошибка: {type(e).__name__}: {str(e)}",
+                    "❌ БД операция провалилась: {} | {} | Время: {:.2f}ms | Ошибка: {}: {}",
+                    op_name, extract_params(args, kwargs), elapsed_time, type(e).__name__, e,
                     exc_info=True
                 )
                 raise
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs) -> Any:
-            op_name = operation_name or func.__name__.upper().replace('_', ' ')
-            db_logger = logger.bind(operation=op_name)
-            params_info = _extract_params_info(func.__name__, args, kwargs)
-
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
 
-            db_logger.debug(f"🔵 БД операция начата: {op_name} | {params_info}")
+            lazy_logger.debug(
+                "🔵 БД операция начата: {} | {}",
+                lambda: op_name, lambda: extract_params(args, kwargs)
+            )
 
             try:
                 result = func(*args, **kwargs)
-                elapsed_time = (time.time() - start_time) * 1000
-                result_info = _extract_result_info(func.__name__, result)
-
-                db_logger.info(
-                    f"✅ БД операция успешна: {op_name} | "
-                    f"{params_info} | "
-                    f"{result_info} | "
-                    f"Время: {elapsed_time:.2f}ms"
+                elapsed_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+
+                lazy_logger.info(
+                    "✅ БД операция успешна: {} | {} | {} | Время: {:.2f}ms",
+                    lambda: op_name,
+                    lambda: extract_params(args, kwargs),
+                    lambda: _extract_result_info(func.__name__, result),
+                    lambda: elapsed_time,
                 )
 
                 return result
 
             except Exception as e:
-                elapsed_time = (time.time() - start_time) * 1000
+                elapsed_time = (time.perf_counter_ns() - start_ns) / 1_000_000
 
                 db_logger.error(
-                    f"❌ БД операция провалилась: {op_name} | "
-                    f"{params_info} | "
-                    f"Время: {elapsed_time:.2f}ms | "
-                    f"Ошибка: {type(e).__name__}: {str(e)}",
+                    "❌ БД операция провалилась: {} | {} | Время: {:.2f}ms | Ошибка: {}: {}",
+                    op_name, extract_params(args, kwargs), elapsed_time, type(e).__name__, e,
                     exc_info=True
                 )
                 raise
@@ -109,44 +105,65 @@ def log_db_operation(operation_name: str = None):
     return decorator
 
 
-def _extract_params_info(func_name: str, args: tuple, kwargs: dict) -> str:
-    """Извлекает ключевую информацию из параметров функции"""
-    params = []
-
-    # Для функций с пользователями
-    if 'telegram_id' in kwargs:
-        params.append(f"TelegramID:{kwargs['telegram_id']}")
-    if 'user_id' in kwargs:
-        params.append(f"UserID:{kwargs['user_id']}")
-
-    # Для функций с замерами
-    if 'measurement_id' in kwargs:
-        params.append(f"MeasurementID:{kwargs['measurement_id']}")
-    if 'lead_id' in kwargs:
-        params.append(f"LeadID:{kwargs['lead_id']}")
-
-    # Для функций с ролями
-    if 'role' in kwargs:
-        params.append(f"Role:{kwargs['role']}")
-
-    # Для функций со статусами
-    if 'status' in kwargs:
-        params.append(f"Status:{kwargs['status']}")
-
-    # Для функций с токенами
-    if 'token' in kwargs:
-        token = kwargs['token']
-        params.append(f"Token:{token[:8]}..." if len(token) > 8 else f"Token:{token}")
-
-    # Если ничего не нашли, просто считаем количество аргументов
-    if not params:
-        if args:
-            # Пропускаем первый аргумент (обычно session)
-            params.append(f"Args:{len(args) - 1}")
-        if kwargs:
-            params.append(f"Kwargs:{len(kwargs)}")
-
-    return " | ".join(params) if params else "No params"
+# Параметры, которые попадают в лог: (имя аргумента, метка)
+_LOGGED_PARAMS = (
+    ('telegram_id', 'TelegramID'),
+    ('user_id', 'UserID'),
+    ('measurement_id', 'MeasurementID'),
+    ('lead_id', 'LeadID'),
+    ('role', 'Role'),
+    ('status', 'Status'),
+    ('token', 'Token'),
+)
+
+
+def _build_params_extractor(func: Callable) -> Callable[[tuple, dict], str]:
+    """
+    Собрать функцию извлечения ключевых параметров для конкретной функции БД
+
+    По сигнатуре заранее определяется, какие из логируемых параметров у функции есть
+    и на какой позиции они передаются, чтобы не перебирать все варианты на каждом вызове
+    """
+    parameters = inspect.signature(func).parameters
+    positional_kinds = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    names = list(parameters)
+
+    tracked = tuple(
+        (
+            name,
+            label,
+            names.index(name) if parameters[name].kind in positional_kinds else None,
+        )
+        for name, label in _LOGGED_PARAMS
+        if name in parameters
+    )
+
+    def extract(args: tuple, kwargs: dict) -> str:
+        params = []
+        for name, label, position in tracked:
+            if name in kwargs:
+                value = kwargs[name]
+            elif position is not None and position < len(args):
+                value = args[position]
+            else:
+                continue
+
+            if name == 'token' and isinstance(value, str) and len(value) > 8:
+                params.append(f"{label}:{value[:8]}...")
+            else:
+                params.append(f"{label}:{value}")
+
+        # Если ничего не нашли, просто считаем количество аргументов
+        if not params:
+            if args:
+                # Пропускаем первый аргумент (обычно session)
+                params.append(f"Args:{len(args) - 1}")
+            if kwargs:
+                params.append(f"Kwargs:{len(kwargs)}")
+
+        return " | ".join(params) if params else "No params"
+
+    return extract
 
 
 def _extract_result_info(func_name: str, result: Any) -> str:
@@ -4,7 +4,7 @@ from typing import Optional
 from enum import Enum as PyEnum
 
 from sqlalchemy import (
-    BigInteger, String, DateTime, Enum, ForeignKey, Text, Integer, UniqueConstraint
+    BigInteger, String, DateTime, Enum, ForeignKey, Text, Integer, UniqueConstraint, Index, text
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -33,9 +33,51 @@ class MeasurementStatus(PyEnum):
     CANCELLED = "cancelled"  # Отменен
 
 
+# Текстовые представления статусов и ролей (строятся один раз, а не при каждом обращении)
+_STATUS_TEXT = {
+    MeasurementStatus.PENDING_CONFIRMATION: "⏳ Ожидает подтверждения",
+    MeasurementStatus.ASSIGNED: "📋 В работе",
+    MeasurementStatus.COMPLETED: "✅ Выполнен",
+    MeasurementStatus.CANCELLED: "❌ Отменен",
+}
+
+_ASSIGNMENT_REASON_TEXT = {
+    'dealer': '🏢 Привязанный замерщик',
+    'zone': '🗺 Зона',
+    'round_robin': '🔄 По очереди',
+    'none': '❌ Не назначен',
+}
+
+_INVITE_ROLE_TEXT = {
+    UserRole.ADMIN: "👑 Администратор",
+    UserRole.SUPERVISOR: "👔 Руководитель",
+    UserRole.MANAGER: "💼 Менеджер",
+    UserRole.MEASURER: "👷 Замерщик",
+}
+
+
+def compose_full_name(
+    first_name: Optional[str],
+    last_name: Optional[str],
+    username: Optional[str],
+    telegram_id: int
+) -> str:
+    """Полное имя пользователя по отдельным полям (без загрузки ORM-объекта)"""
+    parts = []
+    if first_name:
+        parts.append(first_name)
+    if last_name:
+        parts.append(last_name)
+    return " ".join(parts) if parts else username or f"User_{telegram_id}"
+
+
 class User(Base):
     """Модель пользователя бота"""
     __tablename__ = "users"
+    __table_args__ = (
+        # Частичный индекс: выборки получателей по роли идут только по активным пользователям
+        Index('ix_users_active_role', 'role', sqlite_where=text('is_active = 1')),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     telegram_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False, index=True)
@@ -45,7 +87,7 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), nullable=False)
 
     # AmoCRM данные (для менеджеров)
-    amocrm_user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    amocrm_user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
 
     is_active: Mapped[bool] = mapped_column(default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=moscow_now)
@@ -79,17 +121,18 @@ class User(Base):
     @property
     def full_name(self) -> str:
         """Полное имя пользователя"""
-        parts = []
-        if self.first_name:
-            parts.append(self.first_name)
-        if self.last_name:
-            parts.append(self.last_name)
-        return " ".join(parts) if parts else self.username or f"User_{self.telegram_id}"
+        return compose_full_name(self.first_name, self.last_name, self.username, self.telegram_id)
 
 
 class Measurement(Base):
     """Модель замера"""
     __tablename__ = "measurements"
+    __table_args__ = (
+        # Составные индексы под выборки списков: фильтр по колонке + сортировка по created_at
+        Index('ix_measurements_measurer_created', 'measurer_id', 'created_at'),
+        Index('ix_measurements_manager_created', 'manager_id', 'created_at'),
+        Index('ix_measurements_status_created', 'status', 'created_at'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -119,11 +162,11 @@ class Measurement(Base):
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Статус и назначение
+    # Отдельный индекс не нужен: status - первая колонка ix_measurements_status_created
     status: Mapped[MeasurementStatus] = mapped_column(
         Enum(MeasurementStatus),
         default=MeasurementStatus.ASSIGNED,
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Связь с замерщиком
@@ -229,13 +272,7 @@ class Measurement(Base):
     @property
     def status_text(self) -> str:
         """Текстовое представление статуса на русском"""
-        status_map = {
-            MeasurementStatus.PENDING_CONFIRMATION: "⏳ Ожидает подтверждения",
-            MeasurementStatus.ASSIGNED: "📋 В работе",
-            MeasurementStatus.COMPLETED: "✅ Выполнен",
-            MeasurementStatus.CANCELLED: "❌ Отменен",
-        }
-        return status_map.get(self.status, "❓ Неизвестен")
+        return _STATUS_TEXT.get(self.status, "❓ Неизвестен")
 
     def get_info_text(self, detailed: bool = True, show_admin_info: bool = False) -> str:
         """
@@ -254,7 +291,7 @@ class Measurement(Base):
         6. Информация о подтверждении (только для админов)
         7. Временные метки (если detailed=True)
         """
-        text = f"📋 <b>Замер #{self.id}</b>\n\n"
+        parts = [f"📋 <b>Замер #{self.id}</b>\n\n"]
 
         # Получаем актуальные данные из Altawin
         altawin_data = self.get_altawin_data()
@@ -268,17 +305,17 @@ class Measurement(Base):
             return value
 
         # === БЛОК 1: Основная информация о заказе ===
-        text += f"📄 <b>Сделка:</b> {self.lead_name}\n"
+        parts.append(f"📄 <b>Сделка:</b> {self.lead_name}\n")
 
         # Данные заказа из Altawin
-        text += f"🔢 <b>Номер заказа:</b> {altawin_value(altawin_data.order_number if altawin_data else None)}\n"
-        text += f"📍 <b>Адрес:</b> {altawin_value(altawin_data.address if altawin_data else None)}\n"
-        text += f"🚚 <b>Зона доставки:</b> {altawin_value(altawin_data.zone if altawin_data else None)}\n"
+        parts.append(f"🔢 <b>Номер заказа:</b> {altawin_value(altawin_data.order_number if altawin_data else None)}\n")
+        parts.append(f"📍 <b>Адрес:</b> {altawin_value(altawin_data.address if altawin_data else None)}\n")
+        parts.append(f"🚚 <b>Зона доставки:</b> {altawin_value(altawin_data.zone if altawin_data else None)}\n")
 
-        text += "\n"
+        parts.append("\n")
 
         # === БЛОК 2: Контактные данные ===
-        text += f"👤 <b>Контакт:</b> {self.contact_name or 'Данные не найдены в AmoCRM'}\n"
+        parts.append(f"👤 <b>Контакт:</b> {self.contact_name or 'Данные не найдены в AmoCRM'}\n")
 
         phone_text = self.contact_phone or ""
         if not phone_text and altawin_data and getattr(altawin_data, "phone", None):
@@ -288,32 +325,32 @@ class Measurement(Base):
             phone_text = format_phone_for_telegram(phone_text)
         else:
             phone_text = "Данные не найдены в AmoCRM"
-        text += f"📞 <b>Телефон:</b> {phone_text}\n"
+        parts.append(f"📞 <b>Телефон:</b> {phone_text}\n")
 
         # Ответственный в AmoCRM
-        text += f"👨‍💼 <b>Ответственный в AmoCRM:</b> {self.responsible_user_name or 'Данные не найдены в AmoCRM'}\n"
+        parts.append(f"👨‍💼 <b>Ответственный в AmoCRM:</b> {self.responsible_user_name or 'Данные не найдены в AmoCRM'}\n")
 
-        text += "\n"
+        parts.append("\n")
 
         # === БЛОК 3: Параметры окон из Altawin ===
         if altawin_data and altawin_data.qty_izd is not None:
             qty_text = str(altawin_data.qty_izd)
         else:
             qty_text = altawin_value(None)
-        text += f"🪟 <b>Количество окон:</b> {qty_text}\n"
+        parts.append(f"🪟 <b>Количество окон:</b> {qty_text}\n")
 
         if altawin_data and altawin_data.area_izd is not None:
             area_text = f"{altawin_data.area_izd} м²"
         else:
             area_text = altawin_value(None)
-        text += f"📐 <b>Площадь окон:</b> {area_text}\n\n"
+        parts.append(f"📐 <b>Площадь окон:</b> {area_text}\n\n")
 
         # === БЛОК 4: Статус и назначение ===
-        text += f"📊 <b>Статус:</b> {self.status_text}\n"
+        parts.append(f"📊 <b>Статус:</b> {self.status_text}\n")
 
         # Замерщик
         if self.measurer:
-            text += f"👷 <b>Замерщик:</b> {self.measurer.full_name}\n"
+            parts.append(f"👷 <b>Замерщик:</b> {self.measurer.full_name}\n")
 
         # === БЛОК 5: Информация о подтверждении и распределении (ТОЛЬКО для админов/руководителей) ===
         if show_admin_info:
@@ -325,81 +362,75 @@ class Measurement(Base):
 
             # Показываем информацию о предложенном замерщике для статуса PENDING_CONFIRMATION
             if self.status == MeasurementStatus.PENDING_CONFIRMATION and self.auto_assigned_measurer:
-                text += "\n⚡️ <b>Система предлагает:</b>\n"
-                text += f"  👷 {self.auto_assigned_measurer.full_name}\n"
+                parts.append("\n⚡️ <b>Система предлагает:</b>\n")
+                parts.append(f"  👷 {self.auto_assigned_measurer.full_name}\n")
 
                 if self.assignment_reason:
-                    reason_text = {
-                        'dealer': '🏢 Привязанный замерщик',
-                        'zone': '🗺 Зона',
-                        'round_robin': '🔄 По очереди',
-                        'none': '❌ Не назначен'
-                    }.get(self.assignment_reason, '❓ Неизвестно')
-                    text += f"  📌 Причина: {reason_text}\n"
+                    reason_text = _ASSIGNMENT_REASON_TEXT.get(self.assignment_reason, '❓ Неизвестно')
+                    parts.append(f"  📌 Причина: {reason_text}\n")
 
                     # Если назначение по дилеру - показываем доп информацию
                     if self.assignment_reason == 'dealer':
                         if self.dealer_company_name:
-                            text += f"  🏢 Компания: {self.dealer_company_name}\n"
+                            parts.append(f"  🏢 Компания: {self.dealer_company_name}\n")
                     elif self.assignment_reason == 'zone' and assignment_zone:
-                        text += f"  🗺 Зона: {assignment_zone}\n"
+                        parts.append(f"  🗺 Зона: {assignment_zone}\n")
 
             # История автоматического распределения (для подтвержденных замеров)
             elif self.assignment_reason and self.status != MeasurementStatus.PENDING_CONFIRMATION:
-                text += "\n📊 <b>История распределения:</b>\n"
+                parts.append("\n📊 <b>История распределения:</b>\n")
 
-                reason_text = {
-                    'dealer': '🏢 Привязанный замерщик',
-                    'zone': '🗺 Зона',
-                    'round_robin': '🔄 По очереди',
-                    'none': '❌ Не назначен'
-                }.get(self.assignment_reason, '❓ Неизвестно')
+                reason_text = _ASSIGNMENT_REASON_TEXT.get(self.assignment_reason, '❓ Неизвестно')
 
-                text += f"  📌 Причина: {reason_text}\n"
+                parts.append(f"  📌 Причина: {reason_text}\n")
 
                 # Если назначение по дилеру - показываем доп информацию
                 if self.assignment_reason == 'dealer':
                     if self.dealer_company_name:
-                        text += f"  🏢 Компания: {self.dealer_company_name}\n"
+                        parts.append(f"  🏢 Компания: {self.dealer_company_name}\n")
                     if self.dealer_field_value:
-                        text += f"  👷 Привязанный замерщик: {self.dealer_field_value}\n"
+                        parts.append(f"  👷 Привязанный замерщик: {self.dealer_field_value}\n")
                 elif self.assignment_reason == 'zone' and assignment_zone:
-                    text += f"  🗺 Зона: {assignment_zone}\n"
+                    parts.append(f"  🗺 Зона: {assignment_zone}\n")
 
                 # Если замерщик был изменён
                 if self.auto_assigned_measurer and self.measurer:
                     if self.auto_assigned_measurer.id != self.measurer.id:
-                        text += f"  🔄 Изначально: {self.auto_assigned_measurer.full_name}\n"
-                        text += f"  ✅ Назначен: {self.measurer.full_name}\n"
+                        parts.append(f"  🔄 Изначально: {self.auto_assigned_measurer.full_name}\n")
+                        parts.append(f"  ✅ Назначен: {self.measurer.full_name}\n")
                     else:
-                        text += f"  ✅ Подтверждён: {self.auto_assigned_measurer.full_name}\n"
+                        parts.append(f"  ✅ Подтверждён: {self.auto_assigned_measurer.full_name}\n")
 
             # Кто подтвердил
             if self.confirmed_by:
-                text += f"  👤 Подтвердил: {self.confirmed_by.full_name}\n"
+                parts.append(f"  👤 Подтвердил: {self.confirmed_by.full_name}\n")
 
         # === БЛОК 6: Временные метки (детальная информация) ===
         if detailed:
             from utils.timezone_utils import format_moscow_time
 
-            text += f"\n🆔 <b>ID сделки в AmoCRM:</b> {self.amocrm_lead_id}\n"
+            parts.append(f"\n🆔 <b>ID сделки в AmoCRM:</b> {self.amocrm_lead_id}\n")
 
             # Конвертируем времена в московское время
             if self.created_at:
-                text += f"📅 <b>Создано:</b> {format_moscow_time(self.created_at)}\n"
+                parts.append(f"📅 <b>Создано:</b> {format_moscow_time(self.created_at)}\n")
 
             if self.assigned_at:
-                text += f"📅 <b>Назначено:</b> {format_moscow_time(self.assigned_at)}\n"
+                parts.append(f"📅 <b>Назначено:</b> {format_moscow_time(self.assigned_at)}\n")
 
             if self.completed_at:
-                text += f"📅 <b>Выполнено:</b> {format_moscow_time(self.completed_at)}\n"
+                parts.append(f"📅 <b>Выполнено:</b> {format_moscow_time(self.completed_at)}\n")
 
-        return text
+        return "".join(parts)
 
 
 class InviteLink(Base):
     """Модель пригласительной ссылки"""
     __tablename__ = "invite_links"
+    __table_args__ = (
+        # Частичный индекс для списка активных ссылок (сортировка по id, новые первыми)
+        Index('ix_invite_links_active', 'id', sqlite_where=text('is_active = 1')),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -451,13 +482,7 @@ class InviteLink(Base):
     @property
     def role_text(self) -> str:
         """Текстовое представление роли на русском"""
-        role_map = {
-            UserRole.ADMIN: "👑 Администратор",
-            UserRole.SUPERVISOR: "👔 Руководитель",
-            UserRole.MANAGER: "💼 Менеджер",
-            UserRole.MEASURER: "👷 Замерщик",
-        }
-        return role_map.get(self.role, "❓ Неизвестная роль")
+        return _INVITE_ROLE_TEXT.get(self.role, "❓ Неизвестная роль")
 
     def get_info_text(self) -> str:
         """Форматированная информация о ссылке"""
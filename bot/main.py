@@ -14,6 +14,7 @@ from aiogram.enums import ParseMode
 
 from config import settings
 from server import app, set_webhook_processor, WebhookProcessor
+from bot_handlers import create_bot_session
 
 
 async def run_bot():
@@ -63,6 +64,7 @@ async def main():
     # Создаем экземпляр бота для webhook процессора
     bot = Bot(
         token=settings.bot_token,
+        session=create_bot_session(),
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
 
@@ -0,0 +1,16 @@
+-- Миграция: частичные индексы по активным записям
+-- Дата: 2026-10-15
+-- Описание:
+--   Выборки получателей уведомлений (по роли) и список активных пригласительных ссылок
+--   фильтруют is_active = 1. Частичный индекс содержит только активные строки, поэтому
+--   деактивированные пользователи и ссылки не читаются.
+--   Условие индекса совпадает с тем, что генерирует SQLAlchemy (is_active = 1),
+--   иначе SQLite не сможет использовать индекс.
+--   Проверка: EXPLAIN QUERY PLAN должен показывать USING INDEX ix_users_active_role /
+--   ix_invite_links_active
+
+CREATE INDEX IF NOT EXISTS ix_users_active_role
+    ON users(role) WHERE is_active = 1;
+
+CREATE INDEX IF NOT EXISTS ix_invite_links_active
+    ON invite_links(id) WHERE is_active = 1;
@@ -0,0 +1,11 @@
+-- Миграция: индекс по AmoCRM ID пользователя
+-- Дата: 2026-10-15
+-- Описание:
+--   get_user_by_amocrm_id выполняется на каждый вебхук AmoCRM с ответственным менеджером.
+--   Без индекса SQLite просматривает всю таблицу users.
+--   Индекс не уникальный: привязка в админке не запрещает связать один аккаунт
+--   AmoCRM с несколькими пользователями бота.
+--   measurements.amocrm_lead_id уже имеет уникальный индекс (unique=True, index=True)
+
+CREATE INDEX IF NOT EXISTS ix_users_amocrm_user_id
+    ON users(amocrm_user_id);
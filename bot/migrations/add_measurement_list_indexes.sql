@@ -0,0 +1,17 @@
+-- Миграция: составные индексы для списков замеров
+-- Дата: 2026-10-15
+-- Описание:
+--   get_measurements_by_measurer / _by_manager / _by_status фильтруют по одной колонке
+--   и сортируют по created_at. Составной индекс позволяет SQLite читать строки сразу
+--   в нужном порядке, без временного B-дерева для ORDER BY.
+--   Проверка: EXPLAIN QUERY PLAN должен показывать SEARCH ... USING INDEX
+--   без USE TEMP B-TREE FOR ORDER BY
+
+CREATE INDEX IF NOT EXISTS ix_measurements_measurer_created
+    ON measurements(measurer_id, created_at);
+
+CREATE INDEX IF NOT EXISTS ix_measurements_manager_created
+    ON measurements(manager_id, created_at);
+
+CREATE INDEX IF NOT EXISTS ix_measurements_status_created
+    ON measurements(status, created_at);
@@ -195,17 +195,15 @@ def apply_migration():
         print("\n✅ Миграция успешно применена!")
         print("\n📊 Статистика:")
 
-        # Показываем количество записей в новых таблицах
-        cursor.execute("SELECT COUNT(*) FROM measurer_names")
-        measurer_names_count = cursor.fetchone()[0]
+        # Показываем количество записей в новых таблицах (все счетчики одним запросом)
+        measurer_names_count, assignments_count, measurements_with_reason = cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM measurer_names),
+                (SELECT COUNT(*) FROM measurer_name_assignments),
+                (SELECT COUNT(*) FROM measurements WHERE assignment_reason IS NOT NULL)
+        """).fetchone()
         print(f"  • Имён замерщиков: {measurer_names_count}")
-
-        cursor.execute("SELECT COUNT(*) FROM measurer_name_assignments")
-        assignments_count = cursor.fetchone()[0]
         print(f"  • Привязок имён: {assignments_count}")
-
-        cursor.execute("SELECT COUNT(*) FROM measurements WHERE assignment_reason IS NOT NULL")
-        measurements_with_reason = cursor.fetchone()[0]
         print(f"  • Замеров с причиной назначения: {measurements_with_reason}")
 
     except Exception as e:
@@ -9,16 +9,28 @@ from pathlib import Path
 # Путь к базе данных
 DB_PATH = Path(__file__).parent.parent / "measurerers_bot.db"
 
-def column_exists(cursor, table_name, column_name):
-    """Проверяет существование колонки в таблице"""
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = [row[1] for row in cursor.fetchall()]
-    return column_name in columns
-
-def index_exists(cursor, index_name):
-    """Проверяет существование индекса"""
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name=?", (index_name,))
-    return cursor.fetchone() is not None
+def load_schema(cursor):
+    """
+    Загружает колонки таблиц measurements/notifications и имена индексов одним запросом
+
+    Returns:
+        Кортеж (множество пар (таблица, колонка), множество имен индексов)
+    """
+    cursor.execute("""
+        SELECT 'measurements', name FROM pragma_table_info('measurements')
+        UNION ALL
+        SELECT 'notifications', name FROM pragma_table_info('notifications')
+        UNION ALL
+        SELECT NULL, name FROM sqlite_master WHERE type='index'
+    """)
+    columns = set()
+    indexes = set()
+    for table_name, name in cursor.fetchall():
+        if table_name is None:
+            indexes.add(name)
+        else:
+            columns.add((table_name, name))
+    return columns, indexes
 
 def apply_migration():
     """Применяет миграцию к базе данных"""
@@ -32,11 +44,14 @@ def apply_migration():
     try:
         print("🔄 Применение миграции add_confirmed_by_user_id...")
 
+        # Схема читается один раз, а не отдельным запросом на каждую проверку
+        columns, indexes = load_schema(cursor)
+
         # === ТАБЛИЦА MEASUREMENTS ===
         print("\n📋 Обработка таблицы measurements...")
 
         # Добавляем confirmed_by_user_id если не существует
-        if not column_exists(cursor, "measurements", "confirmed_by_user_id"):
+        if ("measurements", "confirmed_by_user_id") not in columns:
             print("  ➕ Добавление поля confirmed_by_user_id...")
             cursor.execute("""
                 ALTER TABLE measurements
@@ -48,7 +63,7 @@ def apply_migration():
             print("  ⏭️  Поле confirmed_by_user_id уже существует")
 
         # Создаем индекс если не существует
-        if not index_exists(cursor, "ix_measurements_confirmed_by_user_id"):
+        if "ix_measurements_confirmed_by_user_id" not in indexes:
             print("  ➕ Создание индекса ix_measurements_confirmed_by_user_id...")
             cursor.execute("""
                 CREATE INDEX ix_measurements_confirmed_by_user_id
@@ -62,7 +77,7 @@ def apply_migration():
         print("\n📋 Обработка таблицы notifications...")
 
         # Добавляем telegram_message_id если не существует
-        if not column_exists(cursor, "notifications", "telegram_message_id"):
+        if ("notifications", "telegram_message_id") not in columns:
             print("  ➕ Добавление поля telegram_message_id...")
             cursor.execute("""
                 ALTER TABLE notifications
@@ -73,7 +88,7 @@ def apply_migration():
             print("  ⏭️  Поле telegram_message_id уже существует")
 
         # Добавляем telegram_chat_id если не существует
-        if not column_exists(cursor, "notifications", "telegram_chat_id"):
+        if ("notifications", "telegram_chat_id") not in columns:
             print("  ➕ Добавление поля telegram_chat_id...")
             cursor.execute("""
                 ALTER TABLE notifications
@@ -84,7 +99,7 @@ def apply_migration():
             print("  ⏭️  Поле telegram_chat_id уже существует")
 
         # Создаем индекс если не существует
-        if not index_exists(cursor, "ix_notifications_measurement_type"):
+        if "ix_notifications_measurement_type" not in indexes:
             print("  ➕ Создание индекса ix_notifications_measurement_type...")
             cursor.execute("""
                 CREATE INDEX ix_notifications_measurement_type
@@ -0,0 +1,10 @@
+-- Миграция: удаление одиночного индекса по статусу замера
+-- Дата: 2026-10-15
+-- Описание:
+--   ix_measurements_status дублирует составной индекс ix_measurements_status_created:
+--   status в нем первая колонка, поэтому все выборки и подсчеты по статусу
+--   обслуживаются составным индексом. Лишний индекс только замедляет запись замеров.
+--   Проверка: EXPLAIN QUERY PLAN для выборки по статусу должен показывать
+--   SEARCH ... USING INDEX ix_measurements_status_created
+
+DROP INDEX IF EXISTS ix_measurements_status;
@@ -63,8 +63,7 @@ async def apply_migration():
             logger.info("Создана временная таблица measurements_new")
 
             # Проверяем, есть ли данные в старой таблице
-            result = await conn.execute(text("SELECT COUNT(*) FROM measurements"))
-            count = result.fetchone()[0]
+            count = await conn.scalar(text("SELECT COUNT(*) FROM measurements"))
             logger.info(f"Найдено {count} записей в старой таблице")
 
             if count > 0:
@@ -94,9 +94,12 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Проверка здоровья сервиса"""
+    from database import db
+
     return {
         "status": "healthy",
-        "webhook_processor": webhook_processor is not None
+        "webhook_processor": webhook_processor is not None,
+        "db_pool": db.pool_status()
     }
 
 
@@ -150,7 +150,7 @@ class WebhookProcessor:
             lead_data: Данные сделки
         """
         from database import (
-            get_db,
+            db_session,
             create_measurement,
             get_measurement_by_amocrm_id
         )
@@ -239,7 +239,7 @@ class WebhookProcessor:
                     break  # Нашли код - больше ничего не нужно
 
             # Создаем замер в БД
-            async for session in get_db():
+            async with db_session() as session:
                 # Проверяем, нет ли уже замера для этой сделки
                 existing = await get_measurement_by_amocrm_id(session, lead_id)
                 if existing:
@@ -374,7 +374,10 @@ class WebhookProcessor:
 
         from config import settings
         from bot_handlers.utils.notifications import send_new_measurement_to_admin, send_new_measurement_notification_to_observers
-        from database import get_db, get_all_supervisors
+        from database import db_session, get_all_supervisors
+
+        # Текст с данными замера (включая запрос в Altawin) формируем один раз для всех получателей
+        info_text = measurement.get_info_text(detailed=True, show_admin_info=True)
 
         # Отправляем уведомления администраторам из конфига
         for admin_id in settings.admin_ids_list:
@@ -382,21 +385,23 @@ class WebhookProcessor:
                 await send_new_measurement_to_admin(
                     bot=self.bot,
                     admin_telegram_id=admin_id,
-                    measurement=measurement
+                    measurement=measurement,
+                    info_text=info_text
                 )
                 logger.info(f"Отправлено уведомление администратору {admin_id}")
             except Exception as e:
                 logger.error(f"Ошибка отправки уведомления администратору {admin_id}: {e}")
 
         # Отправляем уведомления всем руководителям из БД
-        async for session in get_db():
+        async with db_session() as session:
             supervisors = await get_all_supervisors(session)
             for supervisor in supervisors:
                 try:
                     await send_new_measurement_to_admin(
                         bot=self.bot,
                         admin_telegram_id=supervisor.telegram_id,
-                        measurement=measurement
+                        measurement=measurement,
+                        info_text=info_text
                     )
                     logger.info(f"Отправлено уведомление руководителю {supervisor.full_name} ({supervisor.telegram_id})")
                 except Exception as e:
@@ -88,7 +88,7 @@ class MeasurerNameService:
         """Получить все имена замерщиков"""
         stmt = select(MeasurerName).order_by(MeasurerName.name)
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
 
     async def delete_measurer_name(self, measurer_name_id: int) -> bool:
         """
@@ -211,7 +211,7 @@ class MeasurerNameService:
             .order_by(MeasurerName.name)
         )
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
 
     async def get_user_by_measurer_name(self, measurer_name: str) -> Optional[User]:
         """
@@ -274,7 +274,7 @@ class MeasurerNameService:
             stmt = select(MeasurerName).order_by(MeasurerName.name)
 
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
 
     async def get_unassigned_measurer_names(self) -> List[MeasurerName]:
         """
@@ -299,7 +299,7 @@ class MeasurerNameService:
             stmt = select(MeasurerName).order_by(MeasurerName.name)
 
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
 
     async def get_measurer_name_by_user_id(self, user_id: int) -> Optional[str]:
         """
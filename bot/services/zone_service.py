@@ -4,7 +4,6 @@ from datetime import datetime
 
 from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 from loguru import logger
 
 from database.models import DeliveryZone, MeasurerZone, User, UserRole, RoundRobinCounter
@@ -57,7 +56,7 @@ class ZoneService:
         """Получить все зоны доставки"""
         stmt = select(DeliveryZone).order_by(DeliveryZone.zone_name)
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
 
     async def delete_zone(self, zone_id: int) -> bool:
         """
@@ -159,7 +158,7 @@ class ZoneService:
             .order_by(DeliveryZone.zone_name)
         )
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
 
     async def get_measurers_by_zone(self, zone_name: str) -> List[User]:
         """
@@ -182,10 +181,11 @@ class ZoneService:
                     User.is_active == True
                 )
             )
-            .options(joinedload(User.assigned_zones))
         )
+        # Зоны замерщиков вызывающему коду не нужны: без joinedload коллекции
+        # нет декартова произведения строк и дедупликации через unique()
         result = await self.session.execute(stmt)
-        return list(result.scalars().unique().all())
+        return result.scalars().all()
 
     async def get_next_measurer_round_robin_preview(self) -> Optional[User]:
         """
@@ -207,7 +207,7 @@ class ZoneService:
             .order_by(User.id)
         )
         result = await self.session.execute(stmt)
-        measurers = list(result.scalars().all())
+        measurers = result.scalars().all()
 
         if not measurers:
             logger.warning("Нет доступных замерщиков для round-robin распределения")
@@ -324,7 +324,7 @@ class ZoneService:
             .order_by(DeliveryZone.zone_name)
         )
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
 
     async def get_zones_not_assigned_to_measurer(self, user_id: int) -> List[DeliveryZone]:
         """Получить зоны, которые не назначены конкретному замерщику"""
@@ -343,7 +343,7 @@ class ZoneService:
             stmt = select(DeliveryZone).order_by(DeliveryZone.zone_name)
 
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
 
     async def assign_measurer_with_priority(
         self,
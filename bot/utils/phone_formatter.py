@@ -1,7 +1,49 @@
 """Утилиты для форматирования телефонных номеров"""
 import re
+from functools import lru_cache
 
 
+# Все символы, кроме цифр и +
+_NON_PHONE_CHARS = re.compile(r'[^\d+]')
+
+# Таблица удаления ASCII-символов, кроме цифр и + (быстрый путь без regex)
+_ASCII_STRIP_TABLE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if not (chr(c).isdigit() or chr(c) == '+')
+))
+
+
+def _strip_phone(phone: str) -> str:
+    """Убрать из номера все символы кроме цифр и +"""
+    if phone.isascii():
+        return phone.translate(_ASCII_STRIP_TABLE)
+    return _NON_PHONE_CHARS.sub('', phone)
+
+
+def _canonicalize(phone: str) -> str:
+    """
+    Привести номер к виду +XXXXXXXXXXX
+
+    Если формат не распознан, возвращает номер без лишних символов,
+    но без ведущего +
+    """
+    clean_phone = _strip_phone(phone)
+
+    # Если номер начинается с 8, заменяем на +7
+    if clean_phone.startswith('8') and len(clean_phone) == 11:
+        clean_phone = '+7' + clean_phone[1:]
+
+    # Если номер начинается с 7 без +, добавляем +
+    elif clean_phone.startswith('7'):
+        clean_phone = '+' + clean_phone
+
+    # Если номер не начинается с +, добавляем +7 (предполагаем российский номер)
+    elif not clean_phone.startswith('+') and len(clean_phone) == 10:
+        clean_phone = '+7' + clean_phone
+
+    return clean_phone
+
+
+@lru_cache(maxsize=4096)
 def format_phone_for_telegram(phone: str) -> str:
     """
     Форматирует телефон для кликабельности в Telegram
@@ -24,24 +66,11 @@ def format_phone_for_telegram(phone: str) -> str:
     if not phone:
         return ""
 
-    # Убираем все символы кроме цифр и +
-    clean_phone = re.sub(r'[^\d+]', '', phone)
-
-    # Если номер начинается с 8, заменяем на +7
-    if clean_phone.startswith('8') and len(clean_phone) == 11:
-        clean_phone = '+7' + clean_phone[1:]
-
-    # Если номер начинается с 7 без +, добавляем +
-    elif clean_phone.startswith('7') and not clean_phone.startswith('+'):
-        clean_phone = '+' + clean_phone
+    clean_phone = _canonicalize(phone)
 
-    # Если номер не начинается с +, добавляем +7 (предполагаем российский номер)
-    elif not clean_phone.startswith('+'):
-        if len(clean_phone) == 10:
-            clean_phone = '+7' + clean_phone
-        else:
-            # Возвращаем как есть, если формат неизвестен
-            return phone
+    # Возвращаем как есть, если формат неизвестен
+    if not clean_phone.startswith('+'):
+        return phone
 
     # Форматируем для красивого отображения
     # Для российских номеров (+7XXXXXXXXXX)
@@ -69,20 +98,4 @@ def normalize_phone(phone: str) -> str:
     if not phone:
         return ""
 
-    # Убираем все символы кроме цифр и +
-    clean_phone = re.sub(r'[^\d+]', '', phone)
-
-    # Если номер начинается с 8, заменяем на +7
-    if clean_phone.startswith('8') and len(clean_phone) == 11:
-        clean_phone = '+7' + clean_phone[1:]
-
-    # Если номер начинается с 7 без +, добавляем +
-    elif clean_phone.startswith('7') and not clean_phone.startswith('+'):
-        clean_phone = '+' + clean_phone
-
-    # Если номер не начинается с +, добавляем +7 (предполагаем российский номер)
-    elif not clean_phone.startswith('+'):
-        if len(clean_phone) == 10:
-            clean_phone = '+7' + clean_phone
-
-    return clean_phone
+    return _canonicalize(phone)
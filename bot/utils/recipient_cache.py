@@ -0,0 +1,116 @@
+"""Кэш списков получателей уведомлений (замерщики, администраторы, руководители)"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Время жизни кэша в секундах: состав сотрудников меняется редко
+RECIPIENT_CACHE_TTL = 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class Recipient:
+    """Получатель уведомления (только поля, используемые при рассылке)"""
+    id: int
+    telegram_id: int
+    full_name: str
+
+
+_cache: dict[str, tuple[float, tuple[Recipient, ...]]] = {}
+_lock = asyncio.Lock()
+
+
+async def _load(session: AsyncSession) -> None:
+    """Загрузить списки получателей из БД и сохранить в кэш"""
+    from database import get_active_recipient_rows, UserRole
+    from database.models import compose_full_name
+
+    groups: dict[UserRole, list[Recipient]] = {
+        UserRole.MEASURER: [],
+        UserRole.ADMIN: [],
+        UserRole.SUPERVISOR: [],
+    }
+    for row in await get_active_recipient_rows(session):
+        groups[row.role].append(Recipient(
+            id=row.id,
+            telegram_id=row.telegram_id,
+            full_name=compose_full_name(row.first_name, row.last_name, row.username, row.telegram_id),
+        ))
+
+    now = time.monotonic()
+    _cache["measurers"] = (now, tuple(groups[UserRole.MEASURER]))
+    _cache["admins"] = (now, tuple(groups[UserRole.ADMIN]))
+    _cache["supervisors"] = (now, tuple(groups[UserRole.SUPERVISOR]))
+    logger.debug(
+        f"Кэш получателей обновлен: замерщиков {len(groups[UserRole.MEASURER])}, "
+        f"администраторов {len(groups[UserRole.ADMIN])}, руководителей {len(groups[UserRole.SUPERVISOR])}"
+    )
+
+
+def _get_fresh(key: str) -> Optional[tuple[Recipient, ...]]:
+    """Получить значение из кэша, если оно не устарело"""
+    entry = _cache.get(key)
+    if entry and time.monotonic() - entry[0] < RECIPIENT_CACHE_TTL:
+        return entry[1]
+    return None
+
+
+async def _get(key: str, session: Optional[AsyncSession]) -> tuple[Recipient, ...]:
+    """Получить список получателей из кэша, при необходимости перезагрузив его"""
+    cached = _get_fresh(key)
+    if cached is not None:
+        return cached
+
+    async with _lock:
+        # Список мог быть загружен другой задачей, пока мы ждали блокировку
+        cached = _get_fresh(key)
+        if cached is not None:
+            return cached
+
+        if session is not None:
+            await _load(session)
+        else:
+            from database import db_read_session
+            async with db_read_session() as new_session:
+                await _load(new_session)
+
+        return _cache[key][1]
+
+
+async def cached_measurers(session: Optional[AsyncSession] = None) -> tuple[Recipient, ...]:
+    """
+    Получить активных замерщиков (с кэшированием)
+
+    Args:
+        session: Сессия БД для загрузки при промахе кэша (если не передана, открывается новая)
+
+    Returns:
+        Кортеж получателей
+    """
+    return await _get("measurers", session)
+
+
+async def cached_admins_and_supervisors(
+    session: Optional[AsyncSession] = None
+) -> tuple[tuple[Recipient, ...], tuple[Recipient, ...]]:
+    """
+    Получить активных администраторов и руководителей (с кэшированием)
+
+    Args:
+        session: Сессия БД для загрузки при промахе кэша (если не передана, открывается новая)
+
+    Returns:
+        Кортеж (администраторы, руководители)
+    """
+    admins = await _get("admins", session)
+    supervisors = await _get("supervisors", session)
+    return admins, supervisors
+
+
+def invalidate_recipient_cache() -> None:
+    """Сбросить кэш получателей (вызывается при изменении ролей и статусов пользователей)"""
+    _cache.clear()
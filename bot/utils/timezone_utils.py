@@ -1,12 +1,17 @@
 """Утилиты для работы с временными зонами"""
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import Optional
 
 
 # Московское время (UTC+3)
 MOSCOW_TZ = timezone(timedelta(hours=3))
 
+# Формат даты по умолчанию для сообщений бота
+_DEFAULT_FMT = '%d.%m.%Y %H:%M'
 
+
+@lru_cache(maxsize=256)
 def to_moscow_time(dt: Optional[datetime]) -> Optional[datetime]:
     """
     Конвертировать datetime в московское время (UTC+3)
@@ -27,7 +32,8 @@ def to_moscow_time(dt: Optional[datetime]) -> Optional[datetime]:
     return dt.astimezone(MOSCOW_TZ)
 
 
-def format_moscow_time(dt: Optional[datetime], format_str: str = '%d.%m.%Y %H:%M') -> str:
+@lru_cache(maxsize=1024)
+def format_moscow_time(dt: Optional[datetime], format_str: str = _DEFAULT_FMT) -> str:
     """
     Отформатировать datetime в московском времени
 
@@ -42,6 +48,12 @@ def format_moscow_time(dt: Optional[datetime], format_str: str = '%d.%m.%Y %H:%M
         return 'Не указано'
 
     moscow_dt = to_moscow_time(dt)
+
+    # Быстрый путь для формата по умолчанию без разбора строки формата strftime
+    if format_str is _DEFAULT_FMT or format_str == _DEFAULT_FMT:
+        m = moscow_dt
+        return f"{m.day:02d}.{m.month:02d}.{m.year} {m.hour:02d}:{m.minute:02d}"
+
     return moscow_dt.strftime(format_str)
 
 
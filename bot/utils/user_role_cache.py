@@ -0,0 +1,43 @@
+"""Кэш ролей пользователей по Telegram ID (проверка прав выполняется на каждое обновление)"""
+import time
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from database.models import UserRole
+
+
+# Время жизни записи в секундах: изменения ролей через функции БД сбрасывают кэш сразу,
+# TTL страхует от изменений, сделанных в обход них
+USER_ROLE_CACHE_TTL = 30.0
+USER_ROLE_CACHE_MAX = 10_000
+
+# telegram_id -> (время записи, роль или None для незарегистрированных)
+_cache: dict[int, tuple[float, Optional["UserRole"]]] = {}
+
+
+def lookup_user_role(telegram_id: int) -> tuple[bool, Optional["UserRole"]]:
+    """
+    Получить роль пользователя из кэша
+
+    Returns:
+        Кортеж (найдено ли значение в кэше, роль или None)
+    """
+    entry = _cache.get(telegram_id)
+    if entry and time.monotonic() - entry[0] < USER_ROLE_CACHE_TTL:
+        return True, entry[1]
+    return False, None
+
+
+def remember_user_role(telegram_id: int, role: Optional["UserRole"]) -> None:
+    """Сохранить роль пользователя в кэш (при переполнении вытесняется самая старая запись)"""
+    if len(_cache) >= USER_ROLE_CACHE_MAX and telegram_id not in _cache:
+        _cache.pop(next(iter(_cache)))
+    _cache[telegram_id] = (time.monotonic(), role)
+
+
+def invalidate_user_role(telegram_id: Optional[int] = None) -> None:
+    """Сбросить роль пользователя в кэше (или весь кэш, если telegram_id не передан)"""
+    if telegram_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(telegram_id, None)
@@ -1,21 +1,83 @@
 ﻿from __future__ import annotations
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 
 import fdb
 from loguru import logger
 
 from config_exporter import settings
 
+ORDER_BY_CODE_QUERY = """
+    SELECT
+        o.id,
+        o.orderno,
+        o.totalprice,
+        SUM(CASE WHEN uf.fieldname = 'qty_izd' THEN ouf.var_flt ELSE NULL END) AS qty_izd,
+        SUM(CASE WHEN uf.fieldname = 'area_izd' THEN ouf.var_flt ELSE NULL END) AS area_izd,
+        LIST(CASE WHEN uf.fieldname = 'delivery_zone' THEN ouf.var_str ELSE NULL END) AS zone,
+        LIST(CASE WHEN uf.fieldname = 'measurer' THEN ouf.var_str ELSE NULL END) AS measurer,
+        o.adressinstall,
+        o.agreementdate,
+        o.agreementno,
+        o.phoneinstall
+    FROM orders o
+    JOIN order_uf_values ouf ON ouf.orderid = o.id
+    JOIN userfields uf ON uf.userfieldid = ouf.userfieldid
+    WHERE o.id = (
+        SELECT ouf2.orderid
+        FROM order_uf_values ouf2
+        JOIN userfields uf2 ON uf2.userfieldid = ouf2.userfieldid
+        WHERE uf2.fieldname = 'Unique_code'
+            AND TRIM(ouf2.var_str) = ?
+    )
+    GROUP BY o.id, o.orderno, o.totalprice, o.adressinstall, o.agreementdate, o.agreementno, o.phoneinstall
+    """
+
+
+# Same order data for a batch of codes; the code itself is returned first to key the rows.
+# "{placeholders}" is filled with one "?" per code
+ORDERS_BY_CODES_QUERY = """
+    SELECT
+        TRIM(ouc.var_str) AS unique_code,
+        o.id,
+        o.orderno,
+        o.totalprice,
+        SUM(CASE WHEN uf.fieldname = 'qty_izd' THEN ouf.var_flt ELSE NULL END) AS qty_izd,
+        SUM(CASE WHEN uf.fieldname = 'area_izd' THEN ouf.var_flt ELSE NULL END) AS area_izd,
+        LIST(CASE WHEN uf.fieldname = 'delivery_zone' THEN ouf.var_str ELSE NULL END) AS zone,
+        LIST(CASE WHEN uf.fieldname = 'measurer' THEN ouf.var_str ELSE NULL END) AS measurer,
+        o.adressinstall,
+        o.agreementdate,
+        o.agreementno,
+        o.phoneinstall
+    FROM order_uf_values ouc
+    JOIN userfields ufc ON ufc.userfieldid = ouc.userfieldid
+    JOIN orders o ON o.id = ouc.orderid
+    JOIN order_uf_values ouf ON ouf.orderid = o.id
+    JOIN userfields uf ON uf.userfieldid = ouf.userfieldid
+    WHERE ufc.fieldname = 'Unique_code'
+        AND TRIM(ouc.var_str) IN ({placeholders})
+    GROUP BY TRIM(ouc.var_str), o.id, o.orderno, o.totalprice, o.adressinstall, o.agreementdate, o.agreementno, o.phoneinstall
+    """
+
+# Firebird limits an IN list to 1500 values
+ORDERS_BY_CODES_BATCH = 500
+
 
 class AltawinDatabase:
     """Firebird connection for Altawin queries."""
 
     def __init__(self) -> None:
         self.connection: Optional[fdb.Connection] = None
+        # Cursor holding the prepared order query, reused for every lookup on this connection
+        self._order_cursor: Optional[fdb.Cursor] = None
+        self._order_statement: Optional[fdb.PreparedStatement] = None
 
     def connect(self) -> fdb.Connection:
         if self.connection is None or self.connection.closed:
+            # A prepared statement belongs to the connection it was prepared on
+            self._order_cursor = None
+            self._order_statement = None
             self.connection = fdb.connect(
                 host=settings.altawin_db_host,
                 port=settings.altawin_db_port,
@@ -27,7 +89,27 @@ class AltawinDatabase:
             logger.info("Altawin DB connection established")
         return self.connection
 
+    def order_statement(self) -> tuple[fdb.Cursor, fdb.PreparedStatement]:
+        """Return the cursor and prepared order query, preparing it on first use."""
+        connection = self.connect()
+        if self._order_statement is None:
+            cursor = connection.cursor()
+            self._order_statement = cursor.prep(ORDER_BY_CODE_QUERY)
+            self._order_cursor = cursor
+        return self._order_cursor, self._order_statement
+
+    def reset_order_statement(self) -> None:
+        """Drop the prepared order query so the next lookup prepares it again."""
+        if self._order_cursor is not None:
+            try:
+                self._order_cursor.close()
+            except Exception:
+                pass
+        self._order_cursor = None
+        self._order_statement = None
+
     def disconnect(self) -> None:
+        self.reset_order_statement()
         if self.connection and not self.connection.closed:
             self.connection.close()
             logger.info("Altawin DB connection closed")
@@ -36,6 +118,23 @@ class AltawinDatabase:
 altawin_db = AltawinDatabase()
 
 
+def _row_to_order_data(row) -> Dict[str, Any]:
+    """Convert an order query row to the Altawin API dict."""
+    return {
+        "order_id": row[0],
+        "order_number": row[1] if row[1] else "",
+        "total_price": float(row[2]) if row[2] is not None else None,
+        "qty_izd": float(row[3]) if row[3] is not None else None,
+        "area_izd": float(row[4]) if row[4] is not None else None,
+        "zone": row[5] if row[5] else "",
+        "measurer": row[6] if row[6] else "",
+        "address": row[7] if row[7] else "",
+        "agreement_date": row[8].isoformat() if row[8] else None,
+        "agreement_no": row[9] if row[9] else "",
+        "phone": row[10] if row[10] else "",
+    }
+
+
 def get_order_data(order_code: str) -> Optional[Dict[str, Any]]:
     """
     Fetch order data from Altawin by Unique_code.
@@ -46,60 +145,54 @@ def get_order_data(order_code: str) -> Optional[Dict[str, Any]]:
         return None
 
     try:
-        connection = altawin_db.connect()
-        query = """
-        SELECT
-            o.id,
-            o.orderno,
-            o.totalprice,
-            SUM(CASE WHEN uf.fieldname = 'qty_izd' THEN ouf.var_flt ELSE NULL END) AS qty_izd,
-            SUM(CASE WHEN uf.fieldname = 'area_izd' THEN ouf.var_flt ELSE NULL END) AS area_izd,
-            LIST(CASE WHEN uf.fieldname = 'delivery_zone' THEN ouf.var_str ELSE NULL END) AS zone,
-            LIST(CASE WHEN uf.fieldname = 'measurer' THEN ouf.var_str ELSE NULL END) AS measurer,
-            o.adressinstall,
-            o.agreementdate,
-            o.agreementno,
-            o.phoneinstall
-        FROM orders o
-        JOIN order_uf_values ouf ON ouf.orderid = o.id
-        JOIN userfields uf ON uf.userfieldid = ouf.userfieldid
-        WHERE o.id = (
-            SELECT ouf2.orderid
-            FROM order_uf_values ouf2
-            JOIN userfields uf2 ON uf2.userfieldid = ouf2.userfieldid
-            WHERE uf2.fieldname = 'Unique_code'
-                AND TRIM(ouf2.var_str) = ?
-        )
-        GROUP BY o.id, o.orderno, o.totalprice, o.adressinstall, o.agreementdate, o.agreementno, o.phoneinstall
-        """
-
-        cursor = connection.cursor()
-        cursor.execute(query, (order_code.strip(),))
+        cursor, statement = altawin_db.order_statement()
+        cursor.execute(statement, (order_code.strip(),))
         row = cursor.fetchone()
 
         if not row:
             logger.warning(f"Altawin order not found for code: {order_code}")
             return None
 
-        return {
-            "order_id": row[0],
-            "order_number": row[1] if row[1] else "",
-            "total_price": float(row[2]) if row[2] is not None else None,
-            "qty_izd": float(row[3]) if row[3] is not None else None,
-            "area_izd": float(row[4]) if row[4] is not None else None,
-            "zone": row[5] if row[5] else "",
-            "measurer": row[6] if row[6] else "",
-            "address": row[7] if row[7] else "",
-            "agreement_date": row[8].isoformat() if row[8] else None,
-            "agreement_no": row[9] if row[9] else "",
-            "phone": row[10] if row[10] else "",
-        }
+        return _row_to_order_data(row)
 
     except Exception as exc:
         logger.error(f"Altawin DB query error for code {order_code}: {exc}")
+        altawin_db.reset_order_statement()
         return None
+
+
+def get_order_data_bulk(order_codes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch order data for many Unique_code values with one query per batch.
+
+    Returns a dict keyed by the stripped order code; codes not found in Altawin are absent.
+    """
+    codes = list(dict.fromkeys(code.strip() for code in order_codes if code and code.strip()))
+    orders: Dict[str, Dict[str, Any]] = {}
+    if not codes:
+        return orders
+
+    cursor = None
+    try:
+        cursor = altawin_db.connect().cursor()
+        for start in range(0, len(codes), ORDERS_BY_CODES_BATCH):
+            batch = codes[start:start + ORDERS_BY_CODES_BATCH]
+            query = ORDERS_BY_CODES_QUERY.format(placeholders=", ".join(["?"] * len(batch)))
+            cursor.execute(query, batch)
+            for row in cursor.fetchall():
+                # A code attached to several orders keeps the first one
+                orders.setdefault(row[0], _row_to_order_data(row[1:]))
+
+        missing = len(codes) - len(orders)
+        if missing:
+            logger.warning(f"Altawin orders not found for {missing} of {len(codes)} codes")
+    except Exception as exc:
+        logger.error(f"Altawin DB bulk query error for {len(codes)} codes: {exc}")
     finally:
-        try:
-            cursor.close()
-        except Exception:
-            pass
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    return orders